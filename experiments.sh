@@ -24,7 +24,7 @@ mkdir -p "$carpeta"
 # Recorremos jugadores, tamaños y probabilidades
 OUTPUT="${carpeta}resultados.csv"
 
-echo "filas,columnas,prob_murallas,prob_mover_murallas,n_metas,tiempo,ticks,llego,jugador,alpha,gamma,betha,omega" > "$OUTPUT"
+echo "filas,columnas,prob_murallas,prob_mover_murallas,n_metas,tiempo,ticks,llego,jugador,alpha,gamma,betha,omega,episodios,motivo_entrenamiento,generaciones,motivo_evolucion" > "$OUTPUT"
 
 for jugador in "${jugadores[@]}"; do
   for tam in "${tamanos[@]}"; do
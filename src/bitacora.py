@@ -0,0 +1,396 @@
+"""
+Módulo que define la bitácora binaria de una simulación y la herramienta para reproducirla.
+
+La bitácora guarda la grilla inicial y, por cada tick, la posición y el movimiento del jugador junto a los
+movimientos de murallas, todo en registros de ancho fijo para poder leerla con mmap y saltar a cualquier tick
+sin volver a simular. Cada cierto intervalo de ticks se guarda además una foto completa de la grilla.
+
+Formato (little-endian):
+    cabecera | grilla inicial | registros de ticks | registros de murallas | fotos de la grilla
+"""
+
+import argparse
+import mmap
+import struct
+from array import array
+from typing import TYPE_CHECKING, Optional
+
+from exceptions import BitacoraInvalidaError
+from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+
+if TYPE_CHECKING:
+    from laberinto import Laberinto
+
+MAGIA = b"LBRT"
+VERSION = 1
+
+# magia, versión, filas, columnas, intervalo de fotos, n° ticks, n° movimientos de murallas,
+# posición inicial del jugador (x, y), prob. de murallas, prob. de mover murallas
+CABECERA = struct.Struct("<4sHIIIIIIIdd")
+# posición del jugador (x, y), índice del primer movimiento de muralla, cantidad, movimiento del jugador
+REGISTRO_TICK = struct.Struct("<IIIIB")
+# origen de la muralla (x, y), dirección
+REGISTRO_MURALLA = struct.Struct("<IIB")
+
+CASILLAS = list(CasillaLaberinto)
+CODIGO_CASILLA = {casilla: codigo for codigo, casilla in enumerate(CASILLAS)}
+MOVIMIENTOS = list(MovimientosPosibles)
+CODIGO_MOVIMIENTO = {mov: codigo for codigo, mov in enumerate(MOVIMIENTOS)}
+CODIGO_DIRECCION = {mov.value: codigo for codigo, mov in enumerate(MOVIMIENTOS)}
+
+
+class EscritorBitacora:
+    """
+    Registra los eventos de una simulación y los escribe en un archivo binario al cerrarse.
+
+    Los registros se acumulan en memoria durante la simulación y se escriben de una sola vez en 'cerrar',
+    de modo que el archivo final tenga todas sus secciones contiguas.
+    """
+
+    ruta: str
+    laberinto: "Laberinto"
+    intervalo_fotos: int
+
+    def __init__(self, ruta: str, laberinto: "Laberinto", intervalo_fotos: int = 256):
+        """
+        Inicializa el escritor tomando el estado actual del laberinto como grilla inicial.
+
+        Args:
+            ruta (str): Ruta del archivo de bitácora a escribir.
+            laberinto (Laberinto): Laberinto cuya simulación se registrará.
+            intervalo_fotos (int): Cada cuántos ticks se guarda una foto completa de la grilla.
+        """
+        if intervalo_fotos < 1:
+            raise ValueError("El intervalo de fotos debe ser de al menos 1 tick.")
+
+        self.ruta = ruta
+        self.laberinto = laberinto
+        self.intervalo_fotos = intervalo_fotos
+
+        self._jugador_inicial = laberinto.jugador_pos
+        self._grilla_inicial = self._foto_grilla()
+        self._fotos: list[bytes] = []
+
+        self._ticks_xy = array("I")
+        self._ticks_murallas = array("I")
+        self._ticks_movimiento = bytearray()
+
+        self._murallas_xy = array("I")
+        self._murallas_direccion = bytearray()
+
+        self._cerrado = False
+
+    def __enter__(self) -> "EscritorBitacora":
+        """Permite usar el escritor como context manager."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Escribe la bitácora al salir del bloque 'with'."""
+        self.cerrar()
+
+    @property
+    def n_ticks(self) -> int:
+        """Cantidad de ticks registrados hasta ahora."""
+        return len(self._ticks_movimiento)
+
+    def registrar_tick(self) -> None:
+        """Registra el tick recién ejecutado por el laberinto (movimientos de murallas y del jugador)."""
+        inicio = len(self._murallas_direccion)
+        for origen, destino in self.laberinto.murallas_movidas:
+            self._murallas_xy.append(origen.x)
+            self._murallas_xy.append(origen.y)
+            self._murallas_direccion.append(
+                CODIGO_DIRECCION[(destino.x - origen.x, destino.y - origen.y)]
+            )
+
+        posicion = self.laberinto.jugador_pos
+        self._ticks_xy.append(posicion.x)
+        self._ticks_xy.append(posicion.y)
+        self._ticks_murallas.append(inicio)
+        self._ticks_murallas.append(len(self._murallas_direccion) - inicio)
+        self._ticks_movimiento.append(CODIGO_MOVIMIENTO[self.laberinto.ultimo_movimiento_jugador])
+
+        if self.n_ticks % self.intervalo_fotos == 0:
+            self._fotos.append(self._foto_grilla())
+
+    def cerrar(self) -> None:
+        """Escribe todas las secciones de la bitácora en disco. Llamarlo más de una vez no tiene efecto."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+
+        n_ticks = self.n_ticks
+        n_murallas = len(self._murallas_direccion)
+
+        ticks = bytearray(REGISTRO_TICK.size * n_ticks)
+        for i in range(n_ticks):
+            REGISTRO_TICK.pack_into(
+                ticks,
+                i * REGISTRO_TICK.size,
+                self._ticks_xy[2 * i],
+                self._ticks_xy[2 * i + 1],
+                self._ticks_murallas[2 * i],
+                self._ticks_murallas[2 * i + 1],
+                self._ticks_movimiento[i],
+            )
+
+        murallas = bytearray(REGISTRO_MURALLA.size * n_murallas)
+        for i in range(n_murallas):
+            REGISTRO_MURALLA.pack_into(
+                murallas,
+                i * REGISTRO_MURALLA.size,
+                self._murallas_xy[2 * i],
+                self._murallas_xy[2 * i + 1],
+                self._murallas_direccion[i],
+            )
+
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(
+                CABECERA.pack(
+                    MAGIA,
+                    VERSION,
+                    self.laberinto.filas,
+                    self.laberinto.columnas,
+                    self.intervalo_fotos,
+                    n_ticks,
+                    n_murallas,
+                    self._jugador_inicial.x,
+                    self._jugador_inicial.y,
+                    self.laberinto.prob_murallas,
+                    self.laberinto.prob_mover_murallas,
+                )
+            )
+            archivo.write(self._grilla_inicial)
+            archivo.write(ticks)
+            archivo.write(murallas)
+            for foto in self._fotos:
+                archivo.write(foto)
+
+    def _foto_grilla(self) -> bytes:
+        """
+        Devuelve la grilla actual codificada en un byte por casilla, sin el jugador.
+
+        La casilla del jugador se guarda con el tipo que tiene debajo (camino o meta), ya que su posición
+        se guarda aparte en cada registro de tick.
+        """
+        laberinto = self.laberinto
+        debajo_jugador = laberinto.tipo_anterior_casilla_actual or CasillaLaberinto.CAMINO
+
+        foto = bytearray(laberinto.filas * laberinto.columnas)
+        for i in range(laberinto.filas):
+            for j in range(laberinto.columnas):
+                casilla = laberinto.get_casilla(Coordenada(i, j))
+                if casilla == CasillaLaberinto.JUGADOR:
+                    casilla = debajo_jugador
+                foto[i * laberinto.columnas + j] = CODIGO_CASILLA[casilla]
+        return bytes(foto)
+
+
+class LectorBitacora:
+    """
+    Lee una bitácora binaria mediante mmap y reconstruye el laberinto en cualquier tick.
+
+    Para reconstruir el tick t se parte de la foto más cercana anterior a t y se aplican solo los movimientos
+    de murallas registrados desde entonces, sin volver a ejecutar al jugador.
+    """
+
+    ruta: str
+    filas: int
+    columnas: int
+    intervalo_fotos: int
+    n_ticks: int
+    n_movimientos_murallas: int
+    jugador_inicial: Coordenada
+    prob_murallas: float
+    prob_mover_murallas: float
+
+    def __init__(self, ruta: str):
+        """
+        Abre la bitácora y lee su cabecera.
+
+        Args:
+            ruta (str): Ruta del archivo de bitácora.
+
+        Raises:
+            BitacoraInvalidaError: Si el archivo no es una bitácora válida o su versión no es soportada.
+        """
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._archivo.close()
+            raise BitacoraInvalidaError(f"El archivo {ruta} está vacío.") from e
+
+        if len(self._datos) < CABECERA.size:
+            self.cerrar()
+            raise BitacoraInvalidaError(
+                f"El archivo {ruta} es demasiado corto para ser una bitácora."
+            )
+
+        (
+            magia,
+            version,
+            self.filas,
+            self.columnas,
+            self.intervalo_fotos,
+            self.n_ticks,
+            self.n_movimientos_murallas,
+            jugador_x,
+            jugador_y,
+            self.prob_murallas,
+            self.prob_mover_murallas,
+        ) = CABECERA.unpack_from(self._datos, 0)
+
+        if magia != MAGIA:
+            self.cerrar()
+            raise BitacoraInvalidaError(f"El archivo {ruta} no es una bitácora de laberinto.")
+        if version != VERSION:
+            self.cerrar()
+            raise BitacoraInvalidaError(
+                f"Versión de bitácora {version} no soportada (se esperaba {VERSION})."
+            )
+
+        self.jugador_inicial = Coordenada(jugador_x, jugador_y)
+
+        tam_grilla = self.filas * self.columnas
+        self._inicio_grilla = CABECERA.size
+        self._inicio_ticks = self._inicio_grilla + tam_grilla
+        self._inicio_murallas = self._inicio_ticks + self.n_ticks * REGISTRO_TICK.size
+        self._inicio_fotos = (
+            self._inicio_murallas + self.n_movimientos_murallas * REGISTRO_MURALLA.size
+        )
+
+        n_fotos = self.n_ticks // self.intervalo_fotos
+        if len(self._datos) < self._inicio_fotos + n_fotos * tam_grilla:
+            self.cerrar()
+            raise BitacoraInvalidaError(f"El archivo {ruta} está truncado.")
+
+    def __enter__(self) -> "LectorBitacora":
+        """Permite usar el lector como context manager."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Cierra el archivo al salir del bloque 'with'."""
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Libera el mmap y el archivo subyacente."""
+        self._datos.close()
+        self._archivo.close()
+
+    def posicion_jugador(self, tick: int) -> Coordenada:
+        """Devuelve la posición del jugador al terminar el tick dado (0 es el estado inicial)."""
+        self._validar_tick(tick)
+        if tick == 0:
+            return self.jugador_inicial
+        x, y, *_ = self._registro_tick(tick)
+        return Coordenada(x, y)
+
+    def movimiento_jugador(self, tick: int) -> MovimientosPosibles:
+        """Devuelve el movimiento que hizo el jugador en el tick dado (desde 1)."""
+        self._validar_tick(tick, permitir_cero=False)
+        return MOVIMIENTOS[self._registro_tick(tick)[4]]
+
+    def movimientos_murallas(self, tick: int) -> list[tuple[Coordenada, Coordenada]]:
+        """Devuelve los movimientos de murallas del tick dado (desde 1) como pares (origen, destino)."""
+        self._validar_tick(tick, permitir_cero=False)
+        _, _, inicio, cantidad, _ = self._registro_tick(tick)
+
+        movimientos = []
+        for i in range(inicio, inicio + cantidad):
+            x, y, direccion = REGISTRO_MURALLA.unpack_from(
+                self._datos, self._inicio_murallas + i * REGISTRO_MURALLA.size
+            )
+            origen = Coordenada(x, y)
+            movimientos.append((origen, origen + MOVIMIENTOS[direccion]))
+        return movimientos
+
+    def estado_en_tick(self, tick: int) -> list[list[CasillaLaberinto]]:
+        """
+        Reconstruye la grilla del laberinto al terminar el tick dado.
+
+        Args:
+            tick (int): Tick a reconstruir, entre 0 (estado inicial) y n_ticks.
+
+        Returns:
+            list[list[CasillaLaberinto]]: Grilla del laberinto con el jugador ubicado en su posición.
+        """
+        self._validar_tick(tick)
+
+        n_foto = tick // self.intervalo_fotos
+        if n_foto == 0:
+            inicio_foto = self._inicio_grilla
+        else:
+            inicio_foto = self._inicio_fotos + (n_foto - 1) * self.filas * self.columnas
+
+        grilla = []
+        for i in range(self.filas):
+            inicio_fila = inicio_foto + i * self.columnas
+            grilla.append(
+                [CASILLAS[c] for c in self._datos[inicio_fila : inicio_fila + self.columnas]]
+            )
+
+        for t in range(n_foto * self.intervalo_fotos + 1, tick + 1):
+            for origen, destino in self.movimientos_murallas(t):
+                grilla[origen.x][origen.y] = CasillaLaberinto.CAMINO
+                grilla[destino.x][destino.y] = CasillaLaberinto.MURALLA
+
+        jugador = self.posicion_jugador(tick)
+        grilla[jugador.x][jugador.y] = CasillaLaberinto.JUGADOR
+        return grilla
+
+    def _registro_tick(self, tick: int) -> tuple[int, int, int, int, int]:
+        return REGISTRO_TICK.unpack_from(
+            self._datos, self._inicio_ticks + (tick - 1) * REGISTRO_TICK.size
+        )
+
+    def _validar_tick(self, tick: int, permitir_cero: bool = True) -> None:
+        minimo = 0 if permitir_cero else 1
+        if not minimo <= tick <= self.n_ticks:
+            raise ValueError(
+                f"El tick {tick} está fuera de la bitácora (rango válido: {minimo} a {self.n_ticks})."
+            )
+
+
+def imprimir_grilla(grilla: list[list[CasillaLaberinto]]) -> None:
+    """Imprime una grilla reconstruida con el mismo formato que Laberinto.imprimir."""
+    print("\n".join("".join(c.value for c in fila) for fila in grilla))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una bitácora de simulación.")
+    parser.add_argument("bitacora", help="Ruta del archivo de bitácora")
+    parser.add_argument(
+        "-t",
+        "--tick",
+        type=int,
+        default=None,
+        help="Tick a mostrar (por defecto el último registrado)",
+    )
+    parser.add_argument(
+        "--murallas",
+        action="store_true",
+        help="Muestra también los movimientos de murallas del tick",
+    )
+    args = parser.parse_args()
+
+    with LectorBitacora(args.bitacora) as lector:
+        tick = lector.n_ticks if args.tick is None else args.tick
+
+        print(
+            f"Laberinto {lector.filas}x{lector.columnas}, "
+            f"prob. murallas {lector.prob_murallas}, prob. mover murallas {lector.prob_mover_murallas}"
+        )
+        print(f"Ticks registrados: {lector.n_ticks}. Mostrando tick {tick}.")
+        imprimir_grilla(lector.estado_en_tick(tick))
+
+        if tick > 0:
+            print(f"Movimiento del jugador: {lector.movimiento_jugador(tick).name}")
+            if args.murallas:
+                for origen, destino in lector.movimientos_murallas(tick):
+                    print(f"Muralla {tuple(origen)} -> {tuple(destino)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Módulo que define los campos de flujo: mapas de distancia hacia una meta compartidos por varios agentes."""
+
+from functools import lru_cache
+from heapq import heappop, heappush
+from random import choice
+from typing import Optional
+
+from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+
+SIN_CAMINO = 1 << 62  # Distancia de las casillas desde las que no se llega a la meta
+
+MOVIMIENTOS_CARDINALES = [m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE]
+
+
+@lru_cache(maxsize=None)
+def vecindario(alto: int, ancho: int) -> tuple[tuple[int, ...], ...]:
+    """Índices vecinos de cada casilla de una grilla alto x ancho recorrida fila por fila."""
+    vecinas = []
+    for i in range(alto * ancho):
+        fila, columna = divmod(i, ancho)
+        vecinas_i = []
+        if fila > 0:
+            vecinas_i.append(i - ancho)
+        if fila < alto - 1:
+            vecinas_i.append(i + ancho)
+        if columna > 0:
+            vecinas_i.append(i - 1)
+        if columna < ancho - 1:
+            vecinas_i.append(i + 1)
+        vecinas.append(tuple(vecinas_i))
+    return tuple(vecinas)
+
+
+class CampoDeFlujo:
+    """
+    Distancia real (en pasos) desde cada casilla del laberinto hasta una meta.
+
+    Se calcula una vez con un BFS inverso desde la meta y luego se mantiene al día con 'actualizar',
+    que solo recorre las casillas cuya distancia cambió. Cualquier cantidad de agentes puede navegar
+    con el mismo campo: basta con moverse a la casilla vecina de menor distancia.
+
+    Las casillas se guardan en listas planas indexadas por 'x * columnas + y'.
+    """
+
+    meta: Coordenada
+    filas: int
+    columnas: int
+    libres: list[bool]
+    distancias: list[int]
+    vecinas: tuple[tuple[int, ...], ...]
+
+    def __init__(self, laberinto, meta: Coordenada):
+        """
+        Construye el campo de flujo hacia 'meta' leyendo las murallas actuales del laberinto.
+
+        Args:
+            laberinto (Laberinto): Laberinto sobre el que se calcula el campo.
+            meta (Coordenada): Meta hacia la que apunta el campo.
+        """
+        self.meta = meta
+        self.filas = laberinto.filas
+        self.columnas = laberinto.columnas
+        self.libres = [
+            laberinto.get_casilla(Coordenada(x, y)) != CasillaLaberinto.MURALLA
+            for x in range(self.filas)
+            for y in range(self.columnas)
+        ]
+        self.distancias = [SIN_CAMINO] * (self.filas * self.columnas)
+        self.vecinas = vecindario(self.filas, self.columnas)
+
+        inicio = self._indice(meta)
+        self.distancias[inicio] = 0
+        self._propagar([(0, inicio)])
+
+    def _indice(self, casilla: Coordenada) -> int:
+        return casilla.x * self.columnas + casilla.y
+
+    def _propagar(self, pendientes: list[tuple[int, int]]) -> None:
+        """
+        Propaga distancias más cortas desde las casillas pendientes (Dijkstra con costo unitario).
+
+        Args:
+            pendientes (list[tuple[int, int]]): Pares (distancia, índice) desde los que se relaja.
+        """
+        distancias, libres, vecinas = self.distancias, self.libres, self.vecinas
+        while pendientes:
+            distancia, i = heappop(pendientes)
+            if distancia > distancias[i]:
+                continue
+            for j in vecinas[i]:
+                if libres[j] and distancia + 1 < distancias[j]:
+                    distancias[j] = distancia + 1
+                    heappush(pendientes, (distancia + 1, j))
+
+    def actualizar(
+        self, murallas_nuevas: list[Coordenada], casillas_liberadas: list[Coordenada]
+    ) -> None:
+        """
+        Pone el campo al día con las casillas que cambiaron en el último tick.
+
+        Una muralla nueva solo puede alargar distancias: se invalidan las casillas que dependían de ella
+        (las que ya no tienen una vecina válida a un paso menos de la meta) y luego se reparan desde su
+        frontera. Una casilla liberada solo puede acortarlas: se le asigna su distancia y se propaga.
+
+        Args:
+            murallas_nuevas (list[Coordenada]): Casillas que pasaron a ser muralla.
+            casillas_liberadas (list[Coordenada]): Casillas que dejaron de ser muralla.
+        """
+        distancias, libres, vecinas = self.distancias, self.libres, self.vecinas
+
+        # 1) Invalidar, en orden de distancia, las casillas que se quedaron sin apoyo
+        por_invalidar = []
+        for muralla in murallas_nuevas:
+            i = self._indice(muralla)
+            libres[i] = False
+            if distancias[i] != SIN_CAMINO:
+                heappush(por_invalidar, (distancias[i], i))
+
+        invalidadas = []
+        while por_invalidar:
+            distancia, i = heappop(por_invalidar)
+            if distancias[i] != distancia:
+                continue
+            if libres[i] and any(distancias[j] == distancia - 1 and libres[j] for j in vecinas[i]):
+                continue
+            distancias[i] = SIN_CAMINO
+            invalidadas.append(i)
+            for j in vecinas[i]:
+                if distancias[j] == distancia + 1:
+                    heappush(por_invalidar, (distancia + 1, j))
+
+        # 2) Sembrar las casillas invalidadas y las liberadas desde sus vecinas válidas
+        pendientes = []
+        for casilla in casillas_liberadas:
+            i = self._indice(casilla)
+            libres[i] = True
+            invalidadas.append(i)
+
+        for i in invalidadas:
+            if not libres[i]:
+                continue
+            mejor = min((distancias[j] for j in vecinas[i] if libres[j]), default=SIN_CAMINO)
+            if mejor + 1 < distancias[i]:
+                distancias[i] = mejor + 1
+                heappush(pendientes, (mejor + 1, i))
+
+        # 3) Propagar las nuevas distancias
+        self._propagar(pendientes)
+
+    def distancia(self, casilla: Coordenada) -> Optional[int]:
+        """Devuelve los pasos que faltan desde la casilla hasta la meta, o None si no hay camino."""
+        distancia = self.distancias[self._indice(casilla)]
+        return None if distancia == SIN_CAMINO else distancia
+
+    def siguiente_movimiento(self, casilla: Coordenada) -> MovimientosPosibles:
+        """
+        Devuelve un movimiento hacia una vecina más cercana a la meta (al azar si hay empate).
+
+        Si la casilla quedó bajo una muralla, se permite salir hacia la mejor vecina transitable.
+        Si ninguna vecina acerca a la meta, devuelve NO_MOVERSE.
+        """
+        i = self._indice(casilla)
+        actual = self.distancias[i] if self.libres[i] else SIN_CAMINO + 1
+
+        mejor = actual
+        candidatos = []
+        for mov in MOVIMIENTOS_CARDINALES:
+            dx, dy = mov.value
+            x, y = casilla.x + dx, casilla.y + dy
+            if not (0 <= x < self.filas and 0 <= y < self.columnas):
+                continue
+            j = x * self.columnas + y
+            if not self.libres[j]:
+                continue
+            if self.distancias[j] < mejor:
+                mejor = self.distancias[j]
+                candidatos = [mov]
+            elif self.distancias[j] == mejor and mejor < actual:
+                candidatos.append(mov)
+
+        return choice(candidatos) if candidatos else MovimientosPosibles.NO_MOVERSE
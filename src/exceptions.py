@@ -19,3 +19,7 @@ class CreacionLaberintoError(Exception):
 
 class CoordenadaFueraDeLimiteDelLaberintoError(Exception):
     """Se lanza cuando se consulta por una coordenada que no esta dentro del laberinto."""
+
+
+class BitacoraInvalidaError(Exception):
+    """Se lanza cuando un archivo no corresponde a una bitácora válida de simulación."""
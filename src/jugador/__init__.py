@@ -1,9 +1,13 @@
 """Paquete que contiene a las definiciones de los distintos tipos de jugadores que recorreran el laberinto."""
 
+from ._tabla_q import CriterioConvergencia, cargar_tabla_q
 from .jugador import Jugador
 from .jugador_a_estrella import JugadorAEstrella
 from .jugador_genetico import JugadorGenetico
 from .jugador_greedy import JugadorGreedy
+from .jugador_hpa_estrella import JugadorHPAEstrella
+from .jugador_iteracion_valor import JugadorIteracionValor
+from .jugador_jps import JugadorJPS
 from .jugador_q_learning import JugadorQlearning
 from .jugador_q_learning_estrella import JugadorQlearningEstrella
 from .jugador_random import JugadorRandom
@@ -0,0 +1,137 @@
+"""Módulo para entrenar un jugador en otro proceso mientras juega con su política actual."""
+
+import atexit
+from multiprocessing import Pipe, Process, shared_memory
+from multiprocessing.connection import Connection
+from random import getrandbits, seed
+
+import numpy as np
+
+from jugador._entrenamiento_paralelo import (
+    ACCIONES,
+    TablaQCompartida,
+    copiar_en_arreglo,
+    tabla_desde_arreglo,
+)
+
+INTERVALO_REFRESCO = 10  # Ticks entre cada copia de la Q-table que se está entrenando
+
+
+class EntrenamientoFondo:
+    """
+    Entrenamiento de un jugador que corre en otro proceso mientras el jugador ya se mueve.
+
+    La Q-table que se entrena vive en un bloque de 'multiprocessing.shared_memory'. El jugador juega
+    con una copia local, que cada 'INTERVALO_REFRESCO' ticks se reemplaza por el contenido actual del
+    bloque: es una copia de memoria sin candados, así que nunca detiene un tick. Cuando el proceso
+    termina, el jugador recibe la Q-table final y los atributos indicados (por ejemplo
+    'resultado_entrenamiento'), y deja de refrescar.
+    """
+
+    def __init__(self, jugador, metodo: str, atributos: tuple[str, ...]):
+        """
+        Lanza el proceso de entrenamiento con una copia del jugador.
+
+        Args:
+            jugador: Jugador indexado por coordenadas, con 'Q' y 'laberinto'.
+            metodo (str): Método sin argumentos del jugador que se ejecuta en el proceso para entrenar.
+            atributos (tuple[str, ...]): Atributos que el proceso devuelve al terminar y se copian al
+                jugador.
+        """
+        forma = (jugador.laberinto.filas, jugador.laberinto.columnas, len(ACCIONES))
+        self.memoria = shared_memory.SharedMemory(create=True, size=int(np.prod(forma)) * 8)
+        self.compartidos = np.ndarray(forma, dtype=np.float64, buffer=self.memoria.buf)
+        # Arranque en caliente: se respeta lo que el jugador ya tuviera en su Q-table
+        copiar_en_arreglo(jugador.Q, self.compartidos)
+        self.locales = self.compartidos.copy()
+        self.ticks = 0
+
+        self.receptor, emisor = Pipe(duplex=False)
+        self.proceso = Process(
+            target=_entrenar_en_fondo,
+            args=(jugador, self.memoria.name, forma, metodo, atributos, emisor, getrandbits(32)),
+            daemon=True,
+        )
+        self.proceso.start()
+        emisor.close()
+
+        jugador.Q = TablaQCompartida(self.locales)
+        atexit.register(self.cerrar)
+
+    def refrescar(self, jugador) -> None:
+        """
+        Actualiza la política con la que juega el jugador, cada 'INTERVALO_REFRESCO' ticks.
+
+        Si el entrenamiento ya terminó, le entrega al jugador la Q-table final y sus resultados, y
+        cierra el proceso y la memoria compartida.
+
+        Args:
+            jugador: Jugador que está usando este entrenamiento.
+        """
+        self.ticks += 1
+        if self.ticks % INTERVALO_REFRESCO != 0:
+            return
+
+        if not self.receptor.poll():
+            np.copyto(self.locales, self.compartidos)
+            return
+
+        try:
+            atributos = self.receptor.recv()
+        except EOFError:
+            # El proceso terminó sin devolver resultados; se conserva la última copia
+            atributos = {}
+        np.copyto(self.locales, self.compartidos)
+        jugador.Q = tabla_desde_arreglo(self.locales)
+        for nombre, valor in atributos.items():
+            setattr(jugador, nombre, valor)
+        jugador.entrenamiento_fondo = None
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Detiene el proceso si sigue entrenando y libera la memoria compartida."""
+        if self.compartidos is None:
+            return
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join()
+        self.receptor.close()
+        self.compartidos = None  # Suelta el arreglo antes de cerrar el bloque
+        self.memoria.close()
+        self.memoria.unlink()
+        atexit.unregister(self.cerrar)
+
+
+def _entrenar_en_fondo(
+    jugador,
+    nombre_memoria: str,
+    forma: tuple[int, int, int],
+    metodo: str,
+    atributos: tuple[str, ...],
+    emisor: Connection,
+    semilla: int,
+) -> None:
+    """
+    Entrena la copia del jugador sobre la Q-table compartida y envía los atributos pedidos al terminar.
+
+    Args:
+        jugador: Copia del jugador recibida por el proceso.
+        nombre_memoria (str): Nombre del bloque de memoria compartida con la Q-table.
+        forma (tuple[int, int, int]): Forma del arreglo de valores Q.
+        metodo (str): Método del jugador que entrena.
+        atributos (tuple[str, ...]): Atributos que se envían al terminar.
+        emisor (Connection): Extremo de la conexión por el que se envían los atributos.
+        semilla (int): Semilla de los generadores aleatorios del proceso.
+    """
+    seed(semilla)
+    np.random.seed(semilla)
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        jugador.entrenamiento_fondo = None
+        jugador.Q = TablaQCompartida(np.ndarray(forma, dtype=np.float64, buffer=memoria.buf))
+        getattr(jugador, metodo)()
+        emisor.send({nombre: getattr(jugador, nombre) for nombre in atributos})
+    finally:
+        jugador.Q = None  # Suelta el arreglo antes de cerrar el bloque
+        memoria.close()
+        emisor.close()
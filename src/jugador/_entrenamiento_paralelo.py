@@ -0,0 +1,201 @@
+"""Módulo para entrenar jugadores basados en Q-learning en varios procesos sobre una Q-table compartida."""
+
+from collections import defaultdict
+from math import ceil
+from multiprocessing import Pool, shared_memory
+from random import getrandbits, seed
+from time import perf_counter
+from typing import Iterator, Optional
+
+import numpy as np
+
+from jugador._tabla_q import crear_tabla_q
+from models import Coordenada, MotivoParada, MovimientosPosibles, ResultadoEntrenamiento
+
+ACCIONES = list(MovimientosPosibles)
+INDICE_ACCION = {accion: indice for indice, accion in enumerate(ACCIONES)}
+
+
+class FilaQCompartida:
+    """
+    Valores Q de una casilla guardados en una fila del arreglo compartido.
+
+    Se comporta como el dict {MovimientosPosibles: float} de una Q-table normal, así los jugadores la usan
+    sin cambios ('Q[pos][mov] += ...', 'Q[pos].values()').
+    """
+
+    __slots__ = ("_fila",)
+
+    def __init__(self, fila: np.ndarray):
+        self._fila = fila
+
+    def __getitem__(self, accion: MovimientosPosibles) -> float:
+        return float(self._fila[INDICE_ACCION[accion]])
+
+    def __setitem__(self, accion: MovimientosPosibles, valor: float) -> None:
+        self._fila[INDICE_ACCION[accion]] = valor
+
+    def __iter__(self) -> Iterator[MovimientosPosibles]:
+        return iter(ACCIONES)
+
+    def keys(self) -> list[MovimientosPosibles]:
+        return ACCIONES
+
+    def values(self) -> list[float]:
+        return self._fila.tolist()
+
+    def items(self) -> Iterator[tuple[MovimientosPosibles, float]]:
+        return zip(ACCIONES, self._fila.tolist())
+
+
+class TablaQCompartida:
+    """
+    Q-table indexada por Coordenada sobre un arreglo (filas x columnas x acciones) de numpy.
+
+    Al entrenar en paralelo el arreglo vive en memoria compartida; con repetición de experiencia es un
+    arreglo normal que se actualiza por lotes. Las actualizaciones de los distintos procesos no se
+    sincronizan (estilo Hogwild): cada '+=' lee y escribe sin candado, y una escritura concurrente sobre la
+    misma entrada puede perderse. Como los procesos pasan por casillas distintas casi siempre, eso casi no
+    ocurre y no afecta la convergencia.
+    """
+
+    valores: np.ndarray
+
+    def __init__(self, valores: np.ndarray):
+        """
+        Inicializa la tabla sobre el arreglo dado, sin copiarlo.
+
+        Args:
+            valores (np.ndarray): Arreglo (filas x columnas x acciones) de valores Q.
+        """
+        self.valores = valores
+
+    def __getitem__(self, posicion: Coordenada) -> FilaQCompartida:
+        return FilaQCompartida(self.valores[posicion.x, posicion.y])
+
+    def __len__(self) -> int:
+        return self.valores.shape[0] * self.valores.shape[1]
+
+    def get(
+        self, posicion: Coordenada, defecto: Optional[dict[MovimientosPosibles, float]] = None
+    ) -> Optional[FilaQCompartida | dict[MovimientosPosibles, float]]:
+        filas, columnas, _ = self.valores.shape
+        if 0 <= posicion.x < filas and 0 <= posicion.y < columnas:
+            return self[posicion]
+        return defecto
+
+    def items(self) -> Iterator[tuple[Coordenada, FilaQCompartida]]:
+        filas, columnas, _ = self.valores.shape
+        for x in range(filas):
+            for y in range(columnas):
+                yield Coordenada(x, y), FilaQCompartida(self.valores[x, y])
+
+
+def copiar_en_arreglo(
+    Q: dict[Coordenada, dict[MovimientosPosibles, float]], valores: np.ndarray
+) -> None:
+    """
+    Copia una Q-table indexada por coordenadas a un arreglo (filas x columnas x acciones) ya creado.
+
+    Args:
+        Q (dict[Coordenada, dict[MovimientosPosibles, float]]): Q-table de origen.
+        valores (np.ndarray): Arreglo de destino; las casillas sin entrada quedan en cero.
+    """
+    valores.fill(0.0)
+    for posicion, acciones in Q.items():
+        valores[posicion.x, posicion.y] = [acciones[accion] for accion in ACCIONES]
+
+
+def tabla_desde_arreglo(
+    valores: np.ndarray,
+) -> defaultdict[Coordenada, dict[MovimientosPosibles, float]]:
+    """
+    Convierte un arreglo (filas x columnas x acciones) en una Q-table normal.
+
+    Solo se crean entradas para las casillas con algún valor distinto de cero.
+
+    Args:
+        valores (np.ndarray): Arreglo de valores Q.
+
+    Returns:
+        defaultdict[Coordenada, dict[MovimientosPosibles, float]]: Q-table equivalente.
+    """
+    Q = crear_tabla_q()
+    for x, y in zip(*np.nonzero(valores.any(axis=2))):
+        Q[Coordenada(int(x), int(y))] = dict(zip(ACCIONES, valores[x, y].tolist()))
+    return Q
+
+
+def entrenar_en_paralelo(jugador, procesos: int, n_episodios: int = 10000) -> None:
+    """
+    Reparte los episodios de entrenamiento de un jugador entre varios procesos que comparten su Q-table.
+
+    La Q-table se copia a un bloque de 'multiprocessing.shared_memory' y cada proceso recibe una copia del
+    jugador que apunta a ese bloque, con su propia semilla, y ejecuta '_entrenar' con su parte de los
+    episodios. Al terminar, los valores se copian de vuelta a una Q-table normal del jugador y su
+    'resultado_entrenamiento' suma los episodios de todos los procesos y guarda el motivo de parada de cada uno.
+
+    Args:
+        jugador: Jugador indexado por coordenadas, con 'Q', 'laberinto', 'resultado_entrenamiento' y '_entrenar'.
+        procesos (int): Cantidad de procesos de entrenamiento.
+        n_episodios (int): Total de episodios a repartir entre los procesos.
+    """
+    forma = (jugador.laberinto.filas, jugador.laberinto.columnas, len(ACCIONES))
+    memoria = shared_memory.SharedMemory(create=True, size=int(np.prod(forma)) * 8)
+    inicio = perf_counter()
+    try:
+        valores = np.ndarray(forma, dtype=np.float64, buffer=memoria.buf)
+        # Arranque en caliente: se respeta lo que el jugador ya tuviera en su Q-table
+        copiar_en_arreglo(jugador.Q, valores)
+
+        episodios_por_proceso = ceil(n_episodios / procesos)
+        tareas = [
+            (jugador, memoria.name, forma, episodios_por_proceso, getrandbits(32))
+            for _ in range(procesos)
+        ]
+        with Pool(procesos) as pool:
+            resultados = pool.starmap(_entrenar_en_proceso, tareas)
+
+        jugador.Q = tabla_desde_arreglo(valores)
+        del valores
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+    # Cada proceso se detiene por su cuenta; se informa el motivo más común (ante empate, el primero
+    # de 'MotivoParada') junto con el de cada proceso
+    motivos = tuple(resultado.motivo for resultado in resultados)
+    jugador.resultado_entrenamiento = ResultadoEntrenamiento(
+        sum(resultado.episodios for resultado in resultados),
+        max(MotivoParada, key=motivos.count),
+        perf_counter() - inicio,
+        motivos,
+    )
+
+
+def _entrenar_en_proceso(
+    jugador, nombre_memoria: str, forma: tuple[int, int, int], n_episodios: int, semilla: int
+) -> ResultadoEntrenamiento:
+    """
+    Entrena la copia del jugador de un proceso sobre la Q-table compartida.
+
+    Args:
+        jugador: Copia del jugador recibida por el proceso.
+        nombre_memoria (str): Nombre del bloque de memoria compartida con la Q-table.
+        forma (tuple[int, int, int]): Forma del arreglo de valores Q.
+        n_episodios (int): Episodios que entrena este proceso.
+        semilla (int): Semilla del generador aleatorio del proceso.
+
+    Returns:
+        ResultadoEntrenamiento: Resultado del entrenamiento de este proceso.
+    """
+    seed(semilla)
+    np.random.seed(semilla)  # Para los lotes de la repetición de experiencia
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        jugador.Q = TablaQCompartida(np.ndarray(forma, dtype=np.float64, buffer=memoria.buf))
+        jugador._entrenar(n_episodios)
+        return jugador.resultado_entrenamiento
+    finally:
+        jugador.Q = None  # Suelta el arreglo antes de cerrar el bloque
+        memoria.close()
@@ -0,0 +1,192 @@
+"""Módulo para evolucionar la población del jugador genético en islas, una por proceso."""
+
+from math import ceil
+from multiprocessing import Process, Queue
+from queue import Empty
+from random import getrandbits, seed
+
+import numpy as np
+
+from exceptions import JugadorError
+
+ESPERA_RESULTADOS = 1.0  # Segundos entre revisiones de que las islas sigan vivas
+
+Migrante = tuple[np.ndarray, float, float]  # (genoma, desempeño, epsilon)
+
+
+def evolucionar_en_islas(
+    jugador,
+    islas: int,
+    cantidad_generaciones: int,
+    tamaño_poblacion: int,
+    pasos_maximos: int,
+    intervalo_migracion: int,
+) -> None:
+    """
+    Evoluciona la población del jugador genético repartida en islas que corren en procesos separados.
+
+    Cada isla recibe una copia del jugador, con su propia semilla y 'tamaño_poblacion / islas'
+    individuos, y evoluciona por su cuenta. Cada 'intervalo_migracion' generaciones las islas, en
+    anillo, envían su mejor genoma a la siguiente por una 'multiprocessing.Queue' y reemplazan a su
+    peor individuo con el que reciben de la anterior. Al terminar, la población del jugador queda
+    formada por la unión de las islas; las Q-tables de los individuos no se devuelven.
+
+    Args:
+        jugador: JugadorGenetico cuya población se evoluciona.
+        islas (int): Cantidad de islas (procesos).
+        cantidad_generaciones (int): Generaciones que evoluciona cada isla.
+        tamaño_poblacion (int): Total de individuos, repartido entre las islas.
+        pasos_maximos (int): Máximo de ticks con que se evalúa a cada individuo.
+        intervalo_migracion (int): Cada cuántas generaciones se intercambian genomas.
+
+    Raises:
+        JugadorError: Si alguna isla termina sin publicar su población.
+    """
+    from jugador.jugador_genetico import CANTIDAD_ELITE
+
+    tamaño_isla = max(CANTIDAD_ELITE, ceil(tamaño_poblacion / islas))
+    colas: list[Queue] = [Queue() for _ in range(islas)]
+    resultados: Queue = Queue()
+    procesos = [
+        Process(
+            target=_evolucionar_isla,
+            args=(
+                jugador,
+                indice,
+                cantidad_generaciones,
+                tamaño_isla,
+                pasos_maximos,
+                intervalo_migracion,
+                colas[indice],
+                colas[(indice + 1) % islas],
+                resultados,
+                getrandbits(32),
+            ),
+        )
+        for indice in range(islas)
+    ]
+    for proceso in procesos:
+        proceso.start()
+
+    # Se leen los resultados antes de esperar a los procesos, para que ninguno quede bloqueado
+    # escribiendo en la cola
+    poblaciones = _recibir_poblaciones(procesos, resultados)
+    for proceso in procesos:
+        proceso.join()
+
+    jugador.genomas = np.concatenate([genomas for _, genomas, _, _ in poblaciones])
+    jugador.aptitudes = np.concatenate([aptitudes for _, _, aptitudes, _ in poblaciones])
+    jugador.epsilons = np.concatenate([epsilons for _, _, _, epsilons in poblaciones])
+    jugador.bloque_q = None
+    jugador.tablas_q = []
+
+
+def _recibir_poblaciones(procesos: list[Process], resultados: Queue) -> list[tuple]:
+    """
+    Lee la población final de cada isla, revisando entre lecturas que ninguna haya muerto.
+
+    Una isla que muere deja esperando para siempre tanto a esta lectura como a la isla siguiente, que
+    espera sus migrantes. Por eso, si alguna termina con error, se detienen todas.
+
+    Args:
+        procesos (list[Process]): Procesos de las islas.
+        resultados (Queue): Cola en que las islas publican su población final.
+
+    Returns:
+        list[tuple]: Poblaciones (indice, genomas, aptitudes, epsilons) ordenadas por isla.
+
+    Raises:
+        JugadorError: Si alguna isla termina sin publicar su población.
+    """
+    poblaciones = []
+    while len(poblaciones) < len(procesos):
+        try:
+            poblaciones.append(resultados.get(timeout=ESPERA_RESULTADOS))
+            continue
+        except Empty:
+            pass
+
+        recibidas = {poblacion[0] for poblacion in poblaciones}
+        # Una isla que terminó bien ya dejó su población en la cola antes de salir
+        muertas = [
+            (indice, proceso.exitcode)
+            for indice, proceso in enumerate(procesos)
+            if indice not in recibidas and proceso.exitcode not in (None, 0)
+        ]
+        if muertas:
+            for proceso in procesos:
+                if proceso.is_alive():
+                    proceso.terminate()
+                proceso.join()
+            detalle = ", ".join(f"isla {indice} (código {codigo})" for indice, codigo in muertas)
+            raise JugadorError(
+                f"Evolución en islas interrumpida; terminaron sin publicar su población: {detalle}."
+            )
+    return sorted(poblaciones)
+
+
+def _evolucionar_isla(
+    jugador,
+    indice: int,
+    cantidad_generaciones: int,
+    tamaño_poblacion: int,
+    pasos_maximos: int,
+    intervalo_migracion: int,
+    entrada: Queue,
+    salida: Queue,
+    resultados: Queue,
+    semilla: int,
+) -> None:
+    """
+    Evoluciona la subpoblación de una isla y publica su población final en 'resultados'.
+
+    Args:
+        jugador: Copia del jugador genético recibida por el proceso.
+        indice (int): Número de la isla, para ordenar los resultados.
+        cantidad_generaciones (int): Generaciones que evoluciona la isla.
+        tamaño_poblacion (int): Individuos de la isla.
+        pasos_maximos (int): Máximo de ticks con que se evalúa a cada individuo.
+        intervalo_migracion (int): Cada cuántas generaciones se intercambian genomas.
+        entrada (Queue): Cola por la que llegan los migrantes de la isla anterior.
+        salida (Queue): Cola por la que se envía el mejor genoma a la isla siguiente.
+        resultados (Queue): Cola en que se publica la población final.
+        semilla (int): Semilla de los generadores aleatorios de la isla.
+    """
+    seed(semilla)
+    np.random.seed(semilla)
+    jugador.rng = np.random.default_rng(semilla)
+
+    def migrar(gen_num: int) -> None:
+        if (gen_num + 1) % intervalo_migracion != 0 or gen_num + 1 == cantidad_generaciones:
+            return
+        mejor = int(np.argmax(jugador.aptitudes))
+        salida.put(
+            (
+                jugador.genomas[mejor].copy(),
+                float(jugador.aptitudes[mejor]),
+                float(jugador.epsilons[mejor]),
+            )
+        )
+        _recibir_migrante(jugador, entrada.get())
+
+    jugador._evolucionar(cantidad_generaciones, tamaño_poblacion, pasos_maximos, migrar)
+    resultados.put((indice, jugador.genomas, jugador.aptitudes, jugador.epsilons))
+
+
+def _recibir_migrante(jugador, migrante: Migrante) -> None:
+    """
+    Reemplaza al peor individuo de la isla por el migrante recibido.
+
+    El migrante conserva el desempeño con que llegó, así compite como padre en la próxima
+    generación, y parte con la Q-table vacía.
+
+    Args:
+        jugador: Jugador genético de la isla.
+        migrante (Migrante): Genoma, desempeño y epsilon del migrante.
+    """
+    genoma, aptitud, epsilon = migrante
+    peor = int(np.argmin(jugador.aptitudes))
+    jugador.genomas[peor] = genoma
+    jugador.aptitudes[peor] = aptitud
+    jugador.epsilons[peor] = epsilon
+    jugador.bloque_q[peor].fill(0.0)
@@ -0,0 +1,107 @@
+"""Módulo para guardar y cargar la población del jugador genético entre ejecuciones."""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+ConfiguracionLaberinto = tuple[int, int, float, float, int]
+
+
+@dataclass
+class PoblacionGuardada:
+    """Estado de la evolución guardado en un checkpoint."""
+
+    configuracion: ConfiguracionLaberinto
+    generacion: int  # Generaciones ya evaluadas
+    genomas: np.ndarray
+    aptitudes: np.ndarray
+    epsilons: np.ndarray
+    estado_rng: dict
+    historial_mejor: list[float]
+    historial_diversidad: list[np.ndarray]
+    semillas_laberintos: Optional[list[int]]
+
+
+def configuracion_laberinto(laberinto) -> ConfiguracionLaberinto:
+    """
+    Devuelve los parámetros que definen los laberintos en que evoluciona una población.
+
+    Args:
+        laberinto: Laberinto del jugador genético.
+
+    Returns:
+        ConfiguracionLaberinto: (filas, columnas, prob_murallas, prob_mover_murallas, n_metas).
+    """
+    return (
+        laberinto.filas,
+        laberinto.columnas,
+        laberinto.prob_murallas,
+        laberinto.prob_mover_murallas,
+        laberinto.n_metas,
+    )
+
+
+def guardar_poblacion(poblacion: PoblacionGuardada, ruta: str) -> None:
+    """
+    Guarda el estado de la evolución en un archivo '.npz' comprimido.
+
+    Se escribe primero en un archivo temporal que luego reemplaza al anterior, así una interrupción
+    a mitad de la escritura no deja un checkpoint corrupto.
+
+    Args:
+        poblacion (PoblacionGuardada): Estado a guardar.
+        ruta (str): Ruta del archivo.
+    """
+    ruta_temporal = f"{ruta}.tmp"
+    with open(ruta_temporal, "wb") as archivo:
+        np.savez_compressed(
+            archivo,
+            configuracion=np.array(poblacion.configuracion, dtype=np.float64),
+            generacion=np.array(poblacion.generacion),
+            genomas=poblacion.genomas,
+            aptitudes=poblacion.aptitudes,
+            epsilons=poblacion.epsilons,
+            estado_rng=np.array(json.dumps(poblacion.estado_rng)),
+            historial_mejor=np.array(poblacion.historial_mejor, dtype=np.float64),
+            historial_diversidad=np.array(poblacion.historial_diversidad, dtype=np.float64),
+            semillas_laberintos=np.array(poblacion.semillas_laberintos or [], dtype=np.uint64),
+        )
+    os.replace(ruta_temporal, ruta)
+
+
+def cargar_poblacion(ruta: str, configuracion: ConfiguracionLaberinto) -> PoblacionGuardada:
+    """
+    Carga un estado de la evolución guardado con 'guardar_poblacion'.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        configuracion (ConfiguracionLaberinto): Configuración del laberinto actual.
+
+    Returns:
+        PoblacionGuardada: Estado guardado.
+
+    Raises:
+        ValueError: Si la población evolucionó en laberintos con otra configuración.
+    """
+    with np.load(ruta) as datos:
+        configuracion_guardada = tuple(datos["configuracion"].tolist())
+        if not np.allclose(configuracion_guardada, configuracion):
+            raise ValueError(
+                f"La población de '{ruta}' evolucionó en laberintos {configuracion_guardada}, "
+                f"no {configuracion}."
+            )
+        semillas = datos["semillas_laberintos"].tolist()
+        return PoblacionGuardada(
+            configuracion=configuracion,
+            generacion=int(datos["generacion"]),
+            genomas=datos["genomas"],
+            aptitudes=datos["aptitudes"],
+            epsilons=datos["epsilons"],
+            estado_rng=json.loads(str(datos["estado_rng"])),
+            historial_mejor=datos["historial_mejor"].tolist(),
+            historial_diversidad=list(datos["historial_diversidad"]),
+            semillas_laberintos=semillas or None,
+        )
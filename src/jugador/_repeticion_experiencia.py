@@ -0,0 +1,120 @@
+"""Módulo con el buffer circular de repetición de experiencia de los jugadores basados en Q-learning."""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+from jugador._entrenamiento_paralelo import INDICE_ACCION
+from models import Coordenada, MovimientosPosibles
+
+
+class BufferExperiencia:
+    """
+    Buffer circular de transiciones preasignado en arreglos de numpy.
+
+    Cada transición guarda el id de la casilla de origen (x * columnas + y), la acción, la recompensa, el id
+    de la casilla de llegada y si terminó el episodio. Cada 'pasos_por_lote' transiciones se toma al azar un
+    lote de 'tam_lote' transiciones guardadas y se aplica su actualización de Q-learning de una sola vez con
+    operaciones de numpy, en vez de hacer cada actualización como operaciones escalares sobre diccionarios.
+    Las transiciones poco frecuentes, como las que llegan a la meta, se vuelven a aprovechar en varios lotes.
+    """
+
+    capacidad: int
+    tam_lote: int
+    pasos_por_lote: int
+    columnas: int
+    tamano: int  # Transiciones guardadas, a lo más 'capacidad'
+
+    def __init__(self, capacidad: int, columnas: int, tam_lote: int = 64, pasos_por_lote: int = 8):
+        """
+        Reserva los arreglos del buffer.
+
+        Args:
+            capacidad (int): Máximo de transiciones guardadas; las más antiguas se sobrescriben.
+            columnas (int): Columnas del laberinto, para numerar las casillas.
+            tam_lote (int): Transiciones por lote de actualización.
+            pasos_por_lote (int): Transiciones nuevas entre un lote y el siguiente.
+        """
+        self.capacidad = capacidad
+        self.tam_lote = tam_lote
+        self.pasos_por_lote = pasos_por_lote
+        self.columnas = columnas
+        self.tamano = 0
+
+        self.estados = np.zeros(capacidad, dtype=np.int64)
+        self.acciones = np.zeros(capacidad, dtype=np.int64)
+        self.recompensas = np.zeros(capacidad, dtype=np.float64)
+        self.siguientes = np.zeros(capacidad, dtype=np.int64)
+        self.terminales = np.zeros(capacidad, dtype=bool)
+        self._siguiente_indice = 0
+        self._pasos = 0
+
+    def agregar(
+        self,
+        posicion: Coordenada,
+        accion: MovimientosPosibles,
+        recompensa: float,
+        nueva_posicion: Coordenada,
+        terminal: bool,
+    ) -> None:
+        """
+        Guarda una transición, sobrescribiendo la más antigua si el buffer está lleno.
+
+        Args:
+            posicion (Coordenada): Posición desde la que se movió el jugador.
+            accion (MovimientosPosibles): Movimiento realizado.
+            recompensa (float): Recompensa obtenida.
+            nueva_posicion (Coordenada): Posición a la que llegó.
+            terminal (bool): Si la transición terminó el episodio (llegó a la meta real).
+        """
+        i = self._siguiente_indice
+        self.estados[i] = posicion.x * self.columnas + posicion.y
+        self.acciones[i] = INDICE_ACCION[accion]
+        self.recompensas[i] = recompensa
+        self.siguientes[i] = nueva_posicion.x * self.columnas + nueva_posicion.y
+        self.terminales[i] = terminal
+
+        self._siguiente_indice = (i + 1) % self.capacidad
+        self.tamano = min(self.tamano + 1, self.capacidad)
+        self._pasos += 1
+
+    def actualizar(
+        self,
+        valores: np.ndarray,
+        alpha: float,
+        gamma: float,
+        antes_de_actualizar: Optional[Callable[[Coordenada], None]] = None,
+    ) -> None:
+        """
+        Aplica un lote de actualizaciones si ya pasaron 'pasos_por_lote' transiciones desde el anterior.
+
+        Args:
+            valores (np.ndarray): Arreglo (filas x columnas x acciones) de la Q-table, que se modifica.
+            alpha (float): Tasa de aprendizaje.
+            gamma (float): Factor de descuento futuro.
+            antes_de_actualizar (Optional[Callable[[Coordenada], None]]): Función que se llama con cada
+                casilla del lote antes de aplicarlo.
+        """
+        if self.tamano < self.tam_lote or self._pasos % self.pasos_por_lote:
+            return
+
+        q = valores.reshape(-1, valores.shape[2])  # Vista: una fila por casilla
+        lote = np.random.randint(0, self.tamano, self.tam_lote)
+        estados = self.estados[lote]
+        acciones = self.acciones[lote]
+        if antes_de_actualizar is not None:
+            for estado in np.unique(estados).tolist():
+                antes_de_actualizar(Coordenada(*divmod(estado, self.columnas)))
+
+        objetivos = (
+            self.recompensas[lote]
+            + gamma * q[self.siguientes[lote]].max(axis=1) * ~self.terminales[lote]
+        )
+        errores = objetivos - q[estados, acciones]
+
+        # Un par (estado, acción) repetido en el lote se actualiza una vez con el error promedio: sumar
+        # cada copia equivaldría a multiplicar 'alpha' por las repeticiones y hace diverger la tabla
+        # cuando el buffer se llena con la misma transición (por ejemplo, el jugador atascado)
+        pares = estados * q.shape[1] + acciones
+        unicos, posiciones, repeticiones = np.unique(pares, return_inverse=True, return_counts=True)
+        q.reshape(-1)[unicos] += alpha * np.bincount(posiciones, weights=errores) / repeticiones
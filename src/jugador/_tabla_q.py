@@ -0,0 +1,601 @@
+"""Módulo con utilidades compartidas para las Q-tables de los jugadores basados en Q-learning."""
+
+import os
+import pickle
+from collections import defaultdict, deque
+from statistics import fmean
+from time import perf_counter
+from typing import TYPE_CHECKING, Hashable, Optional
+
+import numpy as np
+
+from models import Coordenada, MotivoParada, MovimientosPosibles, ResultadoEntrenamiento
+
+if TYPE_CHECKING:
+    from laberinto import Laberinto
+
+# Estado local: (máscara de vecinas transitables, dirección x e y a la meta, distancia cuantizada,
+# máscara de vecinas visitadas hace poco)
+EstadoLocal = tuple[int, int, int, int, int]
+MOVIMIENTOS_VECINOS = [
+    mov for mov in MovimientosPosibles if mov is not MovimientosPosibles.NO_MOVERSE
+]
+
+
+def acciones_en_cero() -> dict[MovimientosPosibles, float]:
+    """Devuelve los valores Q iniciales de un estado: 0.0 para cada movimiento posible."""
+    return dict.fromkeys(MovimientosPosibles, 0.0)
+
+
+def crear_tabla_q() -> defaultdict[Hashable, dict[MovimientosPosibles, float]]:
+    """
+    Crea una Q-table vacía que genera las entradas de cada estado la primera vez que se consultan.
+
+    Así la memoria crece con las casillas visitadas y no con el tamaño del laberinto.
+    """
+    return defaultdict(acciones_en_cero)
+
+
+def guardar_tabla_q(
+    Q: dict[Hashable, dict[MovimientosPosibles, float]],
+    ruta: str,
+    dimensiones: tuple[int, int],
+) -> None:
+    """
+    Guarda una Q-table en disco, junto con las dimensiones del laberinto en que se entrenó.
+
+    Args:
+        Q (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table a guardar.
+        ruta (str): Ruta del archivo.
+        dimensiones (tuple[int, int]): Filas y columnas del laberinto de entrenamiento.
+    """
+    tabla = {estado: dict(valores) for estado, valores in Q.items()}
+    with open(ruta, "wb") as archivo:
+        pickle.dump({"dimensiones": dimensiones, "Q": tabla}, archivo)
+
+
+def cargar_tabla_q(
+    ruta: str,
+) -> tuple[defaultdict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]:
+    """
+    Carga una Q-table guardada con 'guardar_tabla_q'.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        tuple[defaultdict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]: Q-table que sigue
+            creando entradas en cero y dimensiones del laberinto en que se entrenó.
+    """
+    with open(ruta, "rb") as archivo:
+        datos = pickle.load(archivo)
+
+    Q = crear_tabla_q()
+    Q.update(datos["Q"])
+    return Q, tuple(datos["dimensiones"])
+
+
+def remuestrear_tabla_q(
+    Q: dict[Hashable, dict[MovimientosPosibles, float]],
+    origen: tuple[int, int],
+    destino: tuple[int, int],
+) -> defaultdict[Hashable, dict[MovimientosPosibles, float]]:
+    """
+    Lleva una Q-table indexada por coordenadas a un laberinto de otras dimensiones.
+
+    Cada casilla del destino copia los valores de la casilla que le corresponde proporcionalmente en el
+    origen (vecino más cercano), así una tabla entrenada en un laberinto chico sirve de punto de partida
+    en uno grande. Las casillas cuyo origen no tiene entrada quedan para crearse en cero.
+
+    Args:
+        Q (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table de origen.
+        origen (tuple[int, int]): Filas y columnas del laberinto de origen.
+        destino (tuple[int, int]): Filas y columnas del laberinto de destino.
+
+    Returns:
+        defaultdict[Hashable, dict[MovimientosPosibles, float]]: Q-table para el laberinto de destino.
+    """
+    filas_origen, columnas_origen = origen
+    filas_destino, columnas_destino = destino
+    nueva = crear_tabla_q()
+    for x in range(filas_destino):
+        x_origen = x * filas_origen // filas_destino
+        for y in range(columnas_destino):
+            valores = Q.get(Coordenada(x_origen, y * columnas_origen // columnas_destino))
+            if valores is not None:
+                nueva[Coordenada(x, y)] = dict(valores)
+    return nueva
+
+
+def entrenar_curriculum(jugador, etapas: list[tuple[int, int]], n_episodios: int) -> None:
+    """
+    Entrena un jugador Q-learning en laberintos cada vez más grandes hasta llegar al suyo.
+
+    Tras cada etapa la Q-table se remuestrea a las dimensiones de la siguiente (si usa coordenadas), de modo
+    que el entrenamiento en el laberinto grande, el más caro, parte de lo aprendido en los chicos. Cada etapa
+    previa juega hasta 'n_episodios' episodios y la final, en el laberinto del jugador, el presupuesto normal
+    de '_entrenar'; con 'criterio_parada' cada una se corta apenas converge.
+
+    Args:
+        jugador: Jugador con 'Q', 'usar_estado_local', 'resultado_entrenamiento' y '_entrenar'.
+        etapas (list[tuple[int, int]]): Dimensiones de las etapas previas, de menor a mayor.
+        n_episodios (int): Máximo de episodios de cada etapa previa.
+    """
+    laberinto_original = jugador.laberinto
+    destino = (laberinto_original.filas, laberinto_original.columnas)
+    episodios = 0
+    segundos = 0.0
+    anterior = None
+
+    for dimensiones in etapas + [destino]:
+        if anterior is not None and not jugador.usar_estado_local:
+            jugador.Q = remuestrear_tabla_q(jugador.Q, anterior, dimensiones)
+
+        # '_entrenar' genera sus episodios con las dimensiones y probabilidades de 'jugador.laberinto'
+        if dimensiones != destino:
+            jugador.laberinto = laberinto_original.crear_similar(jugador, dimensiones=dimensiones)
+            jugador._entrenar(n_episodios)
+        else:
+            # La etapa final entrena con el presupuesto normal, como sin curriculum
+            jugador.laberinto = laberinto_original
+            jugador._entrenar()
+
+        episodios += jugador.resultado_entrenamiento.episodios
+        segundos += jugador.resultado_entrenamiento.segundos
+        anterior = dimensiones
+
+    jugador.resultado_entrenamiento = ResultadoEntrenamiento(
+        episodios, jugador.resultado_entrenamiento.motivo, segundos
+    )
+
+
+def estado_local(
+    laberinto: "Laberinto",
+    posicion: Coordenada,
+    metas_visitadas: list[Coordenada],
+    posiciones_visitadas: deque[Coordenada],
+    libre: Optional[Coordenada] = None,
+) -> EstadoLocal:
+    """
+    Describe una posición solo con lo que la rodea, sin sus coordenadas absolutas.
+
+    El estado lo forman las vecinas transitables (según 'casillas_adyacentes'), el signo de la dirección y la
+    distancia cuantizada (0, 1, 2-3, 4-7, 8+) a la meta no visitada más cercana, y cuáles vecinas se visitaron
+    hace poco. Como no depende del tamaño del laberinto, una Q-table con estos estados tiene a lo más unos
+    miles de entradas y sirve para cualquier configuración.
+
+    Args:
+        laberinto (Laberinto): Laberinto en el que está la posición.
+        posicion (Coordenada): Posición a describir.
+        metas_visitadas (list[Coordenada]): Metas que ya no se buscan.
+        posiciones_visitadas (deque[Coordenada]): Posiciones recientes del jugador.
+        libre (Optional[Coordenada]): Casilla que se cuenta como transitable aunque hoy no lo sea (la que el
+            jugador deja al moverse).
+
+    Returns:
+        EstadoLocal: Estado local de la posición.
+    """
+    from laberinto import CASILLAS_TRANSITABLES  # Import local para evitar ciclo
+
+    adyacentes = laberinto.casillas_adyacentes(posicion)
+    libres = 0
+    visitadas = 0
+    for bit, mov in enumerate(MOVIMIENTOS_VECINOS):
+        if adyacentes.get(mov) in CASILLAS_TRANSITABLES or posicion + mov == libre:
+            libres |= 1 << bit
+        if posicion + mov in posiciones_visitadas:
+            visitadas |= 1 << bit
+
+    metas = laberinto.metas_mas_cercanas_a_posicion(posicion, metas_visitadas)
+    if not metas:
+        return libres, 0, 0, 0, visitadas
+
+    meta = metas[0]
+    dx, dy = meta.x - posicion.x, meta.y - posicion.y
+    distancia = min(posicion.distancia_manhatan(meta).bit_length(), 4)
+    return libres, (dx > 0) - (dx < 0), (dy > 0) - (dy < 0), distancia, visitadas
+
+
+def estado_local_al_llegar(
+    laberinto: "Laberinto",
+    desde: Coordenada,
+    posicion: Coordenada,
+    metas_visitadas: list[Coordenada],
+    posiciones_visitadas: deque[Coordenada],
+) -> EstadoLocal:
+    """
+    Describe el estado local al que llega el jugador si se mueve de 'desde' a 'posicion'.
+
+    Se calcula antes de moverlo, así que la casilla que deja (aún marcada como jugador) se cuenta libre y
+    'posicion' ya figura entre las visitadas (y entre las metas visitadas si es una meta), como la verá el
+    jugador en el tick siguiente.
+
+    Args:
+        laberinto (Laberinto): Laberinto en el que se mueve el jugador.
+        desde (Coordenada): Posición actual del jugador.
+        posicion (Coordenada): Posición a la que se mueve.
+        metas_visitadas (list[Coordenada]): Metas que ya no se buscan.
+        posiciones_visitadas (deque[Coordenada]): Posiciones recientes del jugador.
+
+    Returns:
+        EstadoLocal: Estado local de 'posicion' después del movimiento.
+    """
+    if posicion in laberinto.metas_pos:
+        metas_visitadas = metas_visitadas + [posicion]
+    recientes = deque(posiciones_visitadas, maxlen=posiciones_visitadas.maxlen)
+    recientes.append(posicion)
+    return estado_local(laberinto, posicion, metas_visitadas, recientes, libre=desde)
+
+
+def estado_jugador(jugador, posicion: Coordenada) -> Hashable:
+    """
+    Devuelve la clave de la Q-table del jugador para una posición: la propia coordenada o su estado local.
+
+    Args:
+        jugador: Jugador con 'usar_estado_local', 'laberinto', 'metas_visitadas' y 'posiciones_visitadas'.
+        posicion (Coordenada): Posición del jugador.
+
+    Returns:
+        Hashable: Clave de la Q-table.
+    """
+    if not jugador.usar_estado_local:
+        return posicion
+    return estado_local(
+        jugador.laberinto, posicion, jugador.metas_visitadas, jugador.posiciones_visitadas
+    )
+
+
+def estado_jugador_al_llegar(jugador, desde: Coordenada, posicion: Coordenada) -> Hashable:
+    """
+    Devuelve la clave de la Q-table del estado al que llega el jugador moviéndose de 'desde' a 'posicion'.
+
+    Args:
+        jugador: Jugador con 'usar_estado_local', 'laberinto', 'metas_visitadas' y 'posiciones_visitadas'.
+        desde (Coordenada): Posición actual del jugador.
+        posicion (Coordenada): Posición a la que se mueve.
+
+    Returns:
+        Hashable: Clave de la Q-table (ver 'estado_local_al_llegar').
+    """
+    if not jugador.usar_estado_local:
+        return posicion
+    return estado_local_al_llegar(
+        jugador.laberinto, desde, posicion, jugador.metas_visitadas, jugador.posiciones_visitadas
+    )
+
+
+def arrancar_desde(
+    jugador,
+    Q_inicial: dict[Hashable, dict[MovimientosPosibles, float]],
+    dimensiones: tuple[int, int],
+) -> None:
+    """
+    Hace que el jugador parta desde la Q-table de otro ya entrenado en vez de una vacía.
+
+    Una tabla por coordenadas se remuestrea a las dimensiones del laberinto del jugador; una de estados
+    locales se copia tal cual.
+
+    Args:
+        jugador: Jugador con 'Q', 'usar_estado_local' y 'laberinto'.
+        Q_inicial (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table entrenada.
+        dimensiones (tuple[int, int]): Dimensiones del laberinto en que se entrenó.
+    """
+    if jugador.usar_estado_local:
+        jugador.Q = crear_tabla_q()
+        jugador.Q.update({estado: dict(valores) for estado, valores in Q_inicial.items()})
+        return
+
+    jugador.Q = remuestrear_tabla_q(
+        Q_inicial, dimensiones, (jugador.laberinto.filas, jugador.laberinto.columnas)
+    )
+
+
+def usar_arreglo(jugador) -> None:
+    """
+    Con repetición de experiencia, pasa la Q-table del jugador a un arreglo de numpy si todavía no lo está.
+
+    Args:
+        jugador: Jugador con 'Q', 'replay' y 'laberinto'.
+    """
+    # Import local para evitar ciclo
+    from jugador._entrenamiento_paralelo import ACCIONES, TablaQCompartida, copiar_en_arreglo
+
+    if jugador.replay is None or isinstance(jugador.Q, TablaQCompartida):
+        return
+    valores = np.zeros((jugador.laberinto.filas, jugador.laberinto.columnas, len(ACCIONES)))
+    copiar_en_arreglo(jugador.Q, valores)
+    jugador.Q = TablaQCompartida(valores)
+
+
+def preparar_tabla_q(
+    jugador,
+    ruta_tabla_q: Optional[str],
+    tabla_q_inicial: Optional[
+        tuple[dict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]
+    ],
+    curriculum: Optional[list[tuple[int, int]]],
+    episodios_curriculum: int,
+    procesos: int,
+    segundo_plano: bool,
+) -> None:
+    """
+    Deja lista la Q-table de un jugador Q-learning recién creado: la carga, la entrena o lanza su entrenamiento.
+
+    Parte de 'tabla_q_inicial' si se indica. Si 'ruta_tabla_q' existe la carga de ahí sin entrenar
+    (remuestreándola si se entrenó en otras dimensiones); si no, entrena en segundo plano, con curriculum,
+    en varios procesos o en este, según corresponda, y al terminar la guarda en 'ruta_tabla_q'.
+
+    Args:
+        jugador: Jugador con 'Q', 'laberinto', 'usar_estado_local', 'replay' y '_entrenar'.
+        ruta_tabla_q (Optional[str]): Archivo de donde se carga la Q-table o donde se guarda.
+        tabla_q_inicial (Optional[tuple[dict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]]):
+            Q-table de la cual partir y dimensiones en que se entrenó, como las devuelve 'cargar_tabla_q'.
+        curriculum (Optional[list[tuple[int, int]]]): Dimensiones de las etapas previas del curriculum.
+        episodios_curriculum (int): Máximo de episodios por etapa previa del curriculum.
+        procesos (int): Procesos que entrenan a la vez sobre una Q-table en memoria compartida.
+        segundo_plano (bool): Si es True entrena en otro proceso mientras el jugador ya se mueve.
+
+    Raises:
+        ValueError: Si se pide una combinación de opciones de entrenamiento que no se admite.
+    """
+    # Imports locales para evitar ciclo
+    from jugador._entrenamiento_fondo import EntrenamientoFondo
+    from jugador._entrenamiento_paralelo import entrenar_en_paralelo
+
+    if procesos > 1 and jugador.usar_estado_local:
+        raise ValueError(
+            "El entrenamiento en paralelo solo admite Q-tables indexadas por coordenadas."
+        )
+    if jugador.replay is not None and (jugador.usar_estado_local or curriculum):
+        raise ValueError(
+            "La repetición de experiencia necesita una Q-table por coordenadas de tamaño fijo."
+        )
+
+    if segundo_plano and (
+        jugador.usar_estado_local
+        or curriculum
+        or procesos > 1
+        or jugador.replay is not None
+        or ruta_tabla_q is not None
+    ):
+        raise ValueError(
+            "El entrenamiento en segundo plano solo admite una Q-table por coordenadas que se "
+            "entrena en un único proceso y no se guarda."
+        )
+
+    if tabla_q_inicial is not None:
+        arrancar_desde(jugador, *tabla_q_inicial)
+
+    dimensiones = (jugador.laberinto.filas, jugador.laberinto.columnas)
+    if ruta_tabla_q is not None and os.path.exists(ruta_tabla_q):
+        jugador.Q, dimensiones_guardadas = cargar_tabla_q(ruta_tabla_q)
+        if dimensiones_guardadas != dimensiones:
+            arrancar_desde(jugador, jugador.Q, dimensiones_guardadas)
+        usar_arreglo(jugador)
+    elif segundo_plano:
+        # Juega desde ya con la Q-table que tenga y la va reemplazando por la que se entrena
+        jugador.entrenamiento_fondo = EntrenamientoFondo(
+            jugador, "_entrenar", ("resultado_entrenamiento",)
+        )
+    else:
+        usar_arreglo(jugador)
+        if curriculum:
+            entrenar_curriculum(jugador, curriculum, episodios_curriculum)
+        elif procesos > 1:
+            entrenar_en_paralelo(jugador, procesos)
+        else:
+            jugador._entrenar()
+        usar_arreglo(jugador)  # El entrenamiento en paralelo devuelve una Q-table normal
+        if ruta_tabla_q is not None:
+            guardar_tabla_q(jugador.Q, ruta_tabla_q, dimensiones)
+
+
+class TrazasElegibilidad:
+    """
+    Trazas de elegibilidad de Q(λ) de Watkins guardadas solo para los pares (posición, acción) recientes.
+
+    Cada error TD se reparte entre todos los pares con traza, no solo el último, así la recompensa de una
+    meta llega en un mismo episodio a todo el camino recorrido. Tras cada paso las trazas decaen en γλ y se
+    descartan las que quedan bajo 'umbral', por lo que el costo depende del largo del rastro y no del laberinto.
+    """
+
+    lambda_: float
+    umbral: float
+    trazas: dict[tuple[Hashable, MovimientosPosibles], float]
+
+    def __init__(self, lambda_: float, umbral: float = 1e-3):
+        """
+        Inicializa las trazas vacías.
+
+        Args:
+            lambda_ (float): Factor de decaimiento λ de las trazas.
+            umbral (float): Traza mínima para seguir guardando un par.
+        """
+        self.lambda_ = lambda_
+        self.umbral = umbral
+        self.trazas = {}
+
+    def actualizar(
+        self,
+        Q: dict[Hashable, dict[MovimientosPosibles, float]],
+        pos: Hashable,
+        mov: MovimientosPosibles,
+        delta: float,
+        alpha: float,
+        gamma: float,
+        exploratorio: bool,
+    ) -> None:
+        """
+        Aplica el error TD del paso a todos los pares con traza y luego las decae y poda.
+
+        Si el movimiento fue exploratorio, las trazas anteriores se cortan antes de aplicar el error (Watkins),
+        porque lo aprendido ya no corresponde a la política greedy.
+
+        Args:
+            Q (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table a actualizar.
+            pos (Hashable): Estado desde el que se movió el jugador.
+            mov (MovimientosPosibles): Movimiento realizado.
+            delta (float): Error TD del paso.
+            alpha (float): Tasa de aprendizaje.
+            gamma (float): Factor de descuento futuro.
+            exploratorio (bool): Si el movimiento se eligió al azar en vez de seguir la política.
+        """
+        if exploratorio:
+            self.trazas.clear()
+        self.trazas[(pos, mov)] = 1.0  # Trazas de reemplazo
+
+        decaimiento = gamma * self.lambda_
+        vigentes = {}
+        for (posicion, accion), traza in self.trazas.items():
+            Q[posicion][accion] += alpha * delta * traza
+            traza *= decaimiento
+            if traza >= self.umbral:
+                vigentes[(posicion, accion)] = traza
+        self.trazas = vigentes
+
+    def reiniciar(self) -> None:
+        """Descarta todas las trazas, por ejemplo al terminar un episodio."""
+        self.trazas.clear()
+
+
+class CriterioConvergencia:
+    """
+    Decide cuándo detener el entrenamiento de un jugador basado en Q-learning antes de agotar los episodios.
+
+    Durante el episodio el jugador avisa con 'antes_de_actualizar' cada estado cuyos valores Q va a cambiar,
+    y el criterio guarda sus valores previos. Al terminar el episodio compara solo esos estados con sus
+    valores actuales y registra el mayor cambio absoluto, el cambio promedio por par (estado, acción)
+    actualizado, la fracción de estados actualizados cuya acción greedy cambió y si el jugador llegó a la meta
+    real. Así el costo por episodio depende de lo recorrido y los umbrales no dependen del tamaño del
+    laberinto. Con 'ventana' episodios registrados, el entrenamiento converge cuando el promedio de cada señal
+    en la ventana cumple su umbral; un umbral en None no se exige. Aparte, el entrenamiento se corta apenas
+    se supera 'presupuesto_segundos'.
+
+    Un mismo criterio se puede reutilizar en varios entrenamientos seguidos: 'iniciar' reinicia su estado y
+    'finalizar' deja de registrar actualizaciones hasta el siguiente 'iniciar'.
+    """
+
+    umbral_delta_q_max: Optional[float]
+    umbral_delta_q_medio: Optional[float]
+    umbral_cambio_politica: Optional[float]
+    umbral_exito: Optional[float]
+    ventana: int
+    presupuesto_segundos: Optional[float]
+
+    def __init__(
+        self,
+        umbral_delta_q_max: Optional[float] = None,
+        umbral_delta_q_medio: Optional[float] = 0.4,
+        umbral_cambio_politica: Optional[float] = 0.08,
+        umbral_exito: Optional[float] = None,
+        ventana: int = 50,
+        presupuesto_segundos: Optional[float] = None,
+    ):
+        """
+        Inicializa el criterio con sus umbrales.
+
+        Args:
+            umbral_delta_q_max (Optional[float]): Máximo aceptado del mayor cambio de Q por episodio.
+            umbral_delta_q_medio (Optional[float]): Máximo aceptado del cambio promedio de Q por par
+                (estado, acción) actualizado en el episodio.
+            umbral_cambio_politica (Optional[float]): Máxima fracción de estados actualizados que cambian de
+                acción greedy.
+            umbral_exito (Optional[float]): Mínima tasa de episodios que llegan a la meta real.
+            ventana (int): Cantidad de episodios recientes sobre los que se promedian las señales.
+            presupuesto_segundos (Optional[float]): Tiempo máximo de entrenamiento.
+        """
+        self.umbral_delta_q_max = umbral_delta_q_max
+        self.umbral_delta_q_medio = umbral_delta_q_medio
+        self.umbral_cambio_politica = umbral_cambio_politica
+        self.umbral_exito = umbral_exito
+        self.ventana = ventana
+        self.presupuesto_segundos = presupuesto_segundos
+        self.iniciar()
+        self.finalizar()
+
+    def iniciar(self) -> None:
+        """Reinicia las señales y el reloj para un nuevo entrenamiento y empieza a registrar actualizaciones."""
+        self.inicio = perf_counter()
+        self._activo = True
+        self._anteriores: dict[Hashable, dict[MovimientosPosibles, float]] = {}
+        self._delta_max: deque[float] = deque(maxlen=self.ventana)
+        self._delta_medio: deque[float] = deque(maxlen=self.ventana)
+        self._cambio_politica: deque[float] = deque(maxlen=self.ventana)
+        self._exitos: deque[bool] = deque(maxlen=self.ventana)
+
+    def finalizar(self) -> None:
+        """Deja de registrar actualizaciones, así el juego después del entrenamiento no las acumula."""
+        self._activo = False
+        self._anteriores = {}
+
+    def antes_de_actualizar(
+        self, Q: dict[Hashable, dict[MovimientosPosibles, float]], estado: Hashable
+    ) -> None:
+        """
+        Guarda los valores Q de un estado antes de su primera actualización en el episodio.
+
+        Args:
+            Q (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table que se va a actualizar.
+            estado (Hashable): Estado cuyos valores Q van a cambiar.
+        """
+        if self._activo and estado not in self._anteriores:
+            self._anteriores[estado] = dict(Q[estado])
+
+    def registrar_episodio(
+        self, Q: dict[Hashable, dict[MovimientosPosibles, float]], gano: bool
+    ) -> Optional[MotivoParada]:
+        """
+        Registra las señales del episodio recién terminado y decide si hay que detenerse.
+
+        Args:
+            Q (dict[Hashable, dict[MovimientosPosibles, float]]): Q-table al terminar el episodio.
+            gano (bool): Si el jugador llegó a la meta real en el episodio.
+
+        Returns:
+            Optional[MotivoParada]: Motivo para detener el entrenamiento, o None si debe seguir.
+        """
+        delta_max = 0.0
+        delta_total = 0.0
+        cambios_politica = 0
+        for estado, anteriores in self._anteriores.items():
+            valores = Q[estado]
+            for accion, anterior in anteriores.items():
+                delta = abs(valores[accion] - anterior)
+                delta_total += delta
+                delta_max = max(delta_max, delta)
+            if max(valores, key=valores.__getitem__) != max(anteriores, key=anteriores.__getitem__):
+                cambios_politica += 1
+
+        estados = max(len(self._anteriores), 1)
+        self._delta_max.append(delta_max)
+        self._delta_medio.append(delta_total / (estados * len(MovimientosPosibles)))
+        self._cambio_politica.append(cambios_politica / estados)
+        self._exitos.append(gano)
+        self._anteriores = {}
+
+        if (
+            self.presupuesto_segundos is not None
+            and perf_counter() - self.inicio >= self.presupuesto_segundos
+        ):
+            return MotivoParada.PRESUPUESTO_TIEMPO
+
+        if len(self._exitos) < self.ventana:
+            return None
+
+        # Solo las señales con umbral se exigen; sin ninguna, el entrenamiento no converge antes
+        exigidas = [
+            fmean(valores) <= umbral
+            for valores, umbral in (
+                (self._delta_max, self.umbral_delta_q_max),
+                (self._delta_medio, self.umbral_delta_q_medio),
+                (self._cambio_politica, self.umbral_cambio_politica),
+            )
+            if umbral is not None
+        ]
+        if self.umbral_exito is not None:
+            exigidas.append(fmean(self._exitos) >= self.umbral_exito)
+
+        if exigidas and all(exigidas):
+            return MotivoParada.CONVERGENCIA
+
+        return None
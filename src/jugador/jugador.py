@@ -1,11 +1,12 @@
 """Módulo que define la clase Jugador."""
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from models import CasillaLaberinto, MovimientosPosibles
+from models import MovimientosPosibles
 
 if TYPE_CHECKING:
+    from jugador._entrenamiento_fondo import EntrenamientoFondo
     from laberinto import Laberinto
 
 
@@ -14,6 +15,9 @@ class Jugador(ABC):
 
     laberinto: "Laberinto"
     cantidad_tick: int = 0
+    entrenamiento_fondo: Optional["EntrenamientoFondo"] = (
+        None  # Entrenamiento que sigue en otro proceso
+    )
 
     def __init__(
         self,
@@ -34,19 +38,31 @@ class Jugador(ABC):
         Returns:
             MovimientosPosibles: Movimiento elegido por el jugador.
         """
-        adyacentes = self.laberinto.casillas_adyacentes()
-
-        movimientos_validos = [
-            mov
-            for mov, casilla in adyacentes.items()
-            if casilla
-            in [CasillaLaberinto.CAMINO, CasillaLaberinto.META_FALSA, CasillaLaberinto.META_REAL]
-        ]
+        movimientos_validos = self.laberinto.movimientos_validos()
 
         if not movimientos_validos:
             return MovimientosPosibles.NO_MOVERSE
 
+        return self.elegir_movimiento(movimientos_validos)
+
+    def elegir_movimiento(
+        self, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """
+        Elige un movimiento a partir de una lista no vacía de movimientos válidos ya calculada.
+
+        Es el punto de entrada liviano que usa 'Laberinto.ejecutar' para no recalcular las casillas adyacentes.
+        Si el jugador se sigue entrenando en otro proceso, antes refresca la política con que juega.
+
+        Args:
+            movimientos_validos (list[MovimientosPosibles]): Movimientos posibles para el jugador.
+
+        Returns:
+            MovimientosPosibles: Movimiento elegido por el jugador.
+        """
         self.cantidad_tick += 1
+        if self.entrenamiento_fondo is not None:
+            self.entrenamiento_fondo.refrescar(self)
         return self._eleccion_moverse(movimientos_validos)
 
     @abstractmethod
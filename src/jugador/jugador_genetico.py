@@ -1,43 +1,206 @@
 """Módulo que define el jugador basado en algoritmo genético para el laberinto."""
 
+import os
 from collections import deque
-from random import choice, random, uniform
-from statistics import stdev
-from typing import Optional
+from math import ceil
+from random import Random, uniform
+from time import perf_counter
+from typing import Callable, Optional
+
+import numpy as np
 
-from exceptions import MetaNoEncontradaError
 from jugador import Jugador
+from jugador._entrenamiento_fondo import EntrenamientoFondo
+from jugador._entrenamiento_paralelo import ACCIONES, TablaQCompartida, copiar_en_arreglo
+from jugador._islas import evolucionar_en_islas
+from jugador._poblacion_genetica import (
+    PoblacionGuardada,
+    cargar_poblacion,
+    configuracion_laberinto,
+    guardar_poblacion,
+)
+from jugador._tabla_q import CriterioConvergencia
 from jugador.jugador_q_learning_adaptado import JugadorQlearningAdaptado
-from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+from models import MotivoFinEvolucion, ResultadoEvolucion
+
+GENES = ("gamma", "betha")  # alpha = 1 - gamma y omega = 1 - betha se derivan de estos
+PROBABILIDAD_MUTACION = 0.08
+CANTIDAD_ELITE = 2
+REDUCCION_ETAPA = 3  # En la evaluación escalonada avanza 1 de cada 3 individuos por etapa
+MEJORA_MINIMA = 1e-3  # Mejora del mejor desempeño por debajo de la cual se considera estancamiento
 
 
 class JugadorGenetico(JugadorQlearningAdaptado):
     """
     Jugador que utiliza un algoritmo genético para decidir movimientos en el laberinto.
 
-    Hereda de JugadorQlearningAdaptado y optimiza sus parámetros mediante generaciones.
+    Hereda de JugadorQlearningAdaptado y optimiza sus parámetros mediante generaciones. La población
+    se guarda como arreglos: un genoma (gamma, betha) por fila, el epsilon y la Q-table de cada
+    individuo, y el desempeño de la última evaluación, que se calcula una sola vez por individuo.
+    Las Q-tables de toda la población viven en un único arreglo float32 reservado una vez; cada
+    individuo usa una vista sobre su parte, y las Q-tables se reinician con 'fill' en vez de crearse
+    de nuevo.
+
+    Con 'etapas_evaluacion' > 1 la población se evalúa por etapas (successive halving): todos los
+    individuos juegan primero con pocos ticks, y solo el mejor tercio de cada etapa pasa a la
+    siguiente, con el triple de ticks y un laberinto más. El ranking final considera solo a los
+    individuos que completaron la última etapa, que usa el presupuesto completo.
+
+    Con 'islas' > 1 la población se reparte en subpoblaciones que evolucionan en procesos
+    separados y se pasan su mejor genoma cada 'intervalo_migracion' generaciones.
+
+    Con 'laberintos_comunes' > 0 todos los individuos se evalúan en el mismo conjunto de laberintos
+    (números aleatorios comunes): se sortea una semilla por laberinto, que fija la grilla y el
+    movimiento de las murallas, y el conjunto se renueva cada 'renovacion_laberintos' generaciones.
+    Así las diferencias de desempeño se deben a los genes y no a la suerte del laberinto.
+
+    Después de cada generación se registra la desviación estándar de cada gen y el mejor desempeño.
+    La evolución se detiene antes si la desviación de todos los genes cae bajo 'diversidad_minima' o
+    si el mejor desempeño no mejora en 'ventana_estancamiento' generaciones; el resultado queda en
+    'resultado_evolucion'.
+
+    Con 'ruta_checkpoint' la población (genomas, desempeños, epsilons, estado del generador de numpy
+    e índice de generación) se guarda cada 'intervalo_checkpoint' generaciones y al terminar. Si el
+    archivo ya existe, la evolución se reanuda desde él. Con 'ruta_poblacion_inicial' se parte de
+    una población guardada antes, desde la generación 0. Las Q-tables no se guardan: al cargar una
+    población cada individuo se vuelve a preentrenar.
+
+    Con 'segundo_plano' la evolución y el entrenamiento corren en otro proceso ('EntrenamientoFondo')
+    y el jugador se mueve desde que se crea; al terminar recibe los parámetros evolucionados.
     """
 
-    lista_generaciones: list[JugadorQlearningAdaptado] | None
+    genomas: Optional[np.ndarray]  # (individuos x genes)
+    epsilons: Optional[np.ndarray]  # (individuos,)
+    aptitudes: Optional[np.ndarray]  # (individuos,) desempeño de la última evaluación
+    bloque_q: Optional[np.ndarray]  # (individuos x filas x columnas x acciones) en float32
+    tablas_q: list[TablaQCompartida]  # Vista de cada individuo sobre 'bloque_q'
+    semillas_laberintos: Optional[list[int]]  # Semillas de los laberintos comunes de evaluación
+    historial_diversidad: list[np.ndarray]  # Desviación estándar de cada gen por generación
+    historial_mejor: list[float]  # Mejor desempeño de cada generación
+    resultado_evolucion: Optional[ResultadoEvolucion]
 
-    def __init__(self, laberinto):
+    def __init__(
+        self,
+        laberinto,
+        criterio_parada: Optional[CriterioConvergencia] = None,
+        generaciones: int = 100,
+        tamaño_poblacion: int = 100,
+        diversidad_minima: Optional[float] = None,
+        ventana_estancamiento: Optional[int] = None,
+        etapas_evaluacion: int = 1,
+        islas: int = 1,
+        intervalo_migracion: int = 10,
+        laberintos_comunes: int = 0,
+        renovacion_laberintos: int = 1,
+        ruta_checkpoint: Optional[str] = None,
+        intervalo_checkpoint: int = 10,
+        ruta_poblacion_inicial: Optional[str] = None,
+        segundo_plano: bool = False,
+    ):
         """
         Inicializa el jugador genético.
 
         Args:
             laberinto: Instancia del laberinto donde el jugador se moverá.
+            criterio_parada: Criterio para detener antes el entrenamiento propio y el de cada individuo.
+            generaciones: Máximo de generaciones que evoluciona la población.
+            tamaño_poblacion: Número de individuos en cada generación.
+            diversidad_minima: Desviación estándar bajo la cual, en todos los genes, se considera que la
+                población colapsó y se detiene la evolución; None no la revisa.
+            ventana_estancamiento: Generaciones sin mejora del mejor desempeño tras las cuales se
+                detiene la evolución; None no la revisa.
+            etapas_evaluacion: Etapas de la evaluación escalonada de cada generación; 1 evalúa a todos
+                los individuos con el presupuesto completo.
+            islas: Subpoblaciones que evolucionan cada una en su propio proceso; 1 evoluciona una
+                sola población en este proceso.
+            intervalo_migracion: Cada cuántas generaciones las islas intercambian su mejor genoma.
+            laberintos_comunes: Laberintos compartidos en que se evalúa a todos los individuos de una
+                generación; 0 evalúa a cada individuo en su propio laberinto al azar.
+            renovacion_laberintos: Cada cuántas generaciones se sortean laberintos comunes nuevos.
+            ruta_checkpoint: Archivo donde se guarda la población y desde el cual se reanuda si existe.
+            intervalo_checkpoint: Cada cuántas generaciones se guarda el checkpoint.
+            ruta_poblacion_inicial: Archivo con una población ya evolucionada desde la cual partir.
+            segundo_plano: Si es True evoluciona y entrena en otro proceso mientras el jugador ya se
+                mueve, con los parámetros por defecto de JugadorQlearningAdaptado hasta que termine.
         """
+        if etapas_evaluacion < 1:
+            raise ValueError("etapas_evaluacion debe ser al menos 1.")
+        if islas < 1 or intervalo_migracion < 1:
+            raise ValueError("islas e intervalo_migracion deben ser al menos 1.")
+        if islas > 1 and (diversidad_minima is not None or ventana_estancamiento is not None):
+            raise ValueError("La parada adaptativa no se puede combinar con el modelo de islas.")
+        if islas > 1 and (ruta_checkpoint is not None or ruta_poblacion_inicial is not None):
+            raise ValueError("Los checkpoints no se pueden combinar con el modelo de islas.")
+        if islas > 1 and segundo_plano:
+            # El proceso en segundo plano es un daemon y no puede lanzar los procesos de las islas
+            raise ValueError(
+                "El entrenamiento en segundo plano no se puede combinar con el modelo de islas."
+            )
+        if intervalo_checkpoint < 1:
+            raise ValueError("intervalo_checkpoint debe ser al menos 1.")
+        if laberintos_comunes < 0 or renovacion_laberintos < 1:
+            raise ValueError(
+                "laberintos_comunes no puede ser negativo y renovacion_laberintos debe ser al menos 1."
+            )
+
         Jugador.__init__(self, laberinto)
-        self.lista_generaciones = None
-        self._generaciones()
+        self.genomas = None
+        self.epsilons = None
+        self.aptitudes = None
+        self.bloque_q = None
+        self.tablas_q = []
+        self.rng = np.random.default_rng()
+        self.etapas_evaluacion = etapas_evaluacion
+        self.islas = islas
+        self.intervalo_migracion = intervalo_migracion
+        self.laberintos_comunes = laberintos_comunes
+        self.renovacion_laberintos = renovacion_laberintos
+        self.semillas_laberintos = None
+        self.diversidad_minima = diversidad_minima
+        self.ventana_estancamiento = ventana_estancamiento
+        self.historial_diversidad = []
+        self.historial_mejor = []
+        self.resultado_evolucion = None
+        self.ruta_checkpoint = ruta_checkpoint
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self.ruta_poblacion_inicial = ruta_poblacion_inicial
+        self.trazas = None
+        self.criterio_parada = criterio_parada
+        self.resultado_entrenamiento = None
+        self.cantidad_generaciones = generaciones
+        self.tamaño_poblacion = tamaño_poblacion
 
         self.Q = {}
         self.metas_visitadas = []
         self.posiciones_visitadas = deque(maxlen=10)
-
         self._inicializar_Q_table()
+
+        if segundo_plano:
+            # Parámetros por defecto de JugadorQlearningAdaptado hasta recibir los evolucionados
+            self.alpha, self.gamma, self.betha, self.omega, self.epsilon = 0.1, 0.9, 0.5, 0.5, 0.2
+            self.posicion_inicial = None
+            self.entrenamiento_fondo = EntrenamientoFondo(
+                self,
+                "_evolucionar_y_entrenar",
+                (
+                    "alpha",
+                    "gamma",
+                    "betha",
+                    "omega",
+                    "epsilon",
+                    "resultado_entrenamiento",
+                    "resultado_evolucion",
+                ),
+            )
+        else:
+            self._evolucionar_y_entrenar()
+            self.mostrar_mapas_calor_Q()
+
+    def _evolucionar_y_entrenar(self):
+        """Evoluciona los parámetros de la población y entrena con los del mejor la Q-table propia."""
+        self._generaciones(self.cantidad_generaciones, self.tamaño_poblacion)
+        self.metas_visitadas = []
         self._entrenar(1000)
-        self.mostrar_mapas_calor_Q()
 
     def _generaciones(
         self,
@@ -46,13 +209,15 @@ class JugadorGenetico(JugadorQlearningAdaptado):
         max_steps: Optional[int] = None,
     ):
         """
-        Genera una lista de generaciones de jugadores Q-Learning Estrella Adaptado.
+        Evoluciona la población de parámetros de Q-Learning Estrella Adaptado.
 
         Args:
             cantidad_generaciones: Número de generaciones a crear.
             tamaño_poblacion: Número de individuos en cada generación.
+            max_steps: Máximo de ticks con que se evalúa a cada individuo.
         """
-        from laberinto import Laberinto
+        if tamaño_poblacion < CANTIDAD_ELITE:
+            raise ValueError(f"La población debe tener al menos {CANTIDAD_ELITE} individuos.")
 
         pasos_maximos = (
             (self.laberinto.filas + self.laberinto.columnas) * 10
@@ -60,98 +225,343 @@ class JugadorGenetico(JugadorQlearningAdaptado):
             else max_steps
         )
 
-        for gen_num in range(cantidad_generaciones):
-            if self.lista_generaciones is None:
-                aux_gamma = random()
-                aux_betha = random()
-                self.lista_generaciones = [
-                    JugadorQlearningAdaptado(
-                        laberinto=self.laberinto,
-                        alpha=1 - aux_gamma,
-                        gamma=aux_gamma,
-                        betha=aux_betha,
-                        omega=1 - aux_betha,
-                        epsilon=uniform(0.1, 0.4),
-                    )
-                    for _ in range(tamaño_poblacion)
-                ]
-            else:
-                self.lista_generaciones = sorted(self.lista_generaciones, reverse=True)
-                mejor_jugador = self.lista_generaciones[0]
-                segundo_mejor_jugador = self.lista_generaciones[1]
-                self._crossover_and_mutation(mejor_jugador, segundo_mejor_jugador)
-
-            for jugador in self.lista_generaciones:
-                jugador.cantidad_tick = 0
-                jugador.posicion_inicial = jugador.laberinto.jugador_pos
-                jugador.metas_visitadas = []
-                jugador.posiciones_visitadas.clear()
-
-                jugador.laberinto = Laberinto(
-                    dimensiones=(self.laberinto.filas, self.laberinto.columnas),
-                    prob_murallas=self.laberinto.prob_murallas,
-                    prob_mover_murallas=self.laberinto.prob_mover_murallas,
-                    n_metas=self.laberinto.n_metas,
-                    clase_jugador=JugadorQlearningAdaptado,
-                    jugar_instanciado=jugador,
-                )
-                for _ in range(pasos_maximos):
-                    jugador.laberinto.tick()
-                    if jugador.laberinto.jugador_gano():
-                        break
-                jugador.cantidad_tick = max(1, jugador.cantidad_tick)
-
-        if self.lista_generaciones is None:
-            raise ValueError("No hay jugadores en la lista de generaciones.")
-
-        mejor = max(self.lista_generaciones)
-        self.gamma = mejor.gamma
-        self.alpha = mejor.alpha
-        self.betha = mejor.betha
-        self.omega = mejor.omega
+        inicio = perf_counter()
+        if self.islas > 1:
+            evolucionar_en_islas(
+                self,
+                self.islas,
+                cantidad_generaciones,
+                tamaño_poblacion,
+                pasos_maximos,
+                self.intervalo_migracion,
+            )
+            generaciones, motivo = cantidad_generaciones, MotivoFinEvolucion.GENERACIONES_COMPLETAS
+        else:
+            generaciones, motivo = self._evolucionar(
+                cantidad_generaciones, tamaño_poblacion, pasos_maximos
+            )
+        self.resultado_evolucion = ResultadoEvolucion(generaciones, motivo, perf_counter() - inicio)
+
+        if self.genomas is None:
+            raise ValueError("No hay jugadores en la población.")
+
+        mejor = int(np.argmax(self.aptitudes))
+        self.gamma, self.betha = (float(gen) for gen in self.genomas[mejor])
+        self.alpha = 1 - self.gamma
+        self.omega = 1 - self.betha
         self.epsilon = uniform(0.1, 0.3)
         self.posiciones_visitadas = deque(maxlen=10)
         self.posicion_inicial = None
 
-    def _crossover_and_mutation(
+    def _evolucionar(
         self,
-        mejor_jugador: JugadorQlearningAdaptado,
-        segundo_mejor_jugador: JugadorQlearningAdaptado,
-    ):
-        """Realiza el cruce y la mutación de los jugadores seleccionados para formar una nueva generación."""
-        if self.lista_generaciones is None:
-            raise ValueError("No hay jugadores en la lista de generaciones.")
-
-        for jugador in self.lista_generaciones[2:]:
-
-            def cruzar_valor(v1, v2, min_val=0.0, max_val=1.0):
-                media = (v1 + v2) / 2
-                delta = abs(v1 - v2) / 2
-                nuevo = uniform(media - delta, media + delta)
-                return max(min_val, min(max_val, nuevo))  # Mantener dentro de rango
-
-            jugador.gamma = cruzar_valor(mejor_jugador.gamma, segundo_mejor_jugador.gamma)
-            jugador.alpha = 1 - jugador.gamma
-            jugador.betha = cruzar_valor(mejor_jugador.betha, segundo_mejor_jugador.betha)
-            jugador.omega = 1 - jugador.betha
-            jugador.Q = {}
-
-            # Mutación aleatoria con baja probabilidad (8%)
-            if random() < 0.08:
-                jugador.gamma = random()
-                jugador.alpha = 1 - jugador.gamma
-
-            if random() < 0.08:
-                jugador.betha = random()
-                jugador.omega = 1 - jugador.betha
-
-            # Reiniciar Q-table y variables
-            jugador._inicializar_Q_table()
-            jugador.metas_visitadas = []
-            jugador.posiciones_visitadas.clear()
-
-    def _inicializar_Q_table(self):
-        """Inicializa la Q-table para todas las posiciones posibles del laberinto."""
-        for i in range(self.laberinto.filas):
-            for j in range(self.laberinto.columnas):
-                self.Q[Coordenada(i, j)] = {mov: 0.0 for mov in MovimientosPosibles}
+        cantidad_generaciones: int,
+        tamaño_poblacion: int,
+        pasos_maximos: int,
+        migrar: Optional[Callable[[int], None]] = None,
+    ) -> tuple[int, MotivoFinEvolucion]:
+        """
+        Crea la población inicial y la hace evolucionar durante las generaciones indicadas.
+
+        Args:
+            cantidad_generaciones: Número de generaciones a crear.
+            tamaño_poblacion: Número de individuos en cada generación.
+            pasos_maximos: Máximo de ticks con que se evalúa a cada individuo.
+            migrar: Función que se llama con el número de generación después de cada evaluación;
+                el modelo de islas la usa para intercambiar genomas.
+
+        Returns:
+            tuple[int, MotivoFinEvolucion]: Generaciones creadas en esta llamada (sin contar las que ya
+                traía un checkpoint reanudado) y motivo por el que terminó.
+        """
+        evaluador = None
+        primera_generacion = 0
+        if self.ruta_checkpoint is not None and os.path.exists(self.ruta_checkpoint):
+            primera_generacion = self._restaurar_poblacion(self.ruta_checkpoint, reanudar=True)
+            # Un checkpoint de una evolución ya terminada se usa tal cual, sin preentrenar de nuevo
+            motivo = self._motivo_fin_evolucion() if self.historial_mejor else None
+            if motivo is not None:
+                return 0, motivo
+            if primera_generacion >= cantidad_generaciones:
+                return 0, MotivoFinEvolucion.GENERACIONES_COMPLETAS
+        elif self.ruta_poblacion_inicial is not None:
+            self._restaurar_poblacion(self.ruta_poblacion_inicial, reanudar=False)
+        if self.genomas is not None:
+            evaluador = self._preentrenar_poblacion()
+
+        for gen_num in range(primera_generacion, cantidad_generaciones):
+            if self.laberintos_comunes and gen_num % self.renovacion_laberintos == 0:
+                self._sortear_laberintos()
+            if self.genomas is None:
+                evaluador = self._poblacion_inicial(tamaño_poblacion)
+            else:
+                self._crossover_and_mutation(np.argsort(-self.aptitudes, kind="stable"))
+
+            self._evaluar_poblacion(evaluador, pasos_maximos)
+            if migrar is not None:
+                migrar(gen_num)
+
+            self.historial_diversidad.append(self.genomas.std(axis=0))
+            self.historial_mejor.append(float(self.aptitudes.max()))
+            motivo = self._motivo_fin_evolucion()
+            if self.ruta_checkpoint is not None and (
+                motivo is not None
+                or (gen_num + 1) % self.intervalo_checkpoint == 0
+                or gen_num + 1 == cantidad_generaciones
+            ):
+                self._guardar_checkpoint(gen_num + 1)
+            if motivo is not None:
+                return gen_num + 1 - primera_generacion, motivo
+
+        return cantidad_generaciones - primera_generacion, MotivoFinEvolucion.GENERACIONES_COMPLETAS
+
+    def _guardar_checkpoint(self, generacion: int):
+        """
+        Guarda la población actual en 'ruta_checkpoint'.
+
+        Args:
+            generacion: Generaciones ya evaluadas.
+        """
+        guardar_poblacion(
+            PoblacionGuardada(
+                configuracion=configuracion_laberinto(self.laberinto),
+                generacion=generacion,
+                genomas=self.genomas,
+                aptitudes=self.aptitudes,
+                epsilons=self.epsilons,
+                estado_rng=self.rng.bit_generator.state,
+                historial_mejor=self.historial_mejor,
+                historial_diversidad=self.historial_diversidad,
+                semillas_laberintos=self.semillas_laberintos,
+            ),
+            self.ruta_checkpoint,
+        )
+
+    def _restaurar_poblacion(self, ruta: str, reanudar: bool) -> int:
+        """
+        Carga una población guardada para seguir evolucionándola.
+
+        Args:
+            ruta: Archivo con la población.
+            reanudar: Si es True también se restauran el generador, los historiales y los laberintos
+                comunes, y se sigue desde la generación guardada; si no, se parte desde la 0.
+
+        Returns:
+            int: Generación desde la cual continuar.
+        """
+        poblacion = cargar_poblacion(ruta, configuracion_laberinto(self.laberinto))
+        self.genomas = poblacion.genomas
+        self.aptitudes = poblacion.aptitudes
+        self.epsilons = poblacion.epsilons
+        if not reanudar:
+            return 0
+
+        self.rng.bit_generator.state = poblacion.estado_rng
+        self.historial_mejor = poblacion.historial_mejor
+        self.historial_diversidad = poblacion.historial_diversidad
+        self.semillas_laberintos = poblacion.semillas_laberintos
+        return poblacion.generacion
+
+    def _motivo_fin_evolucion(self) -> Optional[MotivoFinEvolucion]:
+        """
+        Revisa si la evolución debe detenerse según la diversidad y el mejor desempeño registrados.
+
+        Returns:
+            Optional[MotivoFinEvolucion]: Motivo para detenerse, o None si debe continuar.
+        """
+        if self.diversidad_minima is not None and np.all(
+            self.historial_diversidad[-1] < self.diversidad_minima
+        ):
+            return MotivoFinEvolucion.DIVERSIDAD_AGOTADA
+
+        ventana = self.ventana_estancamiento
+        if ventana is not None and len(self.historial_mejor) > ventana:
+            mejor_anterior = max(self.historial_mejor[:-ventana])
+            if max(self.historial_mejor[-ventana:]) < mejor_anterior + MEJORA_MINIMA:
+                return MotivoFinEvolucion.ESTANCAMIENTO
+        return None
+
+    def _poblacion_inicial(self, tamaño_poblacion: int) -> JugadorQlearningAdaptado:
+        """
+        Sortea los genomas iniciales y preentrena la Q-table de cada individuo.
+
+        Args:
+            tamaño_poblacion: Número de individuos de la población.
+
+        Returns:
+            JugadorQlearningAdaptado: Jugador que se reutiliza para evaluar a los individuos.
+        """
+        self.genomas = self.rng.random((tamaño_poblacion, len(GENES)))
+        self.epsilons = self.rng.uniform(0.1, 0.4, tamaño_poblacion)
+        return self._preentrenar_poblacion()
+
+    def _preentrenar_poblacion(self) -> JugadorQlearningAdaptado:
+        """
+        Preentrena desde cero la Q-table de cada individuo de la población.
+
+        Todos los individuos se entrenan y evalúan con un único jugador evaluador, al que se le
+        cargan los parámetros y la Q-table del individuo de turno.
+
+        Returns:
+            JugadorQlearningAdaptado: Jugador que se reutiliza para evaluar a los individuos.
+        """
+        gamma, betha = self.genomas[0]
+        evaluador = JugadorQlearningAdaptado(
+            laberinto=self.laberinto,
+            alpha=1 - gamma,
+            gamma=gamma,
+            betha=betha,
+            omega=1 - betha,
+            epsilon=self.epsilons[0],
+            criterio_parada=self.criterio_parada,
+        )
+        self._reservar_tablas_q()
+        copiar_en_arreglo(evaluador.Q, self.bloque_q[0])
+        for individuo in range(1, len(self.genomas)):
+            self._cargar_individuo(evaluador, individuo)
+            evaluador._entrenar(100)
+        return evaluador
+
+    def _reservar_tablas_q(self):
+        """
+        Reserva el arreglo con las Q-tables de la población, en cero, y la vista de cada individuo.
+
+        Si ya hay un arreglo del mismo tamaño se reutiliza.
+        """
+        forma = (len(self.genomas), self.laberinto.filas, self.laberinto.columnas, len(ACCIONES))
+        if self.bloque_q is None or self.bloque_q.shape != forma:
+            self.bloque_q = np.zeros(forma, dtype=np.float32)
+            self.tablas_q = [TablaQCompartida(tabla) for tabla in self.bloque_q]
+        else:
+            self.bloque_q.fill(0.0)
+
+    def _sortear_laberintos(self):
+        """
+        Sortea las semillas de los laberintos comunes de evaluación.
+
+        Se sortean al menos tantas como etapas de evaluación, para que cada etapa tenga sus laberintos.
+        """
+        cantidad = max(self.laberintos_comunes, self.etapas_evaluacion)
+        self.semillas_laberintos = self.rng.integers(2**32, size=cantidad).tolist()
+
+    def _semillas_etapa(self, etapa: int) -> list[Optional[int]]:
+        """
+        Devuelve las semillas de los laberintos en que se evalúa la etapa indicada.
+
+        Sin laberintos comunes, cada recorrido usa un laberinto al azar (semilla None). La etapa 'i'
+        recorre 'i + 1' laberintos, salvo la última con laberintos comunes, que los recorre todos.
+
+        Args:
+            etapa: Índice de la etapa de evaluación.
+
+        Returns:
+            list[Optional[int]]: Una semilla por laberinto a recorrer.
+        """
+        if self.semillas_laberintos is None:
+            return [None] * (etapa + 1)
+        if etapa == self.etapas_evaluacion - 1:
+            return self.semillas_laberintos
+        return self.semillas_laberintos[: etapa + 1]
+
+    def _cargar_individuo(self, evaluador: JugadorQlearningAdaptado, individuo: int):
+        """Copia al evaluador los parámetros y la Q-table del individuo indicado."""
+        gamma, betha = (float(gen) for gen in self.genomas[individuo])
+        evaluador.gamma = gamma
+        evaluador.alpha = 1 - gamma
+        evaluador.betha = betha
+        evaluador.omega = 1 - betha
+        evaluador.epsilon = float(self.epsilons[individuo])
+        evaluador.Q = self.tablas_q[individuo]
+
+    def _evaluar_poblacion(self, evaluador: JugadorQlearningAdaptado, pasos_maximos: int):
+        """
+        Evalúa a la población y guarda el desempeño de cada individuo en 'aptitudes'.
+
+        En la evaluación escalonada, los individuos descartados en alguna etapa quedan con desempeño
+        -inf, así no compiten con los que jugaron con el presupuesto completo.
+
+        Args:
+            evaluador: Jugador en que se carga cada individuo para recorrer el laberinto.
+            pasos_maximos: Máximo de ticks de la evaluación completa.
+        """
+        individuos = np.arange(len(self.genomas))
+        ultima_etapa = self.etapas_evaluacion - 1
+        self.aptitudes = np.full(len(individuos), -np.inf)
+
+        for etapa in range(self.etapas_evaluacion):
+            pasos = max(1, pasos_maximos // REDUCCION_ETAPA ** (ultima_etapa - etapa))
+            aptitudes = self._evaluar(evaluador, individuos, pasos, self._semillas_etapa(etapa))
+            if etapa < ultima_etapa:
+                cantidad = max(CANTIDAD_ELITE, ceil(len(individuos) / REDUCCION_ETAPA))
+                individuos = individuos[np.argsort(-aptitudes, kind="stable")[:cantidad]]
+
+        self.aptitudes[individuos] = aptitudes
+
+    def _evaluar(
+        self,
+        evaluador: JugadorQlearningAdaptado,
+        individuos: np.ndarray,
+        pasos_maximos: int,
+        semillas: list[Optional[int]],
+    ) -> np.ndarray:
+        """
+        Hace jugar a los individuos indicados en laberintos nuevos y calcula su desempeño medio.
+
+        Args:
+            evaluador: Jugador en que se carga cada individuo para recorrer el laberinto.
+            individuos: Índices de los individuos a evaluar.
+            pasos_maximos: Máximo de ticks de cada recorrido.
+            semillas: Semilla de cada laberinto que recorre cada individuo; None genera uno al azar.
+
+        Returns:
+            np.ndarray: Desempeño medio de cada individuo, en el orden de 'individuos'.
+        """
+        aptitudes = np.zeros(len(individuos))
+        for posicion, individuo in enumerate(individuos):
+            self._cargar_individuo(evaluador, individuo)
+            for semilla in semillas:
+                evaluador.cantidad_tick = 0
+                evaluador.posicion_inicial = evaluador.laberinto.jugador_pos
+                evaluador.metas_visitadas = []
+                evaluador.posiciones_visitadas.clear()
+
+                evaluador.laberinto = self.laberinto.crear_similar(
+                    evaluador, aleatorio=Random(semilla) if semilla is not None else None
+                )
+                evaluador.laberinto.ejecutar(pasos_maximos)
+                evaluador.cantidad_tick = max(1, evaluador.cantidad_tick)
+                aptitudes[posicion] += evaluador.desempeno()
+
+            self.epsilons[individuo] = evaluador.epsilon
+        return aptitudes / len(semillas)
+
+    def _crossover_and_mutation(self, orden: np.ndarray):
+        """
+        Forma la nueva generación a partir de los dos mejores individuos.
+
+        Los dos mejores pasan intactos, con su Q-table. El resto son hijos de un cruce uniforme entre
+        los genes de ambos padres con mutación del 8% por gen, y parten con la Q-table vacía.
+
+        Args:
+            orden: Índices de la población ordenados de mejor a peor desempeño.
+        """
+        if self.genomas is None:
+            raise ValueError("No hay jugadores en la población.")
+
+        padres = self.genomas[orden[:CANTIDAD_ELITE]]
+        cantidad_hijos = len(self.genomas) - CANTIDAD_ELITE
+
+        media = padres.mean(axis=0)
+        delta = np.abs(padres[0] - padres[1]) / 2
+        hijos = self.rng.uniform(media - delta, media + delta, (cantidad_hijos, len(GENES)))
+        np.clip(hijos, 0.0, 1.0, out=hijos)  # Mantener dentro de rango
+
+        # Mutación aleatoria con baja probabilidad (8%) por gen
+        mutados = self.rng.random(hijos.shape) < PROBABILIDAD_MUTACION
+        hijos[mutados] = self.rng.random(np.count_nonzero(mutados))
+
+        self.genomas = np.concatenate((padres, hijos))
+        self.epsilons = self.epsilons[orden]
+        # Las Q-tables de los padres pasan a las primeras filas del arreglo; las vistas no cambian
+        self.bloque_q[:CANTIDAD_ELITE] = self.bloque_q[orden[:CANTIDAD_ELITE]]
+        self.bloque_q[CANTIDAD_ELITE:].fill(0.0)
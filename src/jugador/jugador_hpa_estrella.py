@@ -0,0 +1,455 @@
+"""Módulo que define el jugador basado en búsqueda jerárquica (HPA*) para el laberinto."""
+
+from collections import deque
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from itertools import count
+from random import choice
+from typing import Optional
+
+from campo_flujo import vecindario
+from exceptions import MetaNoEncontradaError
+from jugador import Jugador
+from models import CambiosTick, CasillaLaberinto, Coordenada, MovimientosPosibles
+
+ClaveCluster = tuple[int, int]
+ClaveBorde = tuple[ClaveCluster, ClaveCluster]
+
+
+@dataclass
+class Cluster:
+    """
+    Copia local de las casillas de un cluster junto con su parte abstracta.
+
+    'libres' guarda, fila por fila, si cada casilla del cluster es transitable; así los recorridos dentro del
+    cluster trabajan con índices enteros en vez de consultar el laberinto casilla por casilla.
+    """
+
+    origen: Coordenada
+    alto: int
+    ancho: int
+    libres: list[bool]
+    distancias: dict[Coordenada, dict[Coordenada, int]]  # Entre entradas, sin salir del cluster
+    salidas: dict[
+        Coordenada, list[Coordenada]
+    ]  # Casillas vecinas de cada entrada en otros clusters
+
+    def indice(self, casilla: Coordenada) -> int:
+        return (casilla.x - self.origen.x) * self.ancho + (casilla.y - self.origen.y)
+
+    def casilla(self, indice: int) -> Coordenada:
+        fila, columna = divmod(indice, self.ancho)
+        return Coordenada(self.origen.x + fila, self.origen.y + columna)
+
+
+class JugadorHPAEstrella(Jugador):
+    """
+    Jugador que planifica con HPA* (Hierarchical Pathfinding A*).
+
+    La grilla se divide en clusters cuadrados de 'tam_cluster' casillas de lado. En cada borde entre dos
+    clusters, cada tramo continuo de casillas transitables a ambos lados aporta una entrada (la del medio
+    del tramo). El grafo abstracto une las entradas de un mismo cluster con su distancia dentro de él y
+    cada entrada con su par al otro lado del borde; A* recorre ese grafo y luego la ruta se refina casilla
+    por casilla solo dentro de los clusters por los que pasa.
+
+    Los clusters y bordes se calculan la primera vez que la búsqueda los necesita y, cuando una muralla se
+    mueve, solo se descartan los clusters (y bordes) que tocan las casillas cambiadas.
+    """
+
+    tam_cluster: int
+    camino: deque[Coordenada]
+    metas_visitadas: list[Coordenada]
+    meta_objetivo: Optional[Coordenada]
+    replanificar: bool
+
+    def __init__(self, laberinto, tam_cluster: int = 16):
+        """
+        Inicializa el jugador HPA* y se suscribe a los cambios del laberinto.
+
+        Args:
+            laberinto (Laberinto): Laberinto a recorrer.
+            tam_cluster (int): Lado de cada cluster en casillas.
+        """
+        super().__init__(laberinto)
+        self.tam_cluster = tam_cluster
+        self.camino = deque()
+        self.metas_visitadas = []
+        self.meta_objetivo = None
+        self.replanificar = True
+
+        self._casillas_camino: set[Coordenada] = set()
+        self._clusters: dict[ClaveCluster, Cluster] = {}
+        self._bordes: dict[ClaveBorde, list[tuple[Coordenada, Coordenada]]] = {}
+        self._ticks_sin_ruta = 0
+
+        self.laberinto.suscribir(self._al_cambiar_laberinto)
+
+    def _al_cambiar_laberinto(self, cambios: CambiosTick) -> None:
+        """Descarta la parte abstracta que tocan las casillas cambiadas y marca la ruta si quedó bloqueada."""
+        for casilla in cambios.murallas_nuevas + cambios.casillas_liberadas:
+            self._invalidar(casilla)
+
+        if any(muralla in self._casillas_camino for muralla in cambios.murallas_nuevas):
+            self.replanificar = True
+
+    def _invalidar(self, casilla: Coordenada) -> None:
+        """
+        Descarta el cluster de la casilla y, si está en su orilla, el borde compartido y el cluster vecino.
+
+        Args:
+            casilla (Coordenada): Casilla que cambió de tipo.
+        """
+        tam = self.tam_cluster
+        ci, fila = divmod(casilla.x, tam)
+        cj, columna = divmod(casilla.y, tam)
+        clave = (ci, cj)
+        self._clusters.pop(clave, None)
+
+        vecinos = []
+        if fila == 0 and ci > 0:
+            vecinos.append((ci - 1, cj))
+        if fila == tam - 1 and casilla.x + 1 < self.laberinto.filas:
+            vecinos.append((ci + 1, cj))
+        if columna == 0 and cj > 0:
+            vecinos.append((ci, cj - 1))
+        if columna == tam - 1 and casilla.y + 1 < self.laberinto.columnas:
+            vecinos.append((ci, cj + 1))
+
+        for clave_vecina in vecinos:
+            self._bordes.pop(self._clave_borde(clave, clave_vecina), None)
+            self._clusters.pop(clave_vecina, None)
+
+    def _eleccion_moverse(
+        self, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """
+        Sigue la ruta planificada con HPA*, replanificando si hace falta.
+
+        Si no existe ruta hacia la meta, se acerca a ella de forma greedy y reintenta cada 'tam_cluster' ticks.
+
+        Args:
+            movimientos_validos (list[MovimientosPosibles]): Movimientos posibles para el jugador.
+
+        Returns:
+            MovimientosPosibles: Movimiento elegido.
+        """
+        posicion = self.laberinto.jugador_pos
+
+        if self.meta_objetivo is None:
+            self.meta_objetivo = self._seleccionar_meta()
+            self.replanificar = True
+
+        movimiento = self._siguiente_movimiento(posicion, movimientos_validos)
+        if movimiento is None and self._ticks_sin_ruta == 0:
+            # La ruta quedó bloqueada en el siguiente paso (una muralla se movió este tick)
+            self.replanificar = True
+            movimiento = self._siguiente_movimiento(posicion, movimientos_validos)
+        if movimiento is None:
+            movimiento = self._movimiento_greedy(posicion, movimientos_validos)
+
+        nueva_posicion = posicion + movimiento
+        if (
+            nueva_posicion in self.laberinto.metas_pos
+            and nueva_posicion not in self.metas_visitadas
+        ):
+            self.metas_visitadas.append(nueva_posicion)
+            if nueva_posicion == self.meta_objetivo:
+                self.meta_objetivo = None
+                self.camino.clear()
+                self._casillas_camino.clear()
+                self._ticks_sin_ruta = 0
+
+        return movimiento
+
+    def _siguiente_movimiento(
+        self, posicion: Coordenada, movimientos_validos: list[MovimientosPosibles]
+    ) -> Optional[MovimientosPosibles]:
+        """Devuelve el movimiento hacia la siguiente casilla de la ruta, o None si no se puede seguir."""
+        if self._ticks_sin_ruta > 0:
+            self._ticks_sin_ruta -= 1
+        elif self.replanificar or not self.camino:
+            self._planificar(posicion)
+
+        if not self.camino:
+            return None
+
+        siguiente = self.camino[0]
+        for mov in movimientos_validos:
+            if posicion + mov == siguiente:
+                self.camino.popleft()
+                self._casillas_camino.discard(siguiente)
+                return mov
+        return None
+
+    def _movimiento_greedy(
+        self, posicion: Coordenada, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """Elige el movimiento que más acerca a la meta objetivo (aleatorio si hay empate)."""
+        mejor_distancia = min(
+            (posicion + mov).distancia_manhatan(self.meta_objetivo) for mov in movimientos_validos
+        )
+        return choice(
+            [
+                mov
+                for mov in movimientos_validos
+                if (posicion + mov).distancia_manhatan(self.meta_objetivo) == mejor_distancia
+            ]
+        )
+
+    def _seleccionar_meta(self) -> Coordenada:
+        """
+        Selecciona la meta no visitada más cercana al jugador.
+
+        Raises:
+            MetaNoEncontradaError: Si no hay metas disponibles para dirigirse.
+        """
+        metas_mas_cercanas = self.laberinto.metas_mas_cercanas_a_posicion(
+            self.laberinto.jugador_pos, self.metas_visitadas
+        )
+
+        if not metas_mas_cercanas:
+            raise MetaNoEncontradaError("No hay metas a las cuales dirigirse.")
+
+        return choice(metas_mas_cercanas)
+
+    def _planificar(self, inicio: Coordenada) -> None:
+        """Calcula la ruta desde 'inicio' hasta la meta objetivo y la guarda casilla por casilla."""
+        self.replanificar = False
+        self.camino.clear()
+        self._casillas_camino.clear()
+
+        # Las murallas de este tick ya se movieron, pero sus cambios se publican recién al terminar el tick
+        for origen, destino in self.laberinto.murallas_movidas:
+            self._invalidar(origen)
+            self._invalidar(destino)
+
+        ruta = self.buscar_ruta(inicio, self.meta_objetivo)
+        if ruta is None:
+            self._ticks_sin_ruta = self.tam_cluster
+            return
+
+        self.camino.extend(ruta[1:])
+        self._casillas_camino.update(self.camino)
+
+    # --- Grafo abstracto ---
+
+    def _clave_cluster(self, casilla: Coordenada) -> ClaveCluster:
+        return casilla.x // self.tam_cluster, casilla.y // self.tam_cluster
+
+    @staticmethod
+    def _clave_borde(clave_a: ClaveCluster, clave_b: ClaveCluster) -> ClaveBorde:
+        return (clave_a, clave_b) if clave_a < clave_b else (clave_b, clave_a)
+
+    def _transitable(self, casilla: Coordenada) -> bool:
+        return self.laberinto.get_casilla(casilla) != CasillaLaberinto.MURALLA
+
+    def _clusters_vecinos(self, clave: ClaveCluster) -> list[ClaveCluster]:
+        """Devuelve las claves de los clusters que comparten un borde con el dado."""
+        max_ci = (self.laberinto.filas - 1) // self.tam_cluster
+        max_cj = (self.laberinto.columnas - 1) // self.tam_cluster
+        ci, cj = clave
+        vecinos = [(ci - 1, cj), (ci + 1, cj), (ci, cj - 1), (ci, cj + 1)]
+        return [(i, j) for i, j in vecinos if 0 <= i <= max_ci and 0 <= j <= max_cj]
+
+    def _borde(self, clave_borde: ClaveBorde) -> list[tuple[Coordenada, Coordenada]]:
+        """
+        Devuelve las entradas del borde entre dos clusters vecinos, calculándolas si no están guardadas.
+
+        Returns:
+            list[tuple[Coordenada, Coordenada]]: Pares (casilla del primer cluster, casilla del segundo).
+        """
+        entradas = self._bordes.get(clave_borde)
+        if entradas is not None:
+            return entradas
+
+        (ci, cj), (di, dj) = clave_borde
+        tam = self.tam_cluster
+        if di != ci:
+            # Borde horizontal: la última fila del primero contra la primera del segundo
+            x = di * tam
+            inicio, fin = cj * tam, min((cj + 1) * tam, self.laberinto.columnas)
+            pares = [(Coordenada(x - 1, y), Coordenada(x, y)) for y in range(inicio, fin)]
+        else:
+            y = dj * tam
+            inicio, fin = ci * tam, min((ci + 1) * tam, self.laberinto.filas)
+            pares = [(Coordenada(x, y - 1), Coordenada(x, y)) for x in range(inicio, fin)]
+
+        entradas = []
+        tramo: list[tuple[Coordenada, Coordenada]] = []
+        for a, b in pares:
+            if self._transitable(a) and self._transitable(b):
+                tramo.append((a, b))
+            elif tramo:
+                entradas.append(tramo[len(tramo) // 2])
+                tramo = []
+        if tramo:
+            entradas.append(tramo[len(tramo) // 2])
+
+        self._bordes[clave_borde] = entradas
+        return entradas
+
+    def _cluster(self, clave: ClaveCluster) -> Cluster:
+        """Devuelve la parte abstracta del cluster, calculándola si no está guardada."""
+        cluster = self._clusters.get(clave)
+        if cluster is not None:
+            return cluster
+
+        origen = Coordenada(clave[0] * self.tam_cluster, clave[1] * self.tam_cluster)
+        alto = min(self.tam_cluster, self.laberinto.filas - origen.x)
+        ancho = min(self.tam_cluster, self.laberinto.columnas - origen.y)
+        libres = [
+            self._transitable(Coordenada(x, y))
+            for x in range(origen.x, origen.x + alto)
+            for y in range(origen.y, origen.y + ancho)
+        ]
+
+        salidas: dict[Coordenada, list[Coordenada]] = {}
+        for vecino in self._clusters_vecinos(clave):
+            clave_borde = self._clave_borde(clave, vecino)
+            for a, b in self._borde(clave_borde):
+                propia, ajena = (a, b) if clave_borde[0] == clave else (b, a)
+                salidas.setdefault(propia, []).append(ajena)
+
+        cluster = Cluster(
+            origen=origen, alto=alto, ancho=ancho, libres=libres, distancias={}, salidas=salidas
+        )
+        for entrada in salidas:
+            alcanzadas, _ = self._bfs_en_cluster(cluster, entrada)
+            cluster.distancias[entrada] = {
+                otra: alcanzadas[cluster.indice(otra)]
+                for otra in salidas
+                if otra != entrada and alcanzadas[cluster.indice(otra)] >= 0
+            }
+
+        self._clusters[clave] = cluster
+        return cluster
+
+    @staticmethod
+    def _bfs_en_cluster(
+        cluster: Cluster, origen: Coordenada, destino: Optional[Coordenada] = None
+    ) -> tuple[list[int], list[int]]:
+        """
+        Recorre en anchura las casillas transitables del cluster desde 'origen' sin salir de él.
+
+        Args:
+            cluster (Cluster): Cluster al que se restringe el recorrido.
+            origen (Coordenada): Casilla de partida.
+            destino (Optional[Coordenada]): Si se indica, el recorrido termina al alcanzarlo.
+
+        Returns:
+            tuple[list[int], list[int]]: Distancia y padre de cada casilla por índice del cluster (-1 si no se alcanzó).
+        """
+        libres = cluster.libres
+        vecinas = vecindario(cluster.alto, cluster.ancho)
+        distancias = [-1] * len(libres)
+        padres = [-1] * len(libres)
+        inicio = cluster.indice(origen)
+        objetivo = cluster.indice(destino) if destino is not None else -1
+
+        distancias[inicio] = 0
+        pendientes = deque([inicio])
+        while pendientes:
+            i = pendientes.popleft()
+            if i == objetivo:
+                break
+            distancia = distancias[i] + 1
+            for j in vecinas[i]:
+                if libres[j] and distancias[j] < 0:
+                    distancias[j] = distancia
+                    padres[j] = i
+                    pendientes.append(j)
+        return distancias, padres
+
+    # --- Búsqueda ---
+
+    def buscar_ruta(self, inicio: Coordenada, meta: Coordenada) -> Optional[list[Coordenada]]:
+        """
+        Busca una ruta entre 'inicio' y 'meta' con A* sobre el grafo abstracto y la refina casilla por casilla.
+
+        Args:
+            inicio (Coordenada): Casilla de partida.
+            meta (Coordenada): Casilla de llegada.
+
+        Returns:
+            Optional[list[Coordenada]]: Casillas de la ruta (incluye inicio y meta), o None si la meta no es alcanzable.
+        """
+        if inicio == meta:
+            return [inicio]
+
+        clave_inicio = self._clave_cluster(inicio)
+        clave_meta = self._clave_cluster(meta)
+
+        # El inicio y la meta se conectan temporalmente con las entradas de sus clusters
+        cluster_inicio = self._cluster(clave_inicio)
+        cluster_meta = self._cluster(clave_meta)
+        desde_inicio, _ = self._bfs_en_cluster(cluster_inicio, inicio)
+        hacia_meta, _ = self._bfs_en_cluster(cluster_meta, meta)
+        entradas_inicio = {
+            entrada: desde_inicio[cluster_inicio.indice(entrada)]
+            for entrada in cluster_inicio.salidas
+            if desde_inicio[cluster_inicio.indice(entrada)] >= 0
+        }
+        if clave_meta == clave_inicio and desde_inicio[cluster_inicio.indice(meta)] >= 0:
+            entradas_inicio[meta] = desde_inicio[cluster_inicio.indice(meta)]
+
+        def vecinos(nodo: Coordenada):
+            if nodo == inicio:
+                yield from entradas_inicio.items()
+            clave = self._clave_cluster(nodo)
+            cluster = self._cluster(clave)
+            if nodo in cluster.salidas:
+                yield from cluster.distancias[nodo].items()
+                for ajena in cluster.salidas[nodo]:
+                    yield ajena, 1
+            if clave == clave_meta and hacia_meta[cluster_meta.indice(nodo)] >= 0:
+                yield meta, hacia_meta[cluster_meta.indice(nodo)]
+
+        desempate = count()
+        costo = {inicio: 0}
+        padre: dict[Coordenada, Coordenada] = {}
+        abiertos = [(inicio.distancia_manhatan(meta), next(desempate), 0, inicio)]
+        while abiertos:
+            _, _, g, actual = heappop(abiertos)
+            if g > costo[actual]:
+                continue
+            if actual == meta:
+                nodos = [meta]
+                while nodos[-1] != inicio:
+                    nodos.append(padre[nodos[-1]])
+                return self._refinar(list(reversed(nodos)))
+
+            for vecino, distancia in vecinos(actual):
+                g_vecino = g + distancia
+                if g_vecino < costo.get(vecino, float("inf")):
+                    costo[vecino] = g_vecino
+                    padre[vecino] = actual
+                    heappush(
+                        abiertos,
+                        (
+                            g_vecino + vecino.distancia_manhatan(meta),
+                            next(desempate),
+                            g_vecino,
+                            vecino,
+                        ),
+                    )
+
+        return None
+
+    def _refinar(self, nodos: list[Coordenada]) -> list[Coordenada]:
+        """Convierte la ruta de nodos abstractos en la secuencia de casillas que la recorre."""
+        ruta = [nodos[0]]
+        for desde, hasta in zip(nodos, nodos[1:]):
+            clave = self._clave_cluster(desde)
+            if clave != self._clave_cluster(hasta):
+                # Arista entre clusters: son casillas vecinas
+                ruta.append(hasta)
+                continue
+
+            cluster = self._cluster(clave)
+            _, padres = self._bfs_en_cluster(cluster, desde, destino=hasta)
+            inicio = cluster.indice(desde)
+            tramo = [cluster.indice(hasta)]
+            while tramo[-1] != inicio:
+                tramo.append(padres[tramo[-1]])
+            ruta.extend(cluster.casilla(i) for i in reversed(tramo[:-1]))
+        return ruta
@@ -0,0 +1,153 @@
+"""Módulo que define el jugador basado en iteración de valor vectorizada para el laberinto."""
+
+from random import choice
+from typing import Optional
+
+import numpy as np
+
+from jugador import Jugador
+from models import CambiosTick, CasillaLaberinto, Coordenada, MovimientosPosibles
+
+
+class JugadorIteracionValor(Jugador):
+    """
+    Jugador que calcula por programación dinámica el valor de cada casilla y sigue el de mayor valor.
+
+    El valor de una casilla es menos la cantidad de pasos hasta la meta no visitada más cercana:
+    V(meta) = 0, V(muralla) = -inf y V(s) = max(V(vecinas)) - 1. Cada barrido de iteración de valor se
+    hace sobre la grilla completa con numpy, desplazando el arreglo de valores en las cuatro direcciones.
+
+    Entre ticks los valores se reutilizan (arranque en caliente): como solo se movieron unas pocas murallas,
+    bastan unos pocos barridos para volver a converger. Si cambian las metas pendientes se recalcula desde cero.
+    """
+
+    valores: Optional[np.ndarray]
+    murallas: np.ndarray
+    metas_visitadas: list[Coordenada]
+    max_barridos: int
+
+    def __init__(self, laberinto, max_barridos: Optional[int] = None):
+        """
+        Inicializa el jugador leyendo las murallas del laberinto y se suscribe a sus cambios.
+
+        Args:
+            laberinto (Laberinto): Laberinto a recorrer.
+            max_barridos (Optional[int]): Máximo de barridos por tick con arranque en caliente. Por defecto
+                filas + columnas. El arranque en frío siempre itera hasta converger.
+        """
+        super().__init__(laberinto)
+        self.max_barridos = (
+            max_barridos if max_barridos is not None else laberinto.filas + laberinto.columnas
+        )
+        self.metas_visitadas = []
+        self.valores = None
+        self._metas_valores: list[Coordenada] = []
+        self.murallas = np.array(
+            [
+                [
+                    laberinto.get_casilla(Coordenada(x, y)) == CasillaLaberinto.MURALLA
+                    for y in range(laberinto.columnas)
+                ]
+                for x in range(laberinto.filas)
+            ],
+            dtype=bool,
+        )
+
+        self.laberinto.suscribir(self._al_cambiar_laberinto)
+
+    def _al_cambiar_laberinto(self, cambios: CambiosTick) -> None:
+        """Mantiene el arreglo de murallas al día con los cambios del tick."""
+        for casilla in cambios.murallas_nuevas:
+            self.murallas[casilla.x, casilla.y] = True
+        for casilla in cambios.casillas_liberadas:
+            self.murallas[casilla.x, casilla.y] = False
+
+    def _eleccion_moverse(
+        self, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """
+        Elige el movimiento hacia la casilla vecina de mayor valor (aleatorio si hay empate).
+
+        Args:
+            movimientos_validos (list[MovimientosPosibles]): Movimientos posibles para el jugador.
+
+        Returns:
+            MovimientosPosibles: Movimiento elegido.
+        """
+        # Las murallas de este tick ya se movieron, pero sus cambios se publican recién al terminar el tick
+        for origen, destino in self.laberinto.murallas_movidas:
+            self.murallas[origen.x, origen.y] = False
+            self.murallas[destino.x, destino.y] = True
+
+        valores = self.iterar_valores()
+
+        posicion = self.laberinto.jugador_pos
+        valores_movimientos = {
+            mov: valores[(posicion + mov).x, (posicion + mov).y] for mov in movimientos_validos
+        }
+        mejor_valor = max(valores_movimientos.values())
+        movimiento = choice(
+            [mov for mov, valor in valores_movimientos.items() if valor == mejor_valor]
+        )
+
+        nueva_posicion = posicion + movimiento
+        if (
+            nueva_posicion in self.laberinto.metas_pos
+            and nueva_posicion not in self.metas_visitadas
+        ):
+            self.metas_visitadas.append(nueva_posicion)
+
+        return movimiento
+
+    def iterar_valores(self) -> np.ndarray:
+        """
+        Ejecuta barridos de iteración de valor hasta converger o llegar a 'max_barridos'.
+
+        Returns:
+            np.ndarray: Valores (filas x columnas) de cada casilla.
+        """
+        if self.laberinto.planificador is not None:
+            # Con recorrido planificado solo cuenta la siguiente meta del recorrido
+            metas = self.laberinto.metas_mas_cercanas_a_posicion(
+                self.laberinto.jugador_pos, self.metas_visitadas
+            )
+        else:
+            metas = [meta for meta in self.laberinto.metas_pos if meta not in self.metas_visitadas]
+        indices_metas = (
+            np.array([meta.x for meta in metas], dtype=int),
+            np.array([meta.y for meta in metas], dtype=int),
+        )
+
+        barridos = self.max_barridos
+        if self.valores is None or self._metas_valores != metas:
+            # Arranque en frío: sin información, todas las casillas parten lo más lejos posible
+            self.valores = np.full(self.murallas.shape, -np.inf)
+            self._metas_valores = metas
+            barridos = self.murallas.size
+
+        filas, columnas = self.murallas.shape
+        piso = -float(
+            filas * columnas
+        )  # Ninguna distancia real es mayor que la cantidad de casillas
+        extendido = np.full((filas + 2, columnas + 2), -np.inf)
+        valores = self.valores
+
+        for _ in range(barridos):
+            extendido[1:-1, 1:-1] = valores
+            nuevos = np.maximum(
+                np.maximum(extendido[:-2, 1:-1], extendido[2:, 1:-1]),
+                np.maximum(extendido[1:-1, :-2], extendido[1:-1, 2:]),
+            )
+            nuevos -= 1
+            # Piso para las casillas sin camino a una meta: sin él, los valores viejos de una zona que quedó
+            # encerrada bajarían de a uno por barrido sin converger nunca
+            np.maximum(nuevos, piso, out=nuevos)
+            nuevos[self.murallas] = -np.inf
+            nuevos[indices_metas] = 0
+
+            if np.array_equal(nuevos, valores):
+                break
+            valores = nuevos
+
+        self.valores = valores
+        return valores
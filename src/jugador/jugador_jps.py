@@ -0,0 +1,303 @@
+"""Módulo que define el jugador basado en Jump Point Search (JPS) para el laberinto."""
+
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from random import choice
+from typing import Optional
+
+from exceptions import MetaNoEncontradaError
+from jugador import Jugador
+from models import CambiosTick, CasillaLaberinto, Coordenada, MovimientosPosibles
+
+HORIZONTALES = ((0, -1), (0, 1))
+VERTICALES = ((-1, 0), (1, 0))
+
+
+class JugadorJPS(Jugador):
+    """
+    Jugador que planifica su ruta a la meta con Jump Point Search sobre la grilla 4-conexa.
+
+    En vez de expandir cada casilla como A*, JPS avanza en línea recta ("salta") y solo se detiene en los
+    puntos donde la ruta óptima podría doblar, así en laberintos abiertos expande muchos menos nodos.
+    Los avances verticales revisan en cada paso si un salto horizontal encuentra algo, y los horizontales
+    se detienen al encontrar un vecino forzado (una abertura vertical que la casilla anterior no tenía).
+
+    La ruta se vuelve a planificar cuando una muralla se mueve sobre ella o cuando se cambia de meta.
+    """
+
+    camino: deque[Coordenada]
+    metas_visitadas: list[Coordenada]
+    meta_objetivo: Optional[Coordenada]
+    replanificar: bool
+
+    def __init__(self, laberinto):
+        """Inicializa el jugador JPS y se suscribe a los cambios del laberinto."""
+        super().__init__(laberinto)
+        self.camino = deque()
+        self._casillas_camino: set[Coordenada] = set()
+        self._transitables: dict[tuple[int, int], bool] = {}
+        self.metas_visitadas = []
+        self.meta_objetivo = None
+        self.replanificar = True
+        # Casillas alcanzables desde el jugador cuando la meta quedó encerrada (vacío si hay ruta)
+        self._region_alcanzable: set[Coordenada] = set()
+
+        self.laberinto.suscribir(self._al_cambiar_laberinto)
+
+    def _al_cambiar_laberinto(self, cambios: CambiosTick) -> None:
+        """
+        Marca la ruta para replanificar si una muralla cayó sobre ella.
+
+        Si la meta estaba encerrada, solo se replanifica cuando se libera una casilla vecina a la región
+        alcanzable, que es la única forma de que aparezca una ruta nueva.
+        """
+        if any(muralla in self._casillas_camino for muralla in cambios.murallas_nuevas):
+            self.replanificar = True
+        elif self._region_alcanzable and any(
+            casilla + mov in self._region_alcanzable
+            for casilla in cambios.casillas_liberadas
+            for mov in MovimientosPosibles
+        ):
+            self.replanificar = True
+
+    def _eleccion_moverse(
+        self, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """
+        Sigue la ruta planificada con JPS, replanificando si hace falta.
+
+        Si no existe ruta hacia la meta, se acerca a ella de forma greedy.
+
+        Args:
+            movimientos_validos (list[MovimientosPosibles]): Movimientos posibles para el jugador.
+
+        Returns:
+            MovimientosPosibles: Movimiento elegido.
+        """
+        posicion = self.laberinto.jugador_pos
+
+        if self.meta_objetivo is None:
+            self.meta_objetivo = self._seleccionar_meta()
+            self.replanificar = True
+
+        movimiento = self._siguiente_movimiento(posicion, movimientos_validos)
+        if movimiento is None:
+            # La ruta quedó bloqueada en el siguiente paso (una muralla se movió este tick)
+            self.replanificar = True
+            movimiento = self._siguiente_movimiento(posicion, movimientos_validos)
+        if movimiento is None:
+            movimiento = self._movimiento_greedy(posicion, movimientos_validos)
+
+        nueva_posicion = posicion + movimiento
+        if (
+            nueva_posicion in self.laberinto.metas_pos
+            and nueva_posicion not in self.metas_visitadas
+        ):
+            self.metas_visitadas.append(nueva_posicion)
+            if nueva_posicion == self.meta_objetivo:
+                self.meta_objetivo = None
+                self.camino.clear()
+                self._casillas_camino.clear()
+
+        return movimiento
+
+    def _siguiente_movimiento(
+        self, posicion: Coordenada, movimientos_validos: list[MovimientosPosibles]
+    ) -> Optional[MovimientosPosibles]:
+        """Devuelve el movimiento hacia la siguiente casilla de la ruta, o None si no se puede seguir."""
+        if self.replanificar:
+            self._planificar(posicion)
+
+        if not self.camino:
+            return None
+
+        siguiente = self.camino[0]
+        for mov in movimientos_validos:
+            if posicion + mov == siguiente:
+                self.camino.popleft()
+                self._casillas_camino.discard(siguiente)
+                return mov
+        return None
+
+    def _movimiento_greedy(
+        self, posicion: Coordenada, movimientos_validos: list[MovimientosPosibles]
+    ) -> MovimientosPosibles:
+        """Elige el movimiento que más acerca a la meta objetivo (aleatorio si hay empate)."""
+        mejor_distancia = min(
+            (posicion + mov).distancia_manhatan(self.meta_objetivo) for mov in movimientos_validos
+        )
+        return choice(
+            [
+                mov
+                for mov in movimientos_validos
+                if (posicion + mov).distancia_manhatan(self.meta_objetivo) == mejor_distancia
+            ]
+        )
+
+    def _seleccionar_meta(self) -> Coordenada:
+        """
+        Selecciona la meta no visitada más cercana al jugador.
+
+        Raises:
+            MetaNoEncontradaError: Si no hay metas disponibles para dirigirse.
+        """
+        metas_mas_cercanas = self.laberinto.metas_mas_cercanas_a_posicion(
+            self.laberinto.jugador_pos, self.metas_visitadas
+        )
+
+        if not metas_mas_cercanas:
+            raise MetaNoEncontradaError("No hay metas a las cuales dirigirse.")
+
+        return choice(metas_mas_cercanas)
+
+    def _planificar(self, inicio: Coordenada) -> None:
+        """Calcula la ruta desde 'inicio' hasta la meta objetivo y la guarda casilla por casilla."""
+        self.replanificar = False
+        self.camino.clear()
+        self._casillas_camino.clear()
+
+        self._region_alcanzable.clear()
+
+        puntos_de_salto = self.buscar_ruta(inicio, self.meta_objetivo)
+        if puntos_de_salto is None:
+            self._region_alcanzable = self._calcular_region_alcanzable(inicio)
+            return
+
+        for desde, hasta in zip(puntos_de_salto, puntos_de_salto[1:]):
+            dx = (hasta.x > desde.x) - (hasta.x < desde.x)
+            dy = (hasta.y > desde.y) - (hasta.y < desde.y)
+            casilla = desde
+            while casilla != hasta:
+                casilla = Coordenada(casilla.x + dx, casilla.y + dy)
+                self.camino.append(casilla)
+        self._casillas_camino.update(self.camino)
+
+    def _calcular_region_alcanzable(self, inicio: Coordenada) -> set[Coordenada]:
+        """Recorre en anchura las casillas transitables a las que se puede llegar desde 'inicio'."""
+        region = {inicio}
+        pendientes = deque([inicio])
+        while pendientes:
+            casilla = pendientes.popleft()
+            for mov in MovimientosPosibles:
+                vecina = casilla + mov
+                if vecina not in region and self._transitable(vecina.x, vecina.y):
+                    region.add(vecina)
+                    pendientes.append(vecina)
+        return region
+
+    def _transitable(self, x: int, y: int) -> bool:
+        """
+        Verifica si la casilla (x, y) está dentro del laberinto y no es muralla.
+
+        Los saltos verticales vuelven a recorrer las mismas filas muchas veces, por eso cada casilla se lee
+        del laberinto una sola vez por búsqueda y luego se responde desde '_transitables'.
+        """
+        clave = (x, y)
+        transitable = self._transitables.get(clave)
+        if transitable is None:
+            transitable = (
+                0 <= x < self.laberinto.filas
+                and 0 <= y < self.laberinto.columnas
+                and self.laberinto.get_casilla(Coordenada(x, y)) != CasillaLaberinto.MURALLA
+            )
+            self._transitables[clave] = transitable
+        return transitable
+
+    def buscar_ruta(self, inicio: Coordenada, meta: Coordenada) -> Optional[list[Coordenada]]:
+        """
+        Busca la ruta más corta entre 'inicio' y 'meta' con Jump Point Search.
+
+        Args:
+            inicio (Coordenada): Casilla de partida.
+            meta (Coordenada): Casilla de llegada.
+
+        Returns:
+            Optional[list[Coordenada]]: Puntos de salto de la ruta (incluye inicio y meta, alineados de a pares),
+            o None si la meta no es alcanzable.
+        """
+        objetivo = (meta.x, meta.y)
+        origen = (inicio.x, inicio.y)
+        if origen == objetivo:
+            return [inicio]
+
+        self._transitables = {}
+        desempate = count()
+        abiertos: list = []
+        costo = {origen: 0}
+        padre: dict[tuple[int, int], tuple[int, int]] = {}
+
+        def agregar(punto, direccion, desde):
+            g = costo[desde] + abs(punto[0] - desde[0]) + abs(punto[1] - desde[1])
+            if g < costo.get(punto, float("inf")):
+                costo[punto] = g
+                padre[punto] = desde
+                h = abs(punto[0] - objetivo[0]) + abs(punto[1] - objetivo[1])
+                heappush(abiertos, (g + h, next(desempate), g, punto, direccion))
+
+        for direccion in HORIZONTALES + VERTICALES:
+            punto = self._saltar(origen, direccion, objetivo)
+            if punto is not None:
+                agregar(punto, direccion, origen)
+
+        while abiertos:
+            _, _, g, actual, direccion = heappop(abiertos)
+            if g > costo[actual]:
+                continue
+            if actual == objetivo:
+                ruta = [actual]
+                while ruta[-1] != origen:
+                    ruta.append(padre[ruta[-1]])
+                return [Coordenada(x, y) for x, y in reversed(ruta)]
+
+            for nueva_direccion in self._direcciones_sucesoras(actual, direccion):
+                punto = self._saltar(actual, nueva_direccion, objetivo)
+                if punto is not None:
+                    agregar(punto, nueva_direccion, actual)
+
+        return None
+
+    def _direcciones_sucesoras(
+        self, punto: tuple[int, int], direccion: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        """Direcciones a explorar desde un punto de salto según la dirección con que se llegó a él."""
+        dx, dy = direccion
+        if dx != 0:
+            # Llegando en vertical: seguir en vertical y abrir ambas horizontales
+            return [direccion, *HORIZONTALES]
+
+        direcciones = [direccion]
+        x, y = punto
+        for vx, _ in VERTICALES:
+            if self._transitable(x + vx, y) and not self._transitable(x + vx, y - dy):
+                direcciones.append((vx, 0))
+        return direcciones
+
+    def _saltar(
+        self, punto: tuple[int, int], direccion: tuple[int, int], objetivo: tuple[int, int]
+    ) -> Optional[tuple[int, int]]:
+        """
+        Avanza desde 'punto' en 'direccion' hasta encontrar un punto de salto.
+
+        Returns:
+            Optional[tuple[int, int]]: El punto de salto encontrado, o None si se choca con una muralla o borde.
+        """
+        x, y = punto
+        dx, dy = direccion
+        while True:
+            x, y = x + dx, y + dy
+            if not self._transitable(x, y):
+                return None
+            if (x, y) == objetivo:
+                return x, y
+
+            if dx == 0:
+                # Avance horizontal: se detiene si hay un vecino vertical forzado
+                for vx, _ in VERTICALES:
+                    if self._transitable(x + vx, y) and not self._transitable(x + vx, y - dy):
+                        return x, y
+            else:
+                # Avance vertical: se detiene si algún salto horizontal desde aquí encuentra un punto
+                for horizontal in HORIZONTALES:
+                    if self._saltar((x, y), horizontal, objetivo) is not None:
+                        return x, y
@@ -1,12 +1,35 @@
 """Módulo que define el jugador basado en Q-learning para el laberinto."""
 
-from collections import deque
+from collections import defaultdict, deque
+from functools import partial
+from heapq import heappop, heappush
+from itertools import count
 from random import choice, random
-from typing import Optional
+from time import perf_counter
+from typing import Hashable, Optional
+
+import numpy as np
 
 from exceptions import MetaNoEncontradaError
 from jugador import Jugador
-from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+from jugador._repeticion_experiencia import BufferExperiencia
+from jugador._tabla_q import (
+    CriterioConvergencia,
+    TrazasElegibilidad,
+    crear_tabla_q,
+    estado_jugador,
+    estado_jugador_al_llegar,
+    preparar_tabla_q,
+)
+from models import (
+    CasillaLaberinto,
+    Coordenada,
+    MotivoParada,
+    MovimientosPosibles,
+    ResultadoEntrenamiento,
+)
+
+ParEstadoAccion = tuple[Hashable, MovimientosPosibles]
 
 
 class JugadorQlearning(Jugador):
@@ -14,34 +37,105 @@ class JugadorQlearning(Jugador):
     Jugador que aprende a moverse en el laberinto usando Q-learning.
 
     Se basa en recompensas por acercarse a metas posibles y alcanzar la meta real, y penalizaciones por repetir caminos o alejarse de las metas.
+
+    Con 'pasos_planificacion' > 0 usa Dyna-Q con barrido priorizado: guarda la última recompensa y posición
+    observadas para cada par (posición, acción) y, tras cada paso real, hace hasta 'pasos_planificacion'
+    actualizaciones simuladas con ese modelo, empezando por los pares con mayor error de Bellman.
+
+    Con 'lambda_trazas' > 0 cada error TD se reparte con trazas de elegibilidad (Q(λ) de Watkins).
+
+    Con 'usar_estado_local' la Q-table se indexa por el entorno de cada casilla ('estado_local') en vez de
+    por su coordenada, así la misma tabla sirve para laberintos de cualquier tamaño. Con 'ruta_tabla_q' la
+    tabla se carga de ese archivo si existe (sin entrenar) y, si no, se entrena y se guarda ahí.
+
+    'tabla_q_inicial' arranca desde la tabla de otro jugador ya entrenado y 'curriculum' entrena primero en
+    laberintos más chicos (ver 'entrenar_curriculum'); en ambos casos una tabla por coordenadas se
+    remuestrea a las dimensiones del laberinto.
+
+    Con 'procesos' > 1 los episodios de entrenamiento se reparten entre varios procesos que actualizan sin
+    candados una misma Q-table en memoria compartida (ver 'entrenar_en_paralelo').
+
+    Con 'tam_replay' > 0 las transiciones se guardan en un buffer circular ('BufferExperiencia') y la
+    Q-table, guardada en un arreglo de numpy, se actualiza por lotes tomados al azar de ese buffer en vez de
+    una transición a la vez; las trazas de elegibilidad no se usan en ese modo.
+
+    Con 'segundo_plano' el entrenamiento corre en otro proceso ('EntrenamientoFondo') y el jugador puede
+    moverse apenas se crea, con una copia de la Q-table que se refresca cada pocos ticks.
     """
 
     alpha: float  # tasa de aprendizaje
     gamma: float  # descuento futuro
     epsilon: float  # Nivel de exploración
     Q: dict[
-        Coordenada, dict[MovimientosPosibles, float]
+        Hashable, dict[MovimientosPosibles, float]
     ]  # Tabla que representa, por cada posicion, que acciones podemos tomar, y por cada una de estas, cual es el valor que nos aporta tomar dicha accion
     metas_visitadas: list[Coordenada]
     posiciones_visitadas: deque[Coordenada]
-
-    def __init__(self, laberinto, alpha=0.1, gamma=0.9, epsilon=0.2):
+    pasos_planificacion: int  # Actualizaciones simuladas por cada paso real (0 desactiva Dyna-Q)
+    umbral_prioridad: float  # Error de Bellman mínimo para encolar un par en el barrido priorizado
+    modelo: dict[ParEstadoAccion, tuple[float, Hashable]]  # (recompensa, nuevo estado) observados
+    predecesores: defaultdict[Hashable, set[ParEstadoAccion]]  # Pares que llevan a cada estado
+    trazas: Optional[TrazasElegibilidad]  # None usa la actualización TD(0) de un solo par
+    criterio_parada: Optional[CriterioConvergencia]  # None entrena siempre todos los episodios
+    resultado_entrenamiento: Optional[ResultadoEntrenamiento]
+    usar_estado_local: bool  # Indexa la Q-table por 'estado_local' en vez de por coordenada
+    replay: Optional[BufferExperiencia]  # None aplica cada actualización apenas ocurre
+
+    def __init__(
+        self,
+        laberinto,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.2,
+        pasos_planificacion: int = 0,
+        umbral_prioridad: float = 1e-3,
+        lambda_trazas: float = 0.0,
+        criterio_parada: Optional[CriterioConvergencia] = None,
+        usar_estado_local: bool = False,
+        ruta_tabla_q: Optional[str] = None,
+        tabla_q_inicial: Optional[
+            tuple[dict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]
+        ] = None,
+        curriculum: Optional[list[tuple[int, int]]] = None,
+        episodios_curriculum: int = 1000,
+        procesos: int = 1,
+        tam_replay: int = 0,
+        tam_lote: int = 64,
+        segundo_plano: bool = False,
+    ):
         """Inicializa el jugador Q-learning con parámetros de aprendizaje y estructuras internas."""
         super().__init__(laberinto)
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
-        self.Q = {}
+        self.pasos_planificacion = pasos_planificacion
+        self.umbral_prioridad = umbral_prioridad
+        self.trazas = TrazasElegibilidad(lambda_trazas) if lambda_trazas > 0 else None
+        self.criterio_parada = criterio_parada
+        self.resultado_entrenamiento = None
+        self.usar_estado_local = usar_estado_local
+        self.replay = (
+            BufferExperiencia(tam_replay, laberinto.columnas, tam_lote) if tam_replay > 0 else None
+        )
+        # Las entradas de cada posición se crean al consultarlas por primera vez
+        self.Q = crear_tabla_q()
         self.metas_visitadas = []
         self.posiciones_visitadas = deque(maxlen=10)
+        self._reiniciar_modelo()
+
+        preparar_tabla_q(
+            self,
+            ruta_tabla_q,
+            tabla_q_inicial,
+            curriculum,
+            episodios_curriculum,
+            procesos,
+            segundo_plano,
+        )
 
-        # Inicializar Q-table para cada posición posible
-        for i in range(self.laberinto.filas):
-            for j in range(self.laberinto.columnas):
-                self.Q[Coordenada(i, j)] = {mov: 0.0 for mov in MovimientosPosibles}
-
-        self._entrenar()
-        self.mostrar_mapas_calor_Q()
+        # Con estado local no hay un valor por casilla que dibujar, y en segundo plano aún no hay tabla
+        if not self.usar_estado_local and not segundo_plano:
+            self.mostrar_mapas_calor_Q()
 
     def _eleccion_moverse(self, movimientos_validos) -> MovimientosPosibles:
         """
@@ -54,13 +148,15 @@ class JugadorQlearning(Jugador):
             MovimientosPosibles: Movimiento elegido por la política Q-learning.
         """
         pos_actual = self.laberinto.jugador_pos
+        estado = estado_jugador(self, pos_actual)
 
         # Explorar o explotar
-        if random() < self.epsilon:
+        explorando = random() < self.epsilon
+        if explorando:
             mov_elegido = choice(movimientos_validos)
         else:
             # Elegir movimiento con mayor Q
-            q_vals = {mov: self.Q[pos_actual][mov] for mov in movimientos_validos}
+            q_vals = {mov: self.Q[estado][mov] for mov in movimientos_validos}
             max_val = max(q_vals.values())
             candidatos = [mov for mov, val in q_vals.items() if val == max_val]
             mov_elegido = choice(candidatos)
@@ -77,8 +173,9 @@ class JugadorQlearning(Jugador):
         )
 
         # Actualizar Q-table
-        q_actual = self.Q[pos_actual][mov_elegido]
-        q_max_sig = max(self.Q[nueva_posicion].values())
+        nuevo_estado = estado_jugador_al_llegar(self, pos_actual, nueva_posicion)
+        q_actual = self.Q[estado][mov_elegido]
+        q_max_sig = max(self.Q[nuevo_estado].values())
 
         # Actualiza el valor Q para la posición y acción actual usando la ecuación de Q-learning:
         # Q(s,a) ← Q(s,a) + α * [recompensa + γ * max(Q(s',a')) - Q(s,a)]
@@ -88,7 +185,37 @@ class JugadorQlearning(Jugador):
         #   - recompensa es el valor obtenido al realizar la acción
         #   - max(Q(s',a')) es el mejor valor Q en el siguiente estado
         #   - Q(s,a) es el valor Q actual para el estado y acción
-        self.Q[pos_actual][mov_elegido] += self.alpha * (reward + self.gamma * q_max_sig - q_actual)
+        # Con trazas, el mismo error se aplica también a los pares recorridos antes
+        delta = reward + self.gamma * q_max_sig - q_actual
+        criterio = self.criterio_parada
+        if criterio is not None:
+            # Las trazas y la planificación solo tocan estados ya recorridos en el episodio
+            criterio.antes_de_actualizar(self.Q, estado)
+        if self.replay is not None:
+            # Con estado por coordenadas, 'estado' es la propia posición
+            self.replay.agregar(
+                estado,
+                mov_elegido,
+                reward,
+                nueva_posicion,
+                nueva_posicion == self.laberinto.meta_real_pos,
+            )
+            self.replay.actualizar(
+                self.Q.valores,
+                self.alpha,
+                self.gamma,
+                None if criterio is None else partial(criterio.antes_de_actualizar, self.Q),
+            )
+        elif self.trazas is None:
+            self.Q[estado][mov_elegido] += self.alpha * delta
+        else:
+            self.trazas.actualizar(
+                self.Q, estado, mov_elegido, delta, self.alpha, self.gamma, explorando
+            )
+
+        if self.pasos_planificacion > 0:
+            self._registrar_transicion(estado, mov_elegido, reward, nuevo_estado)
+            self._planificar()
 
         # Si llege a una meta la marco para no luego no trater de ir hacia ella
         if nueva_posicion in self.laberinto.metas_pos:
@@ -139,6 +266,73 @@ class JugadorQlearning(Jugador):
             reward -= 1
         return reward
 
+    def _reiniciar_modelo(self) -> None:
+        """Descarta el modelo de transiciones y la cola de prioridades del barrido priorizado."""
+        self.modelo = {}
+        self.predecesores = defaultdict(set)
+        self._cola: list[tuple[float, int, Hashable, MovimientosPosibles]] = []
+        self._prioridades: dict[ParEstadoAccion, float] = {}
+        self._contador = count()
+
+    def _registrar_transicion(
+        self, pos: Hashable, mov: MovimientosPosibles, reward: float, nueva_posicion: Hashable
+    ) -> None:
+        """
+        Guarda en el modelo el resultado observado de un paso real y encola lo que quedó desactualizado.
+
+        Además del propio par se encolan los predecesores de 'pos', porque la actualización real acaba de
+        cambiar el valor de esa posición.
+
+        Args:
+            pos (Hashable): Estado desde el que se movió el jugador (ver 'estado_jugador').
+            mov (MovimientosPosibles): Movimiento realizado.
+            reward (float): Recompensa obtenida.
+            nueva_posicion (Hashable): Estado al que llegó.
+        """
+        self.modelo[(pos, mov)] = (reward, nueva_posicion)
+        self.predecesores[nueva_posicion].add((pos, mov))
+
+        self._encolar(pos, mov)
+        for predecesor in self.predecesores[pos]:
+            self._encolar(*predecesor)
+
+    def _encolar(self, pos: Hashable, mov: MovimientosPosibles) -> None:
+        """
+        Encola el par con su error de Bellman según el modelo si supera el umbral y su prioridad actual.
+
+        Args:
+            pos (Hashable): Estado del par.
+            mov (MovimientosPosibles): Acción del par.
+        """
+        reward, nueva_posicion = self.modelo[(pos, mov)]
+        prioridad = abs(
+            reward + self.gamma * max(self.Q[nueva_posicion].values()) - self.Q[pos][mov]
+        )
+        if prioridad <= self.umbral_prioridad or prioridad <= self._prioridades.get((pos, mov), 0):
+            return
+
+        self._prioridades[(pos, mov)] = prioridad
+        heappush(self._cola, (-prioridad, next(self._contador), pos, mov))
+
+    def _planificar(self) -> None:
+        """Hace hasta 'pasos_planificacion' actualizaciones simuladas, de mayor a menor error de Bellman."""
+        for _ in range(self.pasos_planificacion):
+            # Las entradas cuya prioridad fue superada por una posterior quedan obsoletas y se saltan
+            while self._cola:
+                prioridad, _, pos, mov = heappop(self._cola)
+                if self._prioridades.get((pos, mov)) == -prioridad:
+                    break
+            else:
+                return
+            del self._prioridades[(pos, mov)]
+
+            reward, nueva_posicion = self.modelo[(pos, mov)]
+            q_max_sig = max(self.Q[nueva_posicion].values())
+            self.Q[pos][mov] += self.alpha * (reward + self.gamma * q_max_sig - self.Q[pos][mov])
+
+            for predecesor in self.predecesores[pos]:
+                self._encolar(*predecesor)
+
     def _entrenar(self, n_episodios: int = 10000, max_steps: Optional[int] = None):
         """
         Entrena la política Q-learning mediante simulaciones en laberintos generados.
@@ -147,7 +341,6 @@ class JugadorQlearning(Jugador):
             n_episodios (int): Número de episodios de entrenamiento.
             max_steps (Optional[int]): Máximo de pasos por episodio.
         """
-        from laberinto import Laberinto  # Import local para evitar ciclo
 
         # Cambio self.laberinto para que al ejecutar tick en el laberinto de entrenamiento el jugador use al de entrenamiento
         # Luego hago que use de nuevo el self.laberinto que debe de resolver
@@ -160,27 +353,41 @@ class JugadorQlearning(Jugador):
             else max_steps
         )
 
+        criterio = self.criterio_parada
+        if criterio is not None:
+            criterio.iniciar()
+        inicio = perf_counter()
+        motivo = MotivoParada.EPISODIOS_COMPLETOS
+        episodios = n_episodios
+
         # Episodios en que se entrena (Se genera la Q-table)
         for ep in range(n_episodios):
 
-            self.laberinto = Laberinto(
-                dimensiones=(self.laberinto.filas, self.laberinto.columnas),
-                prob_murallas=self.laberinto.prob_murallas,
-                prob_mover_murallas=self.laberinto.prob_mover_murallas,
-                n_metas=self.laberinto.n_metas,
-                clase_jugador=JugadorQlearning,
-                jugar_instanciado=self,
-            )
+            self.laberinto = self.laberinto.crear_similar(self)
             self.epsilon = epsilon
 
             # Se realiza el recorrido del laberinto con un tiempo maximo de entrenamiento (ticks o pasos)
-            for _ in range(pasos_maximos):
-                self.laberinto.tick()
-                if self.laberinto.jugador_gano():
-                    break
+            gano = self.laberinto.ejecutar(pasos_maximos)
 
             self.metas_visitadas = []
             self.posiciones_visitadas.clear()
+            if self.trazas is not None:
+                self.trazas.reiniciar()
+            # El modelo describe el laberinto del episodio, que no se repite
+            self._reiniciar_modelo()
+
+            if criterio is not None:
+                motivo_parada = criterio.registrar_episodio(self.Q, gano)
+                if motivo_parada is not None:
+                    motivo = motivo_parada
+                    episodios = ep + 1
+                    break
+
+        if criterio is not None:
+            criterio.finalizar()
+        self.resultado_entrenamiento = ResultadoEntrenamiento(
+            episodios, motivo, perf_counter() - inicio
+        )
 
         # Reinicio las variables a su estado anterior del entrenamiento
         self.laberinto = laberinto_original
@@ -192,12 +399,14 @@ class JugadorQlearning(Jugador):
         import numpy as np
 
         acciones = list(MovimientosPosibles)
+        # '.get' para no llenar la Q-table perezosa con las casillas que nunca se visitaron
+        sin_visitar = dict.fromkeys(acciones, 0.0)
         fig, axs = plt.subplots(1, len(acciones), figsize=(4 * len(acciones), 4))
         for idx, accion in enumerate(acciones):
             matriz_q = np.zeros((self.laberinto.filas, self.laberinto.columnas))
             for i in range(self.laberinto.filas):
                 for j in range(self.laberinto.columnas):
-                    matriz_q[i, j] = self.Q[Coordenada(i, j)][accion]
+                    matriz_q[i, j] = self.Q.get(Coordenada(i, j), sin_visitar)[accion]
             ax = axs[idx] if len(acciones) > 1 else axs
             im = ax.imshow(matriz_q, cmap="hot", interpolation="nearest")
             ax.set_title(f"Acción: {accion.name}")
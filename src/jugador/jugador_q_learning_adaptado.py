@@ -1,10 +1,18 @@
 from collections import deque
 from random import choice, random, uniform
+from time import perf_counter
 from typing import Optional
 
 from exceptions import MetaNoEncontradaError
 from jugador import Jugador
-from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+from jugador._tabla_q import CriterioConvergencia, TrazasElegibilidad, crear_tabla_q
+from models import (
+    CasillaLaberinto,
+    Coordenada,
+    MotivoParada,
+    MovimientosPosibles,
+    ResultadoEntrenamiento,
+)
 
 
 class JugadorQlearningAdaptado(Jugador):
@@ -27,6 +35,9 @@ class JugadorQlearningAdaptado(Jugador):
     ]  # Tabla que representa, por cada posicion, que acciones podemos tomar, y por cada una de estas, cual es el valor que nos aporta tomar dicha accion
     metas_visitadas: list[Coordenada]
     posiciones_visitadas: deque[Coordenada]
+    trazas: Optional[TrazasElegibilidad]  # None usa la actualización TD(0) de un solo par
+    criterio_parada: Optional[CriterioConvergencia]  # None entrena siempre todos los episodios
+    resultado_entrenamiento: Optional[ResultadoEntrenamiento]
 
     def __init__(
         self,
@@ -36,6 +47,8 @@ class JugadorQlearningAdaptado(Jugador):
         epsilon: float = 0.2,
         betha: float = 0.5,
         omega: float = 0.5,
+        lambda_trazas: float = 0.0,
+        criterio_parada: Optional[CriterioConvergencia] = None,
     ):
         """
         Inicializa una instancia de JugadorQlearningAdaptado.
@@ -47,6 +60,8 @@ class JugadorQlearningAdaptado(Jugador):
             epsilon: Nivel de exploración.
             betha: Peso de la Q-table.
             omega: Peso de la heurística (distancia a la meta).
+            lambda_trazas: Factor λ de las trazas de elegibilidad; 0 desactiva Q(λ).
+            criterio_parada: Criterio para detener el entrenamiento antes si la política converge.
         """
         super().__init__(laberinto)
         self.alpha = alpha
@@ -54,6 +69,9 @@ class JugadorQlearningAdaptado(Jugador):
         self.betha = betha
         self.omega = omega
         self.epsilon = epsilon
+        self.trazas = TrazasElegibilidad(lambda_trazas) if lambda_trazas > 0 else None
+        self.criterio_parada = criterio_parada
+        self.resultado_entrenamiento = None
         self.Q = {}
         self.metas_visitadas = []
         self.posiciones_visitadas = deque(maxlen=10)
@@ -106,7 +124,8 @@ class JugadorQlearningAdaptado(Jugador):
         mejor_balance = float("-inf")
 
         # Decisión: explorar o explotar
-        if random() < self.epsilon:
+        explorando = random() < self.epsilon
+        if explorando:
             mejor_mov = choice(movimientos_validos)
         else:
             q_vals = {mov: self.Q[pos_actual][mov] for mov in movimientos_validos}
@@ -134,7 +153,16 @@ class JugadorQlearningAdaptado(Jugador):
         # Actualizar Q-table usando la ecuacion de Q-learning
         q_actual = self.Q[pos_actual][mejor_mov]
         q_max_sig = max(self.Q[nueva_posicion].values())
-        self.Q[pos_actual][mejor_mov] += self.alpha * (reward + self.gamma * q_max_sig - q_actual)
+        delta = reward + self.gamma * q_max_sig - q_actual
+        if self.criterio_parada is not None:
+            # Las trazas solo tocan estados ya recorridos en el episodio
+            self.criterio_parada.antes_de_actualizar(self.Q, pos_actual)
+        if self.trazas is None:
+            self.Q[pos_actual][mejor_mov] += self.alpha * delta
+        else:
+            self.trazas.actualizar(
+                self.Q, pos_actual, mejor_mov, delta, self.alpha, self.gamma, explorando
+            )
 
         if nueva_posicion in self.laberinto.metas_pos:
             self.metas_visitadas.append(nueva_posicion)
@@ -190,7 +218,6 @@ class JugadorQlearningAdaptado(Jugador):
             n_episodios: Número de episodios de entrenamiento.
             max_steps: Máximo de pasos por episodio.
         """
-        from laberinto import Laberinto  # Import local para evitar ciclo
 
         # Cambio self.laberinto para que al ejecutar tick en el laberinto de entrenamiento el jugador use al de entrenamiento
         # Luego hago que use de nuevo el self.laberinto que debe de resolver
@@ -203,26 +230,38 @@ class JugadorQlearningAdaptado(Jugador):
             else max_steps
         )
 
+        criterio = self.criterio_parada
+        if criterio is not None:
+            criterio.iniciar()
+        inicio = perf_counter()
+        motivo = MotivoParada.EPISODIOS_COMPLETOS
+        episodios = n_episodios
+
         # Episodios en que se entrena (Se genera la Q-table)
         for ep in range(n_episodios):
-            self.laberinto = Laberinto(
-                dimensiones=(self.laberinto.filas, self.laberinto.columnas),
-                prob_murallas=self.laberinto.prob_murallas,
-                prob_mover_murallas=self.laberinto.prob_mover_murallas,
-                n_metas=self.laberinto.n_metas,
-                clase_jugador=JugadorQlearningAdaptado,
-                jugar_instanciado=self,
-            )
+            self.laberinto = self.laberinto.crear_similar(self)
             self.epsilon = epsilon
 
             # Se realiza el recorrido del laberinto con un tiempo maximo de entrenamiento (ticks o pasos)
-            for _ in range(pasos_maximos):
-                self.laberinto.tick()
-                if self.laberinto.jugador_gano():
-                    break
+            gano = self.laberinto.ejecutar(pasos_maximos)
 
             self.metas_visitadas = []
             self.posiciones_visitadas.clear()
+            if self.trazas is not None:
+                self.trazas.reiniciar()
+
+            if criterio is not None:
+                motivo_parada = criterio.registrar_episodio(self.Q, gano)
+                if motivo_parada is not None:
+                    motivo = motivo_parada
+                    episodios = ep + 1
+                    break
+
+        if criterio is not None:
+            criterio.finalizar()
+        self.resultado_entrenamiento = ResultadoEntrenamiento(
+            episodios, motivo, perf_counter() - inicio
+        )
 
         # Reinicio las variables a su estado anterior del entrenamiento
         self.laberinto = laberinto_original
@@ -238,12 +277,14 @@ class JugadorQlearningAdaptado(Jugador):
         import numpy as np
 
         acciones = list(MovimientosPosibles)
+        # '.get' para no llenar la Q-table perezosa con las casillas que nunca se visitaron
+        sin_visitar = dict.fromkeys(acciones, 0.0)
         fig, axs = plt.subplots(1, len(acciones), figsize=(4 * len(acciones), 4))
         for idx, accion in enumerate(acciones):
             matriz_q = np.zeros((self.laberinto.filas, self.laberinto.columnas))
             for i in range(self.laberinto.filas):
                 for j in range(self.laberinto.columnas):
-                    matriz_q[i, j] = self.Q[Coordenada(i, j)][accion]
+                    matriz_q[i, j] = self.Q.get(Coordenada(i, j), sin_visitar)[accion]
             ax = axs[idx] if len(acciones) > 1 else axs
             im = ax.imshow(matriz_q, cmap="hot", interpolation="nearest")
             ax.set_title(f"Acción: {accion.name}")
@@ -278,10 +319,8 @@ class JugadorQlearningAdaptado(Jugador):
         return w_cercania * cercania + w_eficiencia * eficiencia
 
     def _inicializar_Q_table(self):
-        """Inicializa la Q-table para todas las posiciones posibles del laberinto."""
-        for i in range(self.laberinto.filas):
-            for j in range(self.laberinto.columnas):
-                self.Q[Coordenada(i, j)] = {mov: 0.0 for mov in MovimientosPosibles}
+        """Inicializa la Q-table vacía; las entradas de cada posición se crean al consultarlas."""
+        self.Q = crear_tabla_q()
 
     def __lt__(self, other: "JugadorQlearningAdaptado") -> bool:
         """Permite comparar dos jugadores por desempeño."""
@@ -5,12 +5,31 @@ Este módulo define una clase que fusiona el aprendizaje por refuerzo (Q-learnin
 """
 
 from collections import deque
+from functools import partial
 from random import choice, random
-from typing import Optional
+from time import perf_counter
+from typing import Hashable, Optional
+
+import numpy as np
 
 from exceptions import MetaNoEncontradaError
 from jugador import Jugador
-from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+from jugador._repeticion_experiencia import BufferExperiencia
+from jugador._tabla_q import (
+    CriterioConvergencia,
+    TrazasElegibilidad,
+    crear_tabla_q,
+    estado_jugador,
+    estado_jugador_al_llegar,
+    preparar_tabla_q,
+)
+from models import (
+    CasillaLaberinto,
+    Coordenada,
+    MotivoParada,
+    MovimientosPosibles,
+    ResultadoEntrenamiento,
+)
 
 
 class JugadorQlearningEstrella(Jugador):
@@ -20,6 +39,23 @@ class JugadorQlearningEstrella(Jugador):
     Esta clase fusiona la exploración y aprendizaje de Q-learning con la heurística de búsqueda
     informada de A* (A estrella), utilizando recompensas tanto por acercarse a metas como por
     alcanzar la meta real, y ponderando la distancia heurística en la toma de decisiones.
+
+    Con 'usar_estado_local' la Q-table se indexa por el entorno de cada casilla ('estado_local') y puede
+    reutilizarse entre laberintos de distinto tamaño mediante 'ruta_tabla_q'.
+
+    'tabla_q_inicial' arranca desde la tabla de otro jugador ya entrenado y 'curriculum' entrena primero en
+    laberintos más chicos (ver 'entrenar_curriculum'); en ambos casos una tabla por coordenadas se
+    remuestrea a las dimensiones del laberinto.
+
+    Con 'procesos' > 1 los episodios de entrenamiento se reparten entre varios procesos que actualizan sin
+    candados una misma Q-table en memoria compartida (ver 'entrenar_en_paralelo').
+
+    Con 'tam_replay' > 0 las transiciones se guardan en un buffer circular ('BufferExperiencia') y la
+    Q-table, guardada en un arreglo de numpy, se actualiza por lotes tomados al azar de ese buffer en vez de
+    una transición a la vez; las trazas de elegibilidad no se usan en ese modo.
+
+    Con 'segundo_plano' el entrenamiento corre en otro proceso ('EntrenamientoFondo') y el jugador puede
+    moverse apenas se crea, con una copia de la Q-table que se refresca cada pocos ticks.
     """
 
     alpha: float  # Tasa de aprendizaje
@@ -29,10 +65,15 @@ class JugadorQlearningEstrella(Jugador):
     epsilon: float  # Nivel de exploración
     posicion_inicial: Optional[Coordenada] = None
     Q: dict[
-        Coordenada, dict[MovimientosPosibles, float]
+        Hashable, dict[MovimientosPosibles, float]
     ]  # Tabla que representa, por cada posicion, que acciones podemos tomar, y por cada una de estas, cual es el valor que nos aporta tomar dicha accion
     metas_visitadas: list[Coordenada]
     posiciones_visitadas: deque[Coordenada]
+    trazas: Optional[TrazasElegibilidad]  # None usa la actualización TD(0) de un solo par
+    criterio_parada: Optional[CriterioConvergencia]  # None entrena siempre todos los episodios
+    resultado_entrenamiento: Optional[ResultadoEntrenamiento]
+    usar_estado_local: bool  # Indexa la Q-table por 'estado_local' en vez de por coordenada
+    replay: Optional[BufferExperiencia]  # None aplica cada actualización apenas ocurre
 
     def __init__(
         self,
@@ -42,6 +83,19 @@ class JugadorQlearningEstrella(Jugador):
         epsilon: float = 0.2,
         betha: float = 0.5,
         omega: float = 0.5,
+        lambda_trazas: float = 0.0,
+        criterio_parada: Optional[CriterioConvergencia] = None,
+        usar_estado_local: bool = False,
+        ruta_tabla_q: Optional[str] = None,
+        tabla_q_inicial: Optional[
+            tuple[dict[Hashable, dict[MovimientosPosibles, float]], tuple[int, int]]
+        ] = None,
+        curriculum: Optional[list[tuple[int, int]]] = None,
+        episodios_curriculum: int = 1000,
+        procesos: int = 1,
+        tam_replay: int = 0,
+        tam_lote: int = 64,
+        segundo_plano: bool = False,
     ):
         """
         Inicializa una instancia de JugadorQlearningEstrella.
@@ -53,6 +107,19 @@ class JugadorQlearningEstrella(Jugador):
             epsilon: Nivel de exploración.
             betha: Peso de la Q-table.
             omega: Peso de la heurística (distancia a la meta).
+            lambda_trazas: Factor λ de las trazas de elegibilidad; 0 desactiva Q(λ).
+            criterio_parada: Criterio para detener el entrenamiento antes si la política converge.
+            usar_estado_local: Si es True, la Q-table usa estados locales en vez de coordenadas.
+            ruta_tabla_q: Archivo de donde se carga la Q-table sin entrenar o, si no existe, donde se guarda.
+            tabla_q_inicial: Q-table de un jugador ya entrenado desde la cual partir (arranque en caliente)
+                y dimensiones del laberinto en que se entrenó, como las devuelve 'cargar_tabla_q'.
+            curriculum: Dimensiones de laberintos más chicos en que entrenar antes que en este.
+            episodios_curriculum: Máximo de episodios por etapa previa del curriculum; la etapa final usa el
+                presupuesto normal.
+            procesos: Procesos que entrenan a la vez sobre una Q-table en memoria compartida.
+            tam_replay: Capacidad del buffer de repetición de experiencia; 0 lo desactiva.
+            tam_lote: Transiciones por lote de la repetición de experiencia.
+            segundo_plano: Si es True entrena en otro proceso mientras el jugador ya se mueve.
         """
         super().__init__(laberinto)
         self.alpha = alpha
@@ -60,16 +127,27 @@ class JugadorQlearningEstrella(Jugador):
         self.betha = betha
         self.omega = omega
         self.epsilon = epsilon
-        self.Q = {}
+        self.trazas = TrazasElegibilidad(lambda_trazas) if lambda_trazas > 0 else None
+        self.criterio_parada = criterio_parada
+        self.resultado_entrenamiento = None
+        self.usar_estado_local = usar_estado_local
+        self.replay = (
+            BufferExperiencia(tam_replay, laberinto.columnas, tam_lote) if tam_replay > 0 else None
+        )
+        # Las entradas de cada posición se crean al consultarlas por primera vez
+        self.Q = crear_tabla_q()
         self.metas_visitadas = []
         self.posiciones_visitadas = deque(maxlen=10)
 
-        # Inicializar Q-table para cada posición posible
-        for i in range(self.laberinto.filas):
-            for j in range(self.laberinto.columnas):
-                self.Q[Coordenada(i, j)] = {mov: 0.0 for mov in MovimientosPosibles}
-
-        self._entrenar()
+        preparar_tabla_q(
+            self,
+            ruta_tabla_q,
+            tabla_q_inicial,
+            curriculum,
+            episodios_curriculum,
+            procesos,
+            segundo_plano,
+        )
         # self.mostrar_mapas_calor_Q()
 
     def _eleccion_moverse(
@@ -92,14 +170,16 @@ class JugadorQlearningEstrella(Jugador):
             self.posicion_inicial = self.laberinto.jugador_pos
 
         pos_actual = self.laberinto.jugador_pos
+        estado = estado_jugador(self, pos_actual)
         mejor_mov = None
         mejor_balance = float("-inf")
 
         # Decisión: explorar o explotar
-        if random() < self.epsilon:
+        explorando = random() < self.epsilon
+        if explorando:
             mejor_mov = choice(movimientos_validos)
         else:
-            q_vals = {mov: self.Q[pos_actual][mov] for mov in movimientos_validos}
+            q_vals = {mov: self.Q[estado][mov] for mov in movimientos_validos}
             meta_objetivo = self._seleccionar_meta()
             for mov, valor_q in q_vals.items():
                 # balance = betha*valor_que_aporta_la_accion_q_table - omega*distancia_euclidiana_a_la_meta
@@ -126,10 +206,35 @@ class JugadorQlearningEstrella(Jugador):
         )
 
         # Actualizar Q-table usando la ecuación de Q-learning
-        q_actual = self.Q[pos_actual][mejor_mov]
-        q_max_sig = max(self.Q[nueva_posicion].values())
-
-        self.Q[pos_actual][mejor_mov] += self.alpha * (reward + self.gamma * q_max_sig - q_actual)
+        q_actual = self.Q[estado][mejor_mov]
+        q_max_sig = max(self.Q[estado_jugador_al_llegar(self, pos_actual, nueva_posicion)].values())
+
+        delta = reward + self.gamma * q_max_sig - q_actual
+        criterio = self.criterio_parada
+        if criterio is not None:
+            # Las trazas solo tocan estados ya recorridos en el episodio
+            criterio.antes_de_actualizar(self.Q, estado)
+        if self.replay is not None:
+            # Con estado por coordenadas, 'estado' es la propia posición
+            self.replay.agregar(
+                estado,
+                mejor_mov,
+                reward,
+                nueva_posicion,
+                nueva_posicion == self.laberinto.meta_real_pos,
+            )
+            self.replay.actualizar(
+                self.Q.valores,
+                self.alpha,
+                self.gamma,
+                None if criterio is None else partial(criterio.antes_de_actualizar, self.Q),
+            )
+        elif self.trazas is None:
+            self.Q[estado][mejor_mov] += self.alpha * delta
+        else:
+            self.trazas.actualizar(
+                self.Q, estado, mejor_mov, delta, self.alpha, self.gamma, explorando
+            )
 
         # Si llega a una meta, la marca como visitada
         if nueva_posicion in self.laberinto.metas_pos:
@@ -210,7 +315,6 @@ class JugadorQlearningEstrella(Jugador):
             n_episodios: Número de episodios de entrenamiento.
             max_steps: Máximo de pasos por episodio.
         """
-        from laberinto import Laberinto  # Import local para evitar ciclo
 
         # Cambio self.laberinto para que al ejecutar tick en el laberinto de entrenamiento el jugador use al de entrenamiento
         # Luego hago que use de nuevo el self.laberinto que debe de resolver
@@ -223,27 +327,39 @@ class JugadorQlearningEstrella(Jugador):
             else max_steps
         )
 
+        criterio = self.criterio_parada
+        if criterio is not None:
+            criterio.iniciar()
+        inicio = perf_counter()
+        motivo = MotivoParada.EPISODIOS_COMPLETOS
+        episodios = n_episodios
+
         # Episodios en que se entrena (Se genera la Q-table)
         for ep in range(n_episodios):
 
-            self.laberinto = Laberinto(
-                dimensiones=(self.laberinto.filas, self.laberinto.columnas),
-                prob_murallas=self.laberinto.prob_murallas,
-                prob_mover_murallas=self.laberinto.prob_mover_murallas,
-                n_metas=self.laberinto.n_metas,
-                clase_jugador=JugadorQlearningEstrella,
-                jugar_instanciado=self,
-            )
+            self.laberinto = self.laberinto.crear_similar(self)
             self.epsilon = epsilon
 
             # Recorrido del laberinto con límite de pasos
-            for _ in range(pasos_maximos):
-                self.laberinto.tick()
-                if self.laberinto.jugador_gano():
-                    break
+            gano = self.laberinto.ejecutar(pasos_maximos)
 
             self.metas_visitadas = []
             self.posiciones_visitadas.clear()
+            if self.trazas is not None:
+                self.trazas.reiniciar()
+
+            if criterio is not None:
+                motivo_parada = criterio.registrar_episodio(self.Q, gano)
+                if motivo_parada is not None:
+                    motivo = motivo_parada
+                    episodios = ep + 1
+                    break
+
+        if criterio is not None:
+            criterio.finalizar()
+        self.resultado_entrenamiento = ResultadoEntrenamiento(
+            episodios, motivo, perf_counter() - inicio
+        )
 
         # Restaurar estado original
         self.laberinto = laberinto_original
@@ -259,12 +375,14 @@ class JugadorQlearningEstrella(Jugador):
         import numpy as np
 
         acciones = list(MovimientosPosibles)
+        # '.get' para no llenar la Q-table perezosa con las casillas que nunca se visitaron
+        sin_visitar = dict.fromkeys(acciones, 0.0)
         fig, axs = plt.subplots(1, len(acciones), figsize=(4 * len(acciones), 4))
         for idx, accion in enumerate(acciones):
             matriz_q = np.zeros((self.laberinto.filas, self.laberinto.columnas))
             for i in range(self.laberinto.filas):
                 for j in range(self.laberinto.columnas):
-                    matriz_q[i, j] = self.Q[Coordenada(i, j)][accion]
+                    matriz_q[i, j] = self.Q.get(Coordenada(i, j), sin_visitar)[accion]
             ax = axs[idx] if len(acciones) > 1 else axs
             im = ax.imshow(matriz_q, cmap="hot", interpolation="nearest")
             ax.set_title(f"Acción: {accion.name}")
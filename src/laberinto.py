@@ -1,7 +1,7 @@
 """Módulo que define la clase Laberinto y su lógica de funcionamiento."""
 
-from random import randint, random, sample
-from typing import Optional, Type
+from random import Random
+from typing import Callable, Optional, Type
 
 from exceptions import (
     CoordenadaFueraDeLimiteDelLaberintoError,
@@ -9,7 +9,18 @@ from exceptions import (
     MovimientoInvalidoError,
 )
 from jugador import Jugador, JugadorRandom
-from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+from models import CambiosTick, CasillaLaberinto, Coordenada, MovimientosPosibles
+from planificador_recorrido import PlanificadorRecorrido
+
+# Direcciones en que puede moverse una muralla
+MOVIMIENTOS_MURALLA = [m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE]
+
+# Casillas a las que el jugador puede moverse
+CASILLAS_TRANSITABLES = (
+    CasillaLaberinto.CAMINO,
+    CasillaLaberinto.META_FALSA,
+    CasillaLaberinto.META_REAL,
+)
 
 
 class Laberinto:
@@ -30,6 +41,10 @@ class Laberinto:
     metas_pos: list[Coordenada]
     meta_real_pos: Coordenada
     murallas_pos: list[Coordenada]
+    murallas_movidas: list[tuple[Coordenada, Coordenada]]
+    ultimo_movimiento_jugador: MovimientosPosibles
+    planificador: Optional[PlanificadorRecorrido]
+    aleatorio: Random
 
     tipo_anterior_casilla_actual: CasillaLaberinto | None
 
@@ -41,6 +56,8 @@ class Laberinto:
         n_metas: int = 3,
         clase_jugador: Type[Jugador] = JugadorRandom,
         jugar_instanciado: Optional[Jugador] = None,
+        planificar_recorrido: bool = False,
+        aleatorio: Optional[Random] = None,
     ):
         """
         Inicializa el laberinto con sus dimensiones y probabilidades.
@@ -51,12 +68,26 @@ class Laberinto:
             prob_mover_murallas (float): Probabilidad de mover cada muralla.
             n_metas (int): Número de metas en el laberinto.
             clase_jugador (Type[Jugador]): Clase del jugador a instanciar.
+            planificar_recorrido (bool): Si es True, 'metas_mas_cercanas_a_posicion' sigue el orden de visita
+                planificado con distancias reales en vez de la distancia Manhattan.
+            aleatorio (Optional[Random]): Generador con que se crea la grilla y se mueven las murallas. Dos
+                laberintos con generadores de la misma semilla parten iguales y cada muralla recibe los mismos
+                sorteos en cada tick, sin importar lo que haga el jugador; solo difieren los movimientos que el
+                jugador bloquea. Si es None se usa uno con semilla al azar.
         """
         self.filas, self.columnas = dimensiones
+        self.aleatorio = aleatorio if aleatorio is not None else Random()
         self.prob_murallas = prob_murallas
         self.prob_mover_murallas = prob_mover_murallas
 
         self.murallas_pos = []
+        self.murallas_movidas = []
+        self.ultimo_movimiento_jugador = MovimientosPosibles.NO_MOVERSE
+        # Datos crudos del último tick: tick, movimiento, posición anterior, posición y murallas movidas
+        self._ultimo_tick: Optional[tuple] = None
+        self._ultimos_cambios: Optional[CambiosTick] = None
+        self.planificador = None
+        self._suscriptores: list[Callable[[CambiosTick], None]] = []
 
         self.n_metas = n_metas
         self.metas_pos = []
@@ -69,6 +100,9 @@ class Laberinto:
             print(f"Error al crear el laberinto: {e}")
             raise
 
+        if planificar_recorrido:
+            self.planificador = PlanificadorRecorrido(self)
+
         if jugar_instanciado is not None:
             self.jugador = jugar_instanciado
         else:
@@ -76,6 +110,36 @@ class Laberinto:
 
         self.ticks_transcurridos = 0
 
+    def crear_similar(
+        self,
+        jugador: Jugador,
+        dimensiones: Optional[tuple[int, int]] = None,
+        aleatorio: Optional[Random] = None,
+    ) -> "Laberinto":
+        """
+        Crea un laberinto nuevo del mismo motor y con las mismas probabilidades y metas, jugado por 'jugador'.
+
+        Los jugadores que entrenan o se evalúan en muchos laberintos lo usan para no quedar atados al motor de
+        lista.
+
+        Args:
+            jugador (Jugador): Jugador ya instanciado que recorre el laberinto nuevo.
+            dimensiones (Optional[tuple[int, int]]): Dimensiones del laberinto nuevo. Si es None se usan las de
+                este laberinto.
+            aleatorio (Optional[Random]): Generador del laberinto nuevo. Si es None se usa uno al azar.
+
+        Returns:
+            Laberinto: Laberinto nuevo, sin recorrido planificado.
+        """
+        return type(self)(
+            dimensiones=dimensiones if dimensiones is not None else (self.filas, self.columnas),
+            prob_murallas=self.prob_murallas,
+            prob_mover_murallas=self.prob_mover_murallas,
+            n_metas=self.n_metas,
+            jugar_instanciado=jugador,
+            aleatorio=aleatorio,
+        )
+
     def _crear_laberinto(self):
         self.laberinto = []
         caminos_libres = []
@@ -85,7 +149,7 @@ class Laberinto:
             fila = []
             for j in range(self.columnas):
                 coordenada = Coordenada(i, j)
-                if random() <= self.prob_murallas:
+                if self.aleatorio.random() <= self.prob_murallas:
                     fila.append(CasillaLaberinto.MURALLA)
                     self.murallas_pos.append(coordenada)
                 else:
@@ -99,7 +163,7 @@ class Laberinto:
                 "No hay caminos libres para ubicar al jugador. El laberinto generado es inválido."
             )
 
-        self.jugador_pos = caminos_libres.pop(randint(0, len(caminos_libres) - 1))
+        self.jugador_pos = caminos_libres.pop(self.aleatorio.randint(0, len(caminos_libres) - 1))
         self.set_casilla(self.jugador_pos, CasillaLaberinto.JUGADOR)
 
         # Seleccionar posiciones de metas
@@ -109,8 +173,8 @@ class Laberinto:
             )
 
         # Elige de forma aleatoria las n metas (Real y falsas)
-        metas = sample(caminos_libres, self.n_metas)
-        real_id = randint(0, self.n_metas - 1)
+        metas = self.aleatorio.sample(caminos_libres, self.n_metas)
+        real_id = self.aleatorio.randint(0, self.n_metas - 1)
 
         for id, meta in enumerate(metas):
             if id == real_id:
@@ -127,37 +191,179 @@ class Laberinto:
         return False
 
     def tick(self):
-        """Mueve las murallas de forma aleatoria y ejecuta el tick del jugador."""
-        self.mover_jugador()
+        """
+        Mueve las murallas de forma aleatoria y ejecuta el tick del jugador.
 
+        Al terminar publica los cambios del tick en 'ultimos_cambios' y a los suscriptores.
+        """
+        posicion_anterior = self.jugador_pos
         self.mover_murallas()
 
+        self.mover_jugador()
+
+        self._publicar_cambios(posicion_anterior)
+
+    def suscribir(self, callback: Callable[[CambiosTick], None]) -> None:
+        """
+        Registra una función que se llamará con los cambios de cada tick al terminar el tick.
+
+        Mientras el jugador decide su movimiento, los cambios de murallas del tick en curso ya están en
+        'murallas_movidas'; la notificación llega cuando el tick termina.
+
+        Args:
+            callback (Callable[[CambiosTick], None]): Función a llamar con los cambios de cada tick.
+        """
+        self._suscriptores.append(callback)
+
+    def desuscribir(self, callback: Callable[[CambiosTick], None]) -> None:
+        """Deja de notificar a una función registrada con 'suscribir'."""
+        self._suscriptores.remove(callback)
+
+    def cambios_murallas(self) -> tuple[list[Coordenada], list[Coordenada]]:
+        """
+        Resume el último 'mover_murallas' en las casillas que cambiaron de tipo.
+
+        Si una muralla ocupa la casilla que otra dejó en el mismo tick, esa casilla no cambia y no se incluye.
+
+        Returns:
+            tuple[list[Coordenada], list[Coordenada]]: Casillas que pasaron a ser muralla y casillas que dejaron de serlo.
+        """
+        origenes = {origen for origen, _ in self.murallas_movidas}
+        destinos = {destino for _, destino in self.murallas_movidas}
+        return list(destinos - origenes), list(origenes - destinos)
+
+    @property
+    def ultimos_cambios(self) -> Optional[CambiosTick]:
+        """
+        Resumen de cambios del último tick, o None si todavía no se ejecuta ninguno.
+
+        Se arma la primera vez que se pide (o al notificar a los suscriptores), así los ticks sin
+        suscriptores ni lectores no pagan los conjuntos y listas del resumen.
+        """
+        if self._ultimos_cambios is None and self._ultimo_tick is not None:
+            tick, movimiento, posicion_anterior, posicion_jugador, murallas_movidas = (
+                self._ultimo_tick
+            )
+            origenes = {origen for origen, _ in murallas_movidas}
+            destinos = {destino for _, destino in murallas_movidas}
+            visito_meta = (
+                posicion_jugador != posicion_anterior and posicion_jugador in self.metas_pos
+            )
+            self._ultimos_cambios = CambiosTick(
+                tick=tick,
+                movimiento_jugador=movimiento,
+                posicion_anterior=posicion_anterior,
+                posicion_jugador=posicion_jugador,
+                murallas_nuevas=list(destinos - origenes),
+                casillas_liberadas=list(origenes - destinos),
+                metas_visitadas=[posicion_jugador] if visito_meta else [],
+            )
+        return self._ultimos_cambios
+
+    def _publicar_cambios(self, posicion_anterior: Coordenada) -> None:
+        """
+        Guarda los datos del tick recién terminado y, si hay suscriptores, les entrega el resumen de cambios.
+
+        Args:
+            posicion_anterior (Coordenada): Posición del jugador al comenzar el tick.
+        """
+        # 'mover_murallas' crea una lista nueva cada tick, así que basta guardar la referencia
+        self._ultimo_tick = (
+            self.ticks_transcurridos,
+            self.ultimo_movimiento_jugador,
+            posicion_anterior,
+            self.jugador_pos,
+            self.murallas_movidas,
+        )
+        self._ultimos_cambios = None
+
+        if self._suscriptores:
+            cambios = self.ultimos_cambios
+            for callback in self._suscriptores:
+                callback(cambios)
+
+    def ejecutar(self, max_ticks: int) -> bool:
+        """
+        Ejecuta hasta 'max_ticks' ticks seguidos y se detiene apenas el jugador llega a la meta real.
+
+        Equivale a llamar a 'tick' y 'jugador_gano' en un ciclo, pero con los métodos enlazados una sola vez
+        y sin pasar por 'Jugador.tick' ni por las validaciones de 'mover_jugador': el jugador solo recibe
+        movimientos válidos, que por construcción no lo sacan del laberinto. Los cambios de cada tick se
+        publican igual que en 'tick'.
+
+        Args:
+            max_ticks (int): Máximo de ticks a ejecutar.
+
+        Returns:
+            bool: True si el jugador llegó a la meta real.
+        """
+        mover_murallas = self.mover_murallas
+        publicar_cambios = self._publicar_cambios
+        movimientos_validos = self.movimientos_validos
+        elegir_movimiento = self.jugador.elegir_movimiento
+        get_casilla = self.get_casilla
+        set_casilla = self.set_casilla
+        no_moverse = MovimientosPosibles.NO_MOVERSE
+        casilla_jugador = CasillaLaberinto.JUGADOR
+        casilla_camino = CasillaLaberinto.CAMINO
+        meta_real = self.meta_real_pos
+
+        for _ in range(max_ticks):
+            mover_murallas()
+            self.ticks_transcurridos += 1
+
+            validos = movimientos_validos()
+            movimiento = elegir_movimiento(validos) if validos else no_moverse
+            self.ultimo_movimiento_jugador = movimiento
+
+            posicion = self.jugador_pos
+            if movimiento is not no_moverse:
+                dx, dy = movimiento.value
+                nueva_posicion = Coordenada(posicion.x + dx, posicion.y + dy)
+
+                set_casilla(posicion, self.tipo_anterior_casilla_actual or casilla_camino)
+                self.tipo_anterior_casilla_actual = get_casilla(nueva_posicion)
+                self.jugador_pos = nueva_posicion
+                set_casilla(nueva_posicion, casilla_jugador)
+
+            publicar_cambios(posicion)
+
+            if self.jugador_pos == meta_real:
+                return True
+
+        return self.jugador_pos == meta_real
+
     def mover_murallas(self):
-        """Mueve las murallas de forma aleatoria en el laberinto."""
-        nuevas_murallas: set[Coordenada] = set()
-
-        for muralla in self.murallas_pos:
-            nueva_pos = muralla
-            if random() <= self.prob_mover_murallas:
-                movimientos_muralla = [
-                    m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE
-                ]
-                mov = movimientos_muralla[randint(0, len(movimientos_muralla) - 1)]
-                nueva_posicion = muralla + mov
-                # Verifica que la nueva posición esté dentro del laberinto y no colisione
-
-                if (
-                    self.coordenada_en_laberinto(nueva_posicion)
-                    and self.get_casilla(nueva_posicion) == CasillaLaberinto.CAMINO
-                    and nueva_posicion not in nuevas_murallas
-                ):
-                    # Actualiza la casilla anterior a CAMINO
-                    self.set_casilla(muralla, CasillaLaberinto.CAMINO)
-                    # Mueve la muralla
-                    self.set_casilla(nueva_posicion, CasillaLaberinto.MURALLA)
-                    nueva_pos = nueva_posicion
-            nuevas_murallas.add(nueva_pos)
-        self.murallas_pos = list(nuevas_murallas)
+        """
+        Mueve las murallas de forma aleatoria en el laberinto.
+
+        Cada muralla conserva su índice en 'murallas_pos' y consume dos sorteos por tick (si se mueve y
+        hacia dónde) aunque no se mueva, así cada muralla usa siempre la misma parte de la secuencia de
+        'aleatorio'. Los movimientos efectivos del tick quedan en 'murallas_movidas' como pares
+        (origen, destino).
+        """
+        self.murallas_movidas = []
+        aleatorio = self.aleatorio
+
+        for indice, muralla in enumerate(self.murallas_pos):
+            se_mueve = aleatorio.random() <= self.prob_mover_murallas
+            mov = MOVIMIENTOS_MURALLA[aleatorio.randrange(len(MOVIMIENTOS_MURALLA))]
+            if not se_mueve:
+                continue
+
+            nueva_posicion = muralla + mov
+            # Verifica que la nueva posición esté dentro del laberinto y sea camino: las casillas a las que ya
+            # se movió otra muralla en este tick quedaron marcadas como MURALLA
+            if (
+                self.coordenada_en_laberinto(nueva_posicion)
+                and self.get_casilla(nueva_posicion) == CasillaLaberinto.CAMINO
+            ):
+                # Actualiza la casilla anterior a CAMINO
+                self.set_casilla(muralla, CasillaLaberinto.CAMINO)
+                # Mueve la muralla
+                self.set_casilla(nueva_posicion, CasillaLaberinto.MURALLA)
+                self.murallas_pos[indice] = nueva_posicion
+                self.murallas_movidas.append((muralla, nueva_posicion))
 
     def mover_jugador(self):
         """Mueve al jugador según su tick y actualiza su posición en el laberinto."""
@@ -165,6 +371,7 @@ class Laberinto:
 
         # Mover jugador usando su tick
         movimiento_jugador = self.jugador.tick()
+        self.ultimo_movimiento_jugador = movimiento_jugador
         if movimiento_jugador == MovimientosPosibles.NO_MOVERSE:
             return
 
@@ -205,6 +412,24 @@ class Laberinto:
                 adyacentes[mov] = self.get_casilla(nueva_posicion)
         return adyacentes
 
+    def movimientos_validos(
+        self, posicion: Optional[Coordenada] = None
+    ) -> list[MovimientosPosibles]:
+        """Devuelve los movimientos que llevan desde el jugador (o la posición dada) a una casilla transitable."""
+        if posicion is None:
+            posicion = self.jugador_pos
+        x, y = posicion
+
+        # Revisa las vecinas directo en la grilla, sin armar el dict de 'casillas_adyacentes'
+        validos = []
+        for mov in MovimientosPosibles:
+            dx, dy = mov.value
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.filas and 0 <= ny < self.columnas:
+                if self.laberinto[nx][ny] in CASILLAS_TRANSITABLES:
+                    validos.append(mov)
+        return validos
+
     def metas_mas_cercanas_a_posicion(
         self, posicion: Coordenada, ignorar_metas: list[Coordenada] = []
     ) -> list[Coordenada]:
@@ -212,6 +437,7 @@ class Laberinto:
         Devuelve una lista con las metas más cercanas a la posición dada (según distancia Manhattan).
 
         Excluye las metas indicadas en 'ignorar_metas'. Si hay varias metas a la misma distancia mínima, todas se incluyen en la lista.
+        Si el laberinto tiene planificador de recorrido, devuelve solo la primera meta del recorrido planificado.
 
         Args:
             posicion (Coordenada): Posición desde la cual calcular la distancia a las metas.
@@ -220,6 +446,9 @@ class Laberinto:
         Returns:
             list[Coordenada]: Lista de metas más cercanas (puede contener más de una si hay empate).
         """
+        if self.planificador is not None:
+            return self.planificador.recorrido(posicion, ignorar_metas)[:1]
+
         # Filtro las metas
         metas_disponibles = [pos for pos in self.metas_pos if pos not in ignorar_metas]
 
@@ -289,8 +518,10 @@ class Laberinto:
     def imprimir(self) -> None:
         """Imprime el laberinto en formato markdown y muestra la leyenda de símbolos de forma dinámica."""
         filas_md = []
-        for fila in self.laberinto:
-            filas_md.append("".join(c.value for c in fila))
+        for i in range(self.filas):
+            filas_md.append(
+                "".join(self.get_casilla(Coordenada(i, j)).value for j in range(self.columnas))
+            )
         print("\n".join(filas_md))
 
         leyenda = "\nLeyenda: " + ", ".join(
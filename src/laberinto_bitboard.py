@@ -0,0 +1,250 @@
+"""Módulo que define el laberinto con ocupación en bitboards (un entero por fila)."""
+
+from math import floor, log
+from random import Random
+from typing import Optional, Type
+
+from exceptions import CoordenadaFueraDeLimiteDelLaberintoError
+from jugador import Jugador, JugadorRandom
+from laberinto import Laberinto
+from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+
+MOVIMIENTOS_MURALLA = [m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE]
+
+
+class LaberintoBitboard(Laberinto):
+    """
+    Laberinto que guarda murallas, metas y jugador como bitsets por fila.
+
+    El bit 'y' del entero de la fila 'x' representa la casilla (x, y). Consultar si un vecino es transitable
+    se reduce a un desplazamiento y una máscara, y las murallas que se mueven en una misma dirección se
+    mueven todas juntas con un desplazamiento enmascarado de la fila completa.
+
+    A diferencia de Laberinto, 'murallas_pos' queda vacía: las murallas viven en 'muros'.
+    """
+
+    muros: list[int]
+    metas: list[int]
+    jugador_bits: list[int]
+    mascara_fila: int
+
+    def __init__(
+        self,
+        dimensiones: tuple[int, int],
+        prob_murallas: float = 0.2,
+        prob_mover_murallas: float = 0.3,
+        n_metas: int = 3,
+        clase_jugador: Type[Jugador] = JugadorRandom,
+        jugar_instanciado: Optional[Jugador] = None,
+        planificar_recorrido: bool = False,
+        aleatorio: Optional[Random] = None,
+    ):
+        """
+        Inicializa el laberinto con sus dimensiones y probabilidades.
+
+        Args:
+            dimensiones (tuple[int, int]): Dimensiones del laberinto.
+            prob_murallas (float): Probabilidad de generación de murallas.
+            prob_mover_murallas (float): Probabilidad de mover cada muralla.
+            n_metas (int): Número de metas en el laberinto.
+            clase_jugador (Type[Jugador]): Clase del jugador a instanciar.
+            planificar_recorrido (bool): Si es True, las metas se visitan en el orden planificado por distancia real.
+            aleatorio (Optional[Random]): Generador con que se crea la grilla y se sortean los movimientos de las
+                murallas. Si es None se usa uno con semilla al azar.
+        """
+        filas, columnas = dimensiones
+        self.muros = [0] * filas
+        self.metas = [0] * filas
+        self.jugador_bits = [0] * filas
+        self.mascara_fila = (1 << columnas) - 1
+
+        super().__init__(
+            dimensiones=dimensiones,
+            prob_murallas=prob_murallas,
+            prob_mover_murallas=prob_mover_murallas,
+            n_metas=n_metas,
+            clase_jugador=clase_jugador,
+            jugar_instanciado=jugar_instanciado,
+            planificar_recorrido=planificar_recorrido,
+            aleatorio=aleatorio,
+        )
+
+    def _crear_laberinto(self):
+        """Genera el laberinto igual que Laberinto y luego pasa las murallas de la grilla a los bitsets."""
+        super()._crear_laberinto()
+
+        for muralla in self.murallas_pos:
+            self.muros[muralla.x] |= 1 << muralla.y
+
+        del self.laberinto
+        self.murallas_pos = []
+
+    def _libres(self, x: int) -> int:
+        """Bitset de las casillas de camino de la fila x (las únicas a las que puede moverse una muralla)."""
+        return ~(self.muros[x] | self.metas[x] | self.jugador_bits[x]) & self.mascara_fila
+
+    def mover_murallas(self):
+        """
+        Mueve las murallas de forma aleatoria usando desplazamientos de bits.
+
+        Primero se sortean las murallas que se mueven saltando directamente de una a la siguiente
+        (distribución geométrica), y a cada una se le asigna una dirección. Luego, por cada dirección,
+        se mueven juntas todas las murallas de una fila: una muralla solo avanza si su destino era camino
+        al comenzar esa dirección, así dos murallas nunca terminan en la misma casilla.
+        """
+        self.murallas_movidas = []
+        moviles = self._sortear_murallas_moviles()
+        if not moviles:
+            return
+
+        for mov in MOVIMIENTOS_MURALLA:
+            por_fila = moviles.get(mov)
+            if not por_fila:
+                continue
+
+            dx, dy = mov.value
+            destinos: list[tuple[int, int, int, int]] = []
+            for x, bits in por_fila.items():
+                x_destino = x + dx
+                if not 0 <= x_destino < self.filas:
+                    continue
+
+                if dy == 1:
+                    llegan = (bits << 1) & self._libres(x_destino)
+                    salen = llegan >> 1
+                elif dy == -1:
+                    llegan = (bits >> 1) & self._libres(x_destino)
+                    salen = llegan << 1
+                else:
+                    llegan = bits & self._libres(x_destino)
+                    salen = llegan
+
+                if llegan:
+                    destinos.append((x, x_destino, salen, llegan))
+
+            # Se aplican después de calcular todos los destinos para que el resultado no dependa del orden de las filas
+            for x, x_destino, salen, llegan in destinos:
+                self.muros[x] &= ~salen
+                self.muros[x_destino] |= llegan
+
+                while salen:
+                    bit = salen & -salen
+                    y = bit.bit_length() - 1
+                    self.murallas_movidas.append((Coordenada(x, y), Coordenada(x_destino, y + dy)))
+                    salen ^= bit
+
+    def _sortear_murallas_moviles(self) -> dict[MovimientosPosibles, dict[int, int]]:
+        """
+        Sortea qué murallas intentan moverse en este tick y en qué dirección.
+
+        Returns:
+            dict[MovimientosPosibles, dict[int, int]]: Por dirección, el bitset de murallas móviles de cada fila.
+        """
+        p = self.prob_mover_murallas
+        if p <= 0:
+            return {}
+        log_no_mover = log(1 - p) if p < 1 else None
+
+        def salto() -> int:
+            if log_no_mover is None:
+                return 1
+            return floor(log(1 - self.aleatorio.random()) / log_no_mover) + 1
+
+        moviles: dict[MovimientosPosibles, dict[int, int]] = {}
+        siguiente = (
+            salto() - 1
+        )  # Índice, dentro de las murallas que quedan por recorrer, de la próxima móvil
+        for x, fila in enumerate(self.muros):
+            cantidad = fila.bit_count()
+            while siguiente < cantidad:
+                bits = fila
+                for _ in range(siguiente):
+                    bits &= bits - 1
+                bit = bits & -bits
+
+                por_fila = moviles.setdefault(self.aleatorio.choice(MOVIMIENTOS_MURALLA), {})
+                por_fila[x] = por_fila.get(x, 0) | bit
+                siguiente += salto()
+            siguiente -= cantidad
+        return moviles
+
+    def movimientos_validos(
+        self, posicion: Optional[Coordenada] = None
+    ) -> list[MovimientosPosibles]:
+        """Devuelve los movimientos que llevan desde el jugador (o la posición dada) a una casilla transitable."""
+        if posicion is None:
+            posicion = self.jugador_pos
+        x, y = posicion
+
+        validos = []
+        for mov in MovimientosPosibles:
+            dx, dy = mov.value
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.filas and 0 <= ny < self.columnas:
+                if not ((self.muros[nx] | self.jugador_bits[nx]) >> ny) & 1:
+                    validos.append(mov)
+        return validos
+
+    def casillas_adyacentes(
+        self, posicion: Optional[Coordenada] = None
+    ) -> dict[MovimientosPosibles, CasillaLaberinto]:
+        """Devuelve un dict con los movimientos posibles y el tipo de casilla adyacente al jugador (o a la posición dada)."""
+        if posicion is None:
+            posicion = self.jugador_pos
+        x, y = posicion
+
+        adyacentes = {}
+        for mov in MovimientosPosibles:
+            dx, dy = mov.value
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.filas and 0 <= ny < self.columnas:
+                adyacentes[mov] = self._tipo_casilla(nx, ny)
+        return adyacentes
+
+    def _tipo_casilla(self, x: int, y: int) -> CasillaLaberinto:
+        if (self.jugador_bits[x] >> y) & 1:
+            return CasillaLaberinto.JUGADOR
+        if (self.muros[x] >> y) & 1:
+            return CasillaLaberinto.MURALLA
+        if (self.metas[x] >> y) & 1:
+            if self.meta_real_pos.x == x and self.meta_real_pos.y == y:
+                return CasillaLaberinto.META_REAL
+            return CasillaLaberinto.META_FALSA
+        return CasillaLaberinto.CAMINO
+
+    def get_casilla(self, coordenada: Coordenada) -> CasillaLaberinto:
+        """
+        Devuelve la casilla en la coordenada dada.
+
+        Raises:
+            CoordenadaFueraDeLimiteDelLaberintoError: Si la coordenada está fuera de los límites del laberinto.
+        """
+        if not self.coordenada_en_laberinto(coordenada):
+            raise CoordenadaFueraDeLimiteDelLaberintoError(
+                f"La coordenada {coordenada} está fuera de los límites del laberinto."
+            )
+        return self._tipo_casilla(coordenada.x, coordenada.y)
+
+    def set_casilla(self, coordenada: Coordenada, tipo_casilla: CasillaLaberinto) -> None:
+        """
+        Asigna el tipo de casilla en la coordenada dada.
+
+        Raises:
+            CoordenadaFueraDeLimiteDelLaberintoError: Si la coordenada está fuera de los límites del laberinto.
+        """
+        if not self.coordenada_en_laberinto(coordenada):
+            raise CoordenadaFueraDeLimiteDelLaberintoError(
+                f"La coordenada {coordenada} está fuera de los límites del laberinto."
+            )
+        x, y = coordenada
+        bit = 1 << y
+        self.muros[x] &= ~bit
+        self.metas[x] &= ~bit
+        self.jugador_bits[x] &= ~bit
+
+        if tipo_casilla == CasillaLaberinto.MURALLA:
+            self.muros[x] |= bit
+        elif tipo_casilla in (CasillaLaberinto.META_REAL, CasillaLaberinto.META_FALSA):
+            self.metas[x] |= bit
+        elif tipo_casilla == CasillaLaberinto.JUGADOR:
+            self.jugador_bits[x] |= bit
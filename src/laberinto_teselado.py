@@ -0,0 +1,350 @@
+"""Módulo que define el laberinto teselado, generado de forma perezosa por bloques."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import floor, log
+from random import Random, randrange
+from typing import Optional, Type
+
+from exceptions import (
+    CoordenadaFueraDeLimiteDelLaberintoError,
+    CreacionLaberintoError,
+)
+from jugador import Jugador, JugadorRandom
+from laberinto import CASILLAS_TRANSITABLES, Laberinto
+from models import CasillaLaberinto, Coordenada, MovimientosPosibles
+
+
+@dataclass
+class Tesela:
+    """Bloque cuadrado del laberinto con sus casillas y las murallas que contiene."""
+
+    origen: Coordenada
+    casillas: list[list[CasillaLaberinto]]
+    murallas: set[Coordenada]
+
+
+class LaberintoTeselado(Laberinto):
+    """
+    Laberinto dividido en teselas que se generan de forma determinista a partir de una semilla.
+
+    Una tesela se genera la primera vez que se consulta una de sus casillas. Las murallas solo se mueven
+    en las teselas cargadas; al cargar una tesela se simulan de golpe los ticks que lleva sin actualizarse.
+    Cuando hay más de 'max_teselas' cargadas se descarta la usada hace más tiempo, que se regenerará
+    desde la semilla si se vuelve a consultar.
+
+    A diferencia de Laberinto, 'murallas_pos' queda vacía: las murallas viven dentro de cada tesela.
+    """
+
+    tam_tesela: int
+    semilla: int
+    max_teselas: int
+    max_ticks_pendientes: int
+    teselas: OrderedDict[tuple[int, int], Tesela]
+
+    def __init__(
+        self,
+        dimensiones: tuple[int, int],
+        prob_murallas: float = 0.2,
+        prob_mover_murallas: float = 0.3,
+        n_metas: int = 3,
+        clase_jugador: Type[Jugador] = JugadorRandom,
+        jugar_instanciado: Optional[Jugador] = None,
+        tam_tesela: int = 64,
+        semilla: Optional[int] = None,
+        max_teselas: int = 256,
+        max_ticks_pendientes: int = 1000,
+        planificar_recorrido: bool = False,
+        aleatorio: Optional[Random] = None,
+    ):
+        """
+        Inicializa el laberinto teselado.
+
+        Args:
+            dimensiones (tuple[int, int]): Dimensiones del laberinto.
+            prob_murallas (float): Probabilidad de generación de murallas.
+            prob_mover_murallas (float): Probabilidad de mover cada muralla.
+            n_metas (int): Número de metas en el laberinto.
+            clase_jugador (Type[Jugador]): Clase del jugador a instanciar.
+            tam_tesela (int): Lado de cada tesela en casillas.
+            semilla (Optional[int]): Semilla de generación. Si es None se elige una al azar.
+            max_teselas (int): Máximo de teselas cargadas en memoria a la vez.
+            max_ticks_pendientes (int): Máximo de ticks que se simulan al cargar una tesela atrasada.
+            planificar_recorrido (bool): Si es True, las metas se visitan en el orden planificado por distancia
+                real. Los campos de flujo del planificador recorren todo el laberinto, así que cargan todas las teselas.
+            aleatorio (Optional[Random]): Generador con que se mueven las murallas de las teselas cargadas. Si se
+                entrega y 'semilla' es None, la semilla de generación también se toma de él.
+        """
+        if tam_tesela < 1:
+            raise CreacionLaberintoError("El tamaño de tesela debe ser de al menos 1 casilla.")
+        if max_teselas < 1:
+            raise CreacionLaberintoError("Debe poder cargarse al menos una tesela.")
+
+        self.tam_tesela = tam_tesela
+        if semilla is None:
+            semilla = aleatorio.randrange(2**32) if aleatorio is not None else randrange(2**32)
+        self.semilla = semilla
+        self.max_teselas = max_teselas
+        self.max_ticks_pendientes = max_ticks_pendientes
+        self.teselas = OrderedDict()
+        self.ticks_transcurridos = 0
+
+        super().__init__(
+            dimensiones=dimensiones,
+            prob_murallas=prob_murallas,
+            prob_mover_murallas=prob_mover_murallas,
+            n_metas=n_metas,
+            clase_jugador=clase_jugador,
+            jugar_instanciado=jugar_instanciado,
+            planificar_recorrido=planificar_recorrido,
+            aleatorio=aleatorio,
+        )
+
+    def crear_similar(
+        self,
+        jugador: Jugador,
+        dimensiones: Optional[tuple[int, int]] = None,
+        aleatorio: Optional[Random] = None,
+    ) -> "LaberintoTeselado":
+        """
+        Crea un laberinto teselado nuevo con los mismos parámetros y teselas, pero con otra semilla.
+
+        Args:
+            jugador (Jugador): Jugador ya instanciado que recorre el laberinto nuevo.
+            dimensiones (Optional[tuple[int, int]]): Dimensiones del laberinto nuevo. Si es None se usan las de
+                este laberinto.
+            aleatorio (Optional[Random]): Generador del laberinto nuevo; de él se toma la semilla. Si es None la
+                semilla se elige al azar.
+
+        Returns:
+            LaberintoTeselado: Laberinto nuevo, sin recorrido planificado.
+        """
+        return LaberintoTeselado(
+            dimensiones=dimensiones if dimensiones is not None else (self.filas, self.columnas),
+            prob_murallas=self.prob_murallas,
+            prob_mover_murallas=self.prob_mover_murallas,
+            n_metas=self.n_metas,
+            jugar_instanciado=jugador,
+            tam_tesela=self.tam_tesela,
+            max_teselas=self.max_teselas,
+            max_ticks_pendientes=self.max_ticks_pendientes,
+            aleatorio=aleatorio,
+        )
+
+    def _crear_laberinto(self):
+        """Elige la posición del jugador y de las metas sin generar ninguna tesela."""
+        total_casillas = self.filas * self.columnas
+        if total_casillas < self.n_metas + 1:
+            raise CreacionLaberintoError(
+                f"No hay suficientes casillas para ubicar al jugador y {self.n_metas} metas."
+            )
+
+        rng = Random(f"{self.semilla}-posiciones")
+        indices = rng.sample(range(total_casillas), self.n_metas + 1)
+        posiciones = [Coordenada(i // self.columnas, i % self.columnas) for i in indices]
+
+        self.jugador_pos = posiciones[0]
+        self.metas_pos = posiciones[1:]
+        self.meta_real_pos = self.metas_pos[rng.randint(0, self.n_metas - 1)]
+
+    def _casilla_fija(self, coordenada: Coordenada) -> Optional[CasillaLaberinto]:
+        """Devuelve el tipo impuesto a la coordenada (jugador o meta), o None si se genera libremente."""
+        if coordenada == self.jugador_pos:
+            return CasillaLaberinto.JUGADOR
+        if coordenada == self.meta_real_pos:
+            return CasillaLaberinto.META_REAL
+        if coordenada in self.metas_pos:
+            return CasillaLaberinto.META_FALSA
+        return None
+
+    def _generar_tesela(self, clave: tuple[int, int]) -> Tesela:
+        """
+        Genera la tesela indicada a partir de la semilla y la pone al día con los ticks transcurridos.
+
+        Args:
+            clave (tuple[int, int]): Índices (fila, columna) de la tesela.
+
+        Returns:
+            Tesela: Tesela generada.
+        """
+        rng = Random(f"{self.semilla}-{clave[0]}-{clave[1]}")
+        origen = Coordenada(clave[0] * self.tam_tesela, clave[1] * self.tam_tesela)
+        fin_x = min(origen.x + self.tam_tesela, self.filas)
+        fin_y = min(origen.y + self.tam_tesela, self.columnas)
+
+        casillas = []
+        murallas = set()
+        for i in range(origen.x, fin_x):
+            fila = []
+            for j in range(origen.y, fin_y):
+                coordenada = Coordenada(i, j)
+                es_muralla = rng.random() <= self.prob_murallas
+                fija = self._casilla_fija(coordenada)
+                if fija is not None:
+                    fila.append(fija)
+                elif es_muralla:
+                    fila.append(CasillaLaberinto.MURALLA)
+                    murallas.add(coordenada)
+                else:
+                    fila.append(CasillaLaberinto.CAMINO)
+            casillas.append(fila)
+
+        tesela = Tesela(origen=origen, casillas=casillas, murallas=murallas)
+        self._ponerse_al_dia(tesela, rng, min(self.ticks_transcurridos, self.max_ticks_pendientes))
+        return tesela
+
+    def _ponerse_al_dia(self, tesela: Tesela, rng: Random, ticks: int) -> None:
+        """
+        Simula de golpe 'ticks' ticks de movimiento de murallas dentro de la tesela.
+
+        En vez de sortear cada tick para cada muralla, se sortea directamente cuántos ticks pasan hasta su
+        siguiente movimiento (distribución geométrica), así el costo depende de los movimientos y no de los ticks.
+        """
+        p = self.prob_mover_murallas
+        if ticks <= 0 or p <= 0:
+            return
+
+        movimientos = [m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE]
+        log_no_mover = log(1 - p) if p < 1 else None
+
+        for muralla in list(tesela.murallas):
+            posicion = muralla
+            tick = 0
+            while True:
+                if log_no_mover is None:
+                    tick += 1
+                else:
+                    tick += floor(log(1 - rng.random()) / log_no_mover) + 1
+                if tick > ticks:
+                    break
+
+                destino = posicion + rng.choice(movimientos)
+                if (
+                    self._en_tesela(tesela, destino)
+                    and self._casilla_en_tesela(tesela, destino) == CasillaLaberinto.CAMINO
+                ):
+                    self._asignar_en_tesela(tesela, posicion, CasillaLaberinto.CAMINO)
+                    self._asignar_en_tesela(tesela, destino, CasillaLaberinto.MURALLA)
+                    posicion = destino
+
+    def _en_tesela(self, tesela: Tesela, coordenada: Coordenada) -> bool:
+        """Verifica si una coordenada pertenece a la tesela."""
+        return 0 <= coordenada.x - tesela.origen.x < len(
+            tesela.casillas
+        ) and 0 <= coordenada.y - tesela.origen.y < len(tesela.casillas[0])
+
+    def _casilla_en_tesela(self, tesela: Tesela, coordenada: Coordenada) -> CasillaLaberinto:
+        return tesela.casillas[coordenada.x - tesela.origen.x][coordenada.y - tesela.origen.y]
+
+    def _asignar_en_tesela(
+        self, tesela: Tesela, coordenada: Coordenada, tipo_casilla: CasillaLaberinto
+    ) -> None:
+        tesela.casillas[coordenada.x - tesela.origen.x][
+            coordenada.y - tesela.origen.y
+        ] = tipo_casilla
+        if tipo_casilla == CasillaLaberinto.MURALLA:
+            tesela.murallas.add(coordenada)
+        else:
+            tesela.murallas.discard(coordenada)
+
+    def _clave_tesela(self, coordenada: Coordenada) -> tuple[int, int]:
+        return coordenada.x // self.tam_tesela, coordenada.y // self.tam_tesela
+
+    def _tesela(self, coordenada: Coordenada) -> Tesela:
+        """Devuelve la tesela de la coordenada, generándola si no está cargada y descartando la más antigua."""
+        clave = self._clave_tesela(coordenada)
+        tesela = self.teselas.get(clave)
+        if tesela is not None:
+            self.teselas.move_to_end(clave)
+            return tesela
+
+        tesela = self._generar_tesela(clave)
+        self.teselas[clave] = tesela
+        if len(self.teselas) > self.max_teselas:
+            self.teselas.popitem(last=False)
+        return tesela
+
+    def mover_murallas(self):
+        """
+        Mueve las murallas de las teselas cargadas.
+
+        Una muralla solo puede moverse hacia una casilla de una tesela cargada; las teselas frías no se tocan.
+        Las teselas y sus murallas se recorren en orden de posición, y cada muralla consume dos sorteos de
+        'aleatorio' aunque no se mueva, así el orden de uso de las teselas no cambia los sorteos. Primero se
+        sortean los movimientos de todas las murallas y después se aplican, para que una muralla que llega a
+        una tesela que se recorre más tarde no vuelva a moverse en el mismo tick.
+        """
+        self.murallas_movidas = []
+        movimientos_muralla = [
+            m for m in MovimientosPosibles if m != MovimientosPosibles.NO_MOVERSE
+        ]
+
+        movimientos: list[tuple[Tesela, Coordenada, Coordenada]] = []
+        for clave in sorted(self.teselas):
+            tesela = self.teselas[clave]
+            for muralla in sorted(tesela.murallas, key=lambda c: (c.x, c.y)):
+                se_mueve = self.aleatorio.random() <= self.prob_mover_murallas
+                mov = movimientos_muralla[self.aleatorio.randrange(len(movimientos_muralla))]
+                if se_mueve:
+                    movimientos.append((tesela, muralla, muralla + mov))
+
+        for tesela, muralla, nueva_posicion in movimientos:
+            if not self.coordenada_en_laberinto(nueva_posicion):
+                continue
+
+            # El destino se revisa al aplicar, así dos murallas nunca terminan en la misma casilla
+            tesela_destino = self.teselas.get(self._clave_tesela(nueva_posicion))
+            if (
+                tesela_destino is None
+                or self._casilla_en_tesela(tesela_destino, nueva_posicion)
+                != CasillaLaberinto.CAMINO
+            ):
+                continue
+
+            self._asignar_en_tesela(tesela, muralla, CasillaLaberinto.CAMINO)
+            self._asignar_en_tesela(tesela_destino, nueva_posicion, CasillaLaberinto.MURALLA)
+            self.murallas_movidas.append((muralla, nueva_posicion))
+
+    def movimientos_validos(
+        self, posicion: Optional[Coordenada] = None
+    ) -> list[MovimientosPosibles]:
+        """Devuelve los movimientos que llevan desde el jugador (o la posición dada) a una casilla transitable."""
+        if posicion is None:
+            posicion = self.jugador_pos
+        x, y = posicion
+
+        validos = []
+        for mov in MovimientosPosibles:
+            dx, dy = mov.value
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.filas and 0 <= ny < self.columnas:
+                destino = Coordenada(nx, ny)
+                if self._casilla_en_tesela(self._tesela(destino), destino) in CASILLAS_TRANSITABLES:
+                    validos.append(mov)
+        return validos
+
+    def get_casilla(self, coordenada: Coordenada) -> CasillaLaberinto:
+        """
+        Devuelve la casilla en la coordenada dada, generando su tesela si hace falta.
+
+        Raises:
+            CoordenadaFueraDeLimiteDelLaberintoError: Si la coordenada está fuera de los límites del laberinto.
+        """
+        if not self.coordenada_en_laberinto(coordenada):
+            raise CoordenadaFueraDeLimiteDelLaberintoError(
+                f"La coordenada {coordenada} está fuera de los límites del laberinto."
+            )
+        return self._casilla_en_tesela(self._tesela(coordenada), coordenada)
+
+    def set_casilla(self, coordenada: Coordenada, tipo_casilla: CasillaLaberinto) -> None:
+        """
+        Asigna el tipo de casilla en la coordenada dada, generando su tesela si hace falta.
+
+        Raises:
+            CoordenadaFueraDeLimiteDelLaberintoError: Si la coordenada está fuera de los límites del laberinto.
+        """
+        if not self.coordenada_en_laberinto(coordenada):
+            raise CoordenadaFueraDeLimiteDelLaberintoError(
+                f"La coordenada {coordenada} está fuera de los límites del laberinto."
+            )
+        self._asignar_en_tesela(self._tesela(coordenada), coordenada, tipo_casilla)
@@ -1,17 +1,26 @@
 import argparse
+from functools import partial
 from typing import Type
 
 from jugador import (
+    CriterioConvergencia,
     Jugador,
     JugadorAEstrella,
     JugadorGenetico,
     JugadorGreedy,
+    JugadorHPAEstrella,
+    JugadorIteracionValor,
+    JugadorJPS,
     JugadorQlearning,
     JugadorQlearningEstrella,
     JugadorRandom,
+    cargar_tabla_q,
 )
 from laberinto import Laberinto
+from laberinto_bitboard import LaberintoBitboard
+from laberinto_teselado import LaberintoTeselado
 from menu import elegir_jugador
+from multiagente import simular_experimento_multiagente
 from simulacion import simular_experimento, simular_laberinto
 
 
@@ -23,11 +32,20 @@ def main():
             JugadorAEstrella,
             JugadorGenetico,
             JugadorGreedy,
+            JugadorHPAEstrella,
+            JugadorIteracionValor,
+            JugadorJPS,
             JugadorQlearning,
             JugadorQlearningEstrella,
             JugadorRandom,
         ]
     }
+    # Implementaciones disponibles del laberinto
+    motores: dict[str, Type[Laberinto]] = {
+        "lista": Laberinto,
+        "bitboard": LaberintoBitboard,
+        "teselado": LaberintoTeselado,
+    }
     parser = argparse.ArgumentParser(description="Selecciona el algoritmo a ejecutar.")
     parser.add_argument(
         "-a",
@@ -62,16 +80,213 @@ def main():
     )
     parser.add_argument("-e", "--experiments", action="store_true", help="Modo experimentación")
     parser.add_argument("--n-metas", type=int, default=3, help="Cantidad de metas (default: 3)")
+    parser.add_argument(
+        "--bitacora",
+        metavar="RUTA",
+        default=None,
+        help="Guarda la simulación en una bitácora binaria (se reproduce con src/bitacora.py; no disponible con --motor teselado)",
+    )
+    parser.add_argument(
+        "--motor",
+        choices=list(motores.keys()),
+        default="lista",
+        help="Implementación del laberinto (default: lista)",
+    )
+    parser.add_argument(
+        "--tam-tesela",
+        type=int,
+        default=64,
+        help="Lado de cada tesela en el motor teselado (default: 64)",
+    )
+    parser.add_argument(
+        "--semilla",
+        type=int,
+        default=None,
+        help="Semilla de generación del motor teselado (default: aleatoria)",
+    )
+    parser.add_argument(
+        "--recorrido-metas",
+        action="store_true",
+        help="Las metas se visitan en el orden planificado con distancias reales (vecino más cercano + 2-opt)",
+    )
+    parser.add_argument(
+        "--pasos-planificacion",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Actualizaciones Dyna-Q con barrido priorizado por cada paso real de JugadorQlearning (default: 0)",
+    )
+    parser.add_argument(
+        "--lambda-trazas",
+        type=float,
+        default=0.0,
+        metavar="LAMBDA",
+        help="Entrena JugadorQlearning y JugadorQlearningEstrella con trazas de elegibilidad Q(λ) (default: 0, TD(0))",
+    )
+    parser.add_argument(
+        "--parada-temprana",
+        action="store_true",
+        help="Detiene el entrenamiento de los jugadores Q-learning y genético cuando la política converge",
+    )
+    parser.add_argument(
+        "--presupuesto-entrenamiento",
+        type=float,
+        default=None,
+        metavar="SEGUNDOS",
+        help="Tiempo máximo de entrenamiento de los jugadores Q-learning y genético (default: sin límite)",
+    )
+    parser.add_argument(
+        "--estado-local",
+        action="store_true",
+        help="JugadorQlearning y JugadorQlearningEstrella indexan la Q-table por el entorno de cada casilla",
+    )
+    parser.add_argument(
+        "--tabla-q",
+        metavar="RUTA",
+        default=None,
+        help="Carga la Q-table de RUTA sin entrenar o, si no existe, entrena y la guarda ahí",
+    )
+    parser.add_argument(
+        "--tabla-q-inicial",
+        metavar="RUTA",
+        default=None,
+        help="Arranca JugadorQlearning o JugadorQlearningEstrella desde la Q-table guardada en RUTA, remuestreada",
+    )
+    parser.add_argument(
+        "--curriculum",
+        type=int,
+        nargs="+",
+        default=None,
+        metavar="LADO",
+        help="Entrena antes en laberintos cuadrados de estos lados, de menor a mayor",
+    )
+    parser.add_argument(
+        "--episodios-etapa",
+        type=int,
+        default=1000,
+        help="Máximo de episodios por etapa previa del curriculum; la final usa el presupuesto normal (default: 1000)",
+    )
+    parser.add_argument(
+        "--procesos",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Entrena JugadorQlearning o JugadorQlearningEstrella en N procesos con una Q-table compartida",
+    )
+    parser.add_argument(
+        "--replay",
+        type=int,
+        default=0,
+        metavar="CAPACIDAD",
+        help="Entrena JugadorQlearning o JugadorQlearningEstrella con repetición de experiencia por lotes",
+    )
+    parser.add_argument(
+        "--generaciones",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Máximo de generaciones de JugadorGenetico (default: 100)",
+    )
+    parser.add_argument(
+        "--poblacion",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Individuos por generación de JugadorGenetico (default: 100)",
+    )
+    parser.add_argument(
+        "--diversidad-minima",
+        type=float,
+        default=None,
+        metavar="DESVIACION",
+        help="Detiene JugadorGenetico cuando la desviación estándar de todos los genes cae bajo DESVIACION",
+    )
+    parser.add_argument(
+        "--ventana-estancamiento",
+        type=int,
+        default=None,
+        metavar="G",
+        help="Detiene JugadorGenetico si el mejor desempeño no mejora en G generaciones",
+    )
+    parser.add_argument(
+        "--etapas-evaluacion",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Evalúa cada generación de JugadorGenetico en N etapas de presupuesto creciente",
+    )
+    parser.add_argument(
+        "--islas",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Evoluciona la población de JugadorGenetico en K islas, cada una en su propio proceso",
+    )
+    parser.add_argument(
+        "--intervalo-migracion",
+        type=int,
+        default=10,
+        metavar="M",
+        help="Generaciones entre cada intercambio de genomas entre islas (default: 10)",
+    )
+    parser.add_argument(
+        "--laberintos-comunes",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Evalúa a toda una generación de JugadorGenetico en los mismos N laberintos",
+    )
+    parser.add_argument(
+        "--renovacion-laberintos",
+        type=int,
+        default=1,
+        metavar="G",
+        help="Generaciones que se reutilizan los laberintos comunes antes de sortear otros (default: 1)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        metavar="RUTA",
+        help="Guarda la población de JugadorGenetico en RUTA y reanuda desde ahí si el archivo existe",
+    )
+    parser.add_argument(
+        "--intervalo-checkpoint",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Generaciones entre cada checkpoint de JugadorGenetico (default: 10)",
+    )
+    parser.add_argument(
+        "--poblacion-inicial",
+        default=None,
+        metavar="RUTA",
+        help="Parte JugadorGenetico desde la población guardada en RUTA",
+    )
+    parser.add_argument(
+        "--segundo-plano",
+        action="store_true",
+        help="Entrena JugadorQlearning, JugadorQlearningEstrella o JugadorGenetico en otro proceso mientras ya juega",
+    )
+    parser.add_argument(
+        "--agentes",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Simula N agentes guiados por campos de flujo compartidos en el mismo laberinto (no requiere -a)",
+    )
     args = parser.parse_args()
 
-    if not args.interactivo and not args.algoritmo:
+    if not args.interactivo and not args.algoritmo and args.agentes is None:
         parser.error(
             "El argumento -a/--algoritmo es obligatorio si no se usa el modo interactivo (-i/--interactivo)."
         )
 
     # Selección de clase de jugador
     tipo_jugador = None
-    if args.algoritmo:
+    if args.agentes is not None:
+        # Los agentes navegan con campos de flujo; el jugador propio del laberinto no se mueve
+        tipo_jugador = JugadorRandom
+    elif args.algoritmo:
         tipo_jugador = clases[args.algoritmo]
     elif args.interactivo and not args.algoritmo:
         tipo_jugador = elegir_jugador()
@@ -79,18 +294,164 @@ def main():
     if tipo_jugador is None:
         parser.error("No se seleccionó un tipo de jugador válido.")
 
-    laberinto = Laberinto(
+    # Las opciones que no aplican al jugador o motor elegido son un error en vez de ignorarse en silencio
+    jugadores_q = (JugadorQlearning, JugadorQlearningEstrella)
+    jugadores_entrenables = (JugadorQlearning, JugadorQlearningEstrella, JugadorGenetico)
+    opciones_por_jugador: dict[str, tuple[Type[Jugador], ...]] = {
+        "pasos_planificacion": (JugadorQlearning,),
+        "lambda_trazas": jugadores_q,
+        "estado_local": jugadores_q,
+        "tabla_q": jugadores_q,
+        "tabla_q_inicial": jugadores_q,
+        "curriculum": jugadores_q,
+        "procesos": jugadores_q,
+        "replay": jugadores_q,
+        "generaciones": (JugadorGenetico,),
+        "poblacion": (JugadorGenetico,),
+        "diversidad_minima": (JugadorGenetico,),
+        "ventana_estancamiento": (JugadorGenetico,),
+        "etapas_evaluacion": (JugadorGenetico,),
+        "islas": (JugadorGenetico,),
+        "laberintos_comunes": (JugadorGenetico,),
+        "checkpoint": (JugadorGenetico,),
+        "poblacion_inicial": (JugadorGenetico,),
+        "segundo_plano": jugadores_entrenables,
+        "parada_temprana": jugadores_entrenables,
+        "presupuesto_entrenamiento": jugadores_entrenables,
+    }
+    # Opciones que solo tienen efecto junto con otra
+    opciones_dependientes = {
+        "episodios_etapa": "curriculum",
+        "intervalo_migracion": "islas",
+        "renovacion_laberintos": "laberintos_comunes",
+        "intervalo_checkpoint": "checkpoint",
+    }
+
+    def usada(destino: str) -> bool:
+        return getattr(args, destino) != parser.get_default(destino)
+
+    def opcion(destino: str) -> str:
+        return "--" + destino.replace("_", "-")
+
+    for destino, jugadores in opciones_por_jugador.items():
+        if usada(destino) and tipo_jugador not in jugadores:
+            parser.error(
+                f"{opcion(destino)} solo aplica a {', '.join(j.__name__ for j in jugadores)}."
+            )
+    for destino, requisito in opciones_dependientes.items():
+        if usada(destino) and not usada(requisito):
+            parser.error(f"{opcion(destino)} solo tiene efecto junto con {opcion(requisito)}.")
+    if args.motor != "teselado":
+        for destino in ("tam_tesela", "semilla"):
+            if usada(destino):
+                parser.error(f"{opcion(destino)} solo aplica con --motor teselado.")
+    elif args.bitacora is not None:
+        # Las fotos de la bitácora recorren toda la grilla, lo que generaría todas las teselas
+        parser.error("--bitacora no se puede combinar con --motor teselado.")
+
+    # Parámetros de entrenamiento opcionales de los jugadores basados en Q-learning
+    parametros_jugador = {}
+    if args.pasos_planificacion > 0 and tipo_jugador is JugadorQlearning:
+        parametros_jugador["pasos_planificacion"] = args.pasos_planificacion
+    if args.lambda_trazas > 0 and tipo_jugador in (JugadorQlearning, JugadorQlearningEstrella):
+        parametros_jugador["lambda_trazas"] = args.lambda_trazas
+    if tipo_jugador in (JugadorQlearning, JugadorQlearningEstrella):
+        if args.estado_local:
+            parametros_jugador["usar_estado_local"] = True
+        if args.tabla_q is not None:
+            parametros_jugador["ruta_tabla_q"] = args.tabla_q
+        if args.tabla_q_inicial is not None:
+            parametros_jugador["tabla_q_inicial"] = cargar_tabla_q(args.tabla_q_inicial)
+        if args.procesos > 1:
+            if args.estado_local:
+                parser.error("--procesos no se puede combinar con --estado-local.")
+            parametros_jugador["procesos"] = args.procesos
+        if args.replay > 0:
+            if args.estado_local or args.curriculum:
+                parser.error("--replay no se puede combinar con --estado-local ni --curriculum.")
+            parametros_jugador["tam_replay"] = args.replay
+        if args.curriculum:
+            parametros_jugador["curriculum"] = [(lado, lado) for lado in args.curriculum]
+            parametros_jugador["episodios_curriculum"] = args.episodios_etapa
+    if tipo_jugador is JugadorGenetico:
+        if args.islas > 1 and (
+            args.diversidad_minima is not None or args.ventana_estancamiento is not None
+        ):
+            parser.error(
+                "--diversidad-minima y --ventana-estancamiento no se pueden combinar con --islas."
+            )
+        if args.islas > 1 and (args.checkpoint is not None or args.poblacion_inicial is not None):
+            parser.error("--checkpoint y --poblacion-inicial no se pueden combinar con --islas.")
+        if args.checkpoint is not None:
+            parametros_jugador["ruta_checkpoint"] = args.checkpoint
+            parametros_jugador["intervalo_checkpoint"] = args.intervalo_checkpoint
+        if args.poblacion_inicial is not None:
+            parametros_jugador["ruta_poblacion_inicial"] = args.poblacion_inicial
+        if args.generaciones != 100:
+            parametros_jugador["generaciones"] = args.generaciones
+        if args.poblacion != 100:
+            parametros_jugador["tamaño_poblacion"] = args.poblacion
+        if args.diversidad_minima is not None:
+            parametros_jugador["diversidad_minima"] = args.diversidad_minima
+        if args.ventana_estancamiento is not None:
+            parametros_jugador["ventana_estancamiento"] = args.ventana_estancamiento
+    if args.etapas_evaluacion > 1 and tipo_jugador is JugadorGenetico:
+        parametros_jugador["etapas_evaluacion"] = args.etapas_evaluacion
+    if args.islas > 1 and tipo_jugador is JugadorGenetico:
+        parametros_jugador["islas"] = args.islas
+        parametros_jugador["intervalo_migracion"] = args.intervalo_migracion
+    if args.laberintos_comunes > 0 and tipo_jugador is JugadorGenetico:
+        parametros_jugador["laberintos_comunes"] = args.laberintos_comunes
+        parametros_jugador["renovacion_laberintos"] = args.renovacion_laberintos
+    if args.segundo_plano and tipo_jugador in (
+        JugadorQlearning,
+        JugadorQlearningEstrella,
+        JugadorGenetico,
+    ):
+        if args.estado_local or args.curriculum or args.procesos > 1 or args.replay > 0:
+            parser.error(
+                "--segundo-plano no se puede combinar con --estado-local, --curriculum, --procesos ni --replay."
+            )
+        if args.tabla_q is not None or args.islas > 1:
+            parser.error("--segundo-plano no se puede combinar con --tabla-q ni --islas.")
+        parametros_jugador["segundo_plano"] = True
+    if (args.parada_temprana or args.presupuesto_entrenamiento is not None) and tipo_jugador in (
+        JugadorQlearning,
+        JugadorQlearningEstrella,
+        JugadorGenetico,
+    ):
+        parametros_jugador["criterio_parada"] = (
+            CriterioConvergencia(presupuesto_segundos=args.presupuesto_entrenamiento)
+            if args.parada_temprana
+            else CriterioConvergencia(
+                umbral_delta_q_medio=None,
+                umbral_cambio_politica=None,
+                presupuesto_segundos=args.presupuesto_entrenamiento,
+            )
+        )
+    if parametros_jugador:
+        tipo_jugador = partial(tipo_jugador, **parametros_jugador)
+
+    parametros_motor = {}
+    if args.motor == "teselado":
+        parametros_motor = {"tam_tesela": args.tam_tesela, "semilla": args.semilla}
+
+    laberinto = motores[args.motor](
         dimensiones=tuple(args.dimensiones),
         prob_murallas=args.prob_gen_murallas,
         prob_mover_murallas=args.prob_mover_murallas,
         n_metas=args.n_metas,
         clase_jugador=tipo_jugador,
+        planificar_recorrido=args.recorrido_metas,
+        **parametros_motor,
     )
 
-    if args.experiments:
-        simular_experimento(laberinto)
+    if args.agentes is not None:
+        simular_experimento_multiagente(laberinto, n_agentes=args.agentes)
+    elif args.experiments:
+        simular_experimento(laberinto, ruta_bitacora=args.bitacora)
     else:
-        simular_laberinto(laberinto, modo_interactivo=args.interactivo)
+        simular_laberinto(laberinto, modo_interactivo=args.interactivo, ruta_bitacora=args.bitacora)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 """Paquete que agrupa a todos los Enum y @dataclass que se usan en este proyecto."""
 
+from .cambios_tick import CambiosTick
 from .casilla_laberinto import CasillaLaberinto
 from .coordenada import Coordenada
 from .movimientos import MovimientosPosibles
+from .resultado_entrenamiento import MotivoParada, ResultadoEntrenamiento
+from .resultado_evolucion import MotivoFinEvolucion, ResultadoEvolucion
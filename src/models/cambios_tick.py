@@ -0,0 +1,28 @@
+"""Módulo que define la clase CambiosTick."""
+
+from dataclasses import dataclass, field
+
+from .coordenada import Coordenada
+from .movimientos import MovimientosPosibles
+
+
+@dataclass(frozen=True)
+class CambiosTick:
+    """
+    Resumen de lo que cambió en el laberinto durante un tick.
+
+    Permite a jugadores y otros componentes actualizar sus estructuras (caminos, mapas de distancia, etc.)
+    trabajando solo sobre las casillas que cambiaron, en vez de recorrer el laberinto completo.
+    """
+
+    tick: int
+    movimiento_jugador: MovimientosPosibles
+    posicion_anterior: Coordenada
+    posicion_jugador: Coordenada
+    murallas_nuevas: list[Coordenada] = field(
+        default_factory=list
+    )  # Casillas que pasaron a ser muralla
+    casillas_liberadas: list[Coordenada] = field(
+        default_factory=list
+    )  # Casillas que dejaron de serlo
+    metas_visitadas: list[Coordenada] = field(default_factory=list)
@@ -0,0 +1,33 @@
+"""Módulo que define la clase ResultadoEntrenamiento y el Enum MotivoParada."""
+
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
+
+
+class MotivoParada(Enum):
+    """Representa por qué terminó el entrenamiento de un jugador basado en Q-learning."""
+
+    EPISODIOS_COMPLETOS = "se completaron todos los episodios"
+    CONVERGENCIA = "la política convergió"
+    PRESUPUESTO_TIEMPO = "se agotó el presupuesto de tiempo"
+
+
+@dataclass(frozen=True)
+class ResultadoEntrenamiento:
+    """Resumen de un entrenamiento: cuántos episodios se jugaron, por qué se detuvo y cuánto tardó."""
+
+    episodios: int
+    motivo: MotivoParada
+    segundos: float
+    # Motivo de cada proceso al entrenar en paralelo ('motivo' es el más común); vacío con un solo proceso
+    motivos_procesos: tuple[MotivoParada, ...] = ()
+
+    def __str__(self) -> str:
+        motivo = self.motivo.value
+        if len(set(self.motivos_procesos)) > 1:
+            conteo = Counter(self.motivos_procesos)
+            motivo += "; por proceso: " + ", ".join(
+                f"{cantidad} {motivo_proceso.value}" for motivo_proceso, cantidad in conteo.items()
+            )
+        return f"Entrenamiento: {self.episodios} episodios en {self.segundos:.2f} s ({motivo})"
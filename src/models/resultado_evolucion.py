@@ -0,0 +1,24 @@
+"""Módulo que define la clase ResultadoEvolucion y el Enum MotivoFinEvolucion."""
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class MotivoFinEvolucion(Enum):
+    """Representa por qué terminó la evolución de la población del jugador genético."""
+
+    GENERACIONES_COMPLETAS = "se completaron todas las generaciones"
+    DIVERSIDAD_AGOTADA = "la diversidad de la población colapsó"
+    ESTANCAMIENTO = "el mejor desempeño dejó de mejorar"
+
+
+@dataclass(frozen=True)
+class ResultadoEvolucion:
+    """Resumen de una evolución: cuántas generaciones se crearon, por qué se detuvo y cuánto tardó."""
+
+    generaciones: int
+    motivo: MotivoFinEvolucion
+    segundos: float
+
+    def __str__(self) -> str:
+        return f"Evolución: {self.generaciones} generaciones en {self.segundos:.2f} s ({self.motivo.value})"
@@ -0,0 +1,126 @@
+"""Módulo que simula muchos agentes recorriendo un mismo laberinto guiados por campos de flujo compartidos."""
+
+from dataclasses import dataclass, field
+from random import randrange
+from time import time
+from typing import Optional
+
+from campo_flujo import CampoDeFlujo
+from exceptions import CreacionLaberintoError
+from laberinto import Laberinto
+from models import CasillaLaberinto, Coordenada
+
+
+@dataclass
+class Agente:
+    """Agente liviano: no ocupa casilla en el laberinto, solo recuerda su posición y las metas que visitó."""
+
+    posicion: Coordenada
+    metas_visitadas: set[Coordenada] = field(default_factory=set)
+    tick_llegada: Optional[int] = None
+
+
+def crear_agentes(laberinto: Laberinto, n_agentes: int) -> list[Agente]:
+    """
+    Ubica 'n_agentes' agentes en casillas de camino elegidas al azar (pueden compartir casilla).
+
+    Raises:
+        CreacionLaberintoError: Si el laberinto no tiene casillas de camino libres.
+    """
+    agentes = []
+    for _ in range(n_agentes):
+        for _ in range(laberinto.filas * laberinto.columnas):
+            posicion = Coordenada(randrange(laberinto.filas), randrange(laberinto.columnas))
+            if laberinto.get_casilla(posicion) == CasillaLaberinto.CAMINO:
+                agentes.append(Agente(posicion=posicion))
+                break
+        else:
+            raise CreacionLaberintoError(
+                "No hay casillas de camino libres para ubicar a los agentes."
+            )
+    return agentes
+
+
+def elegir_meta(agente: Agente, campos: dict[Coordenada, CampoDeFlujo]) -> Coordenada:
+    """
+    Devuelve la meta no visitada más cercana al agente según la distancia real.
+
+    Si no alcanza ninguna (por ejemplo, porque una muralla quedó sobre él), usa la distancia Manhattan.
+    """
+    metas_no_visitadas = [meta for meta in campos if meta not in agente.metas_visitadas]
+    alcanzables = {
+        meta: distancia
+        for meta in metas_no_visitadas
+        if (distancia := campos[meta].distancia(agente.posicion)) is not None
+    }
+    if alcanzables:
+        return min(alcanzables, key=alcanzables.get)
+    return min(metas_no_visitadas, key=agente.posicion.distancia_manhatan)
+
+
+def simular_multiagente(
+    laberinto: Laberinto, n_agentes: int, limite_de_ticks: int = 10000
+) -> list[Agente]:
+    """
+    Simula 'n_agentes' agentes que buscan la meta real en el mismo laberinto.
+
+    Cada tick se mueven las murallas una sola vez y se actualiza un campo de flujo por meta con las casillas
+    que cambiaron; luego cada agente sigue el campo de la meta no visitada más cercana. Igual que el jugador,
+    un agente solo sabe si una meta es la real al llegar a ella. El jugador propio del laberinto no se mueve.
+
+    Args:
+        laberinto (Laberinto): Laberinto compartido por todos los agentes.
+        n_agentes (int): Cantidad de agentes.
+        limite_de_ticks (int, opcional): Máximo de ticks a simular. Por defecto 10000.
+
+    Returns:
+        list[Agente]: Agentes con el tick en que llegaron a la meta real (None si no llegaron).
+    """
+    campos = {meta: CampoDeFlujo(laberinto, meta) for meta in laberinto.metas_pos}
+    agentes = crear_agentes(laberinto, n_agentes)
+    activos = agentes
+
+    for _ in range(limite_de_ticks):
+        if not activos:
+            break
+
+        laberinto.mover_murallas()
+        laberinto.ticks_transcurridos += 1
+        murallas_nuevas, casillas_liberadas = laberinto.cambios_murallas()
+        for campo in campos.values():
+            campo.actualizar(murallas_nuevas, casillas_liberadas)
+
+        for agente in activos:
+            meta = elegir_meta(agente, campos)
+            agente.posicion = agente.posicion + campos[meta].siguiente_movimiento(agente.posicion)
+            if agente.posicion in campos:
+                agente.metas_visitadas.add(agente.posicion)
+                if agente.posicion == laberinto.meta_real_pos:
+                    agente.tick_llegada = laberinto.ticks_transcurridos
+
+        activos = [agente for agente in activos if agente.tick_llegada is None]
+
+    return agentes
+
+
+def simular_experimento_multiagente(
+    laberinto: Laberinto, n_agentes: int, limite_de_ticks: int = 10000
+):
+    """
+    Ejecuta la simulación multiagente e imprime una fila CSV con el resumen.
+
+    Columnas: filas, columnas, prob_murallas, prob_mover_murallas, n_metas, tiempo (ms), ticks, agentes,
+    agentes que llegaron y ticks promedio de llegada de esos agentes.
+    """
+    start = time()
+    agentes = simular_multiagente(laberinto, n_agentes, limite_de_ticks)
+    tiempo_transcurrido = round((time() - start) * 1000, 2)
+
+    llegadas = [agente.tick_llegada for agente in agentes if agente.tick_llegada is not None]
+    ticks_promedio = round(sum(llegadas) / len(llegadas), 2) if llegadas else ""
+
+    print(
+        f"{laberinto.filas},{laberinto.columnas},{laberinto.prob_murallas},"
+        f"{laberinto.prob_mover_murallas},{laberinto.n_metas},{tiempo_transcurrido},"
+        f"{laberinto.ticks_transcurridos},{n_agentes},{len(llegadas)},{ticks_promedio}"
+    )
@@ -0,0 +1,249 @@
+"""Módulo que define el planificador del orden en que conviene visitar las metas del laberinto."""
+
+from typing import Optional
+
+from campo_flujo import SIN_CAMINO, CampoDeFlujo
+from models import CambiosTick, Coordenada
+
+
+class PlanificadorRecorrido:
+    """
+    Planifica el orden de visita de las metas usando distancias reales de camino.
+
+    Mantiene un campo de flujo por meta, que da la distancia real desde cualquier casilla a esa meta; de ahí
+    sale la matriz de distancias entre metas y desde el jugador. Los cambios de cada tick se acumulan por meta
+    y el campo solo se pone al día cuando se le consulta una distancia, así que los ticks en que nadie pide
+    el recorrido y las metas ya visitadas no cuestan actualizaciones.
+
+    El orden es un recorrido abierto (sin volver al inicio) que busca minimizar los pasos totales: se arma
+    con vecino más cercano y se mejora con 2-opt y reubicación de metas (or-opt).
+    """
+
+    campos: dict[Coordenada, CampoDeFlujo]
+    # Por meta, estado final (True si quedó libre) de las casillas que cambiaron desde la última actualización
+    # de su campo
+    _cambios_pendientes: dict[Coordenada, dict[Coordenada, bool]]
+
+    def __init__(self, laberinto):
+        """
+        Construye los campos de flujo de las metas y se suscribe a los cambios del laberinto.
+
+        Args:
+            laberinto (Laberinto): Laberinto cuyas metas se planifican.
+        """
+        self.laberinto = laberinto
+        self.campos = {meta: CampoDeFlujo(laberinto, meta) for meta in laberinto.metas_pos}
+        self._cambios_pendientes = {meta: {} for meta in self.campos}
+        # Recorrido guardado: metas pendientes, orden y distancias entre esas metas
+        self._recorrido_guardado: Optional[
+            tuple[
+                frozenset[Coordenada],
+                list[Coordenada],
+                dict[tuple[Coordenada, Coordenada], int],
+            ]
+        ] = None
+        # False si las murallas se movieron desde que se midieron las distancias del recorrido guardado
+        self._distancias_vigentes = True
+        self._ultimo_orden: list[Coordenada] = []
+
+        laberinto.suscribir(self._al_cambiar_laberinto)
+
+    def _al_cambiar_laberinto(self, cambios: CambiosTick) -> None:
+        """Anota en cada meta las murallas que se movieron en el tick, sin actualizar todavía los campos."""
+        if not cambios.murallas_nuevas and not cambios.casillas_liberadas:
+            return
+        for pendientes in self._cambios_pendientes.values():
+            for casilla in cambios.murallas_nuevas:
+                pendientes[casilla] = False
+            for casilla in cambios.casillas_liberadas:
+                pendientes[casilla] = True
+        self._distancias_vigentes = False
+
+    def _campo(self, meta: Coordenada) -> CampoDeFlujo:
+        """
+        Devuelve el campo de flujo de 'meta' al día, aplicándole los cambios acumulados desde su última consulta.
+
+        Solo se aplica el estado final de cada casilla: una muralla que se fue y volvió no cuesta nada. Las
+        casillas que quedaron como ya estaban en el campo no alteran sus distancias.
+        """
+        campo = self.campos[meta]
+        pendientes = self._cambios_pendientes[meta]
+        if pendientes:
+            campo.actualizar(
+                [casilla for casilla, libre in pendientes.items() if not libre],
+                [casilla for casilla, libre in pendientes.items() if libre],
+            )
+            pendientes.clear()
+        return campo
+
+    def distancia(self, desde: Coordenada, meta: Coordenada) -> int:
+        """Devuelve la distancia real de camino desde una casilla a una meta ('SIN_CAMINO' si no se llega)."""
+        distancia = self._campo(meta).distancia(desde)
+        return SIN_CAMINO if distancia is None else distancia
+
+    def recorrido(
+        self, posicion: Coordenada, ignorar_metas: list[Coordenada] = []
+    ) -> list[Coordenada]:
+        """
+        Devuelve el orden en que conviene visitar las metas pendientes partiendo desde 'posicion'.
+
+        El recorrido completo (vecino más cercano, 2-opt y or-opt) solo se arma cuando cambian las metas
+        pendientes. Si las murallas se movieron, se vuelven a medir las distancias entre metas y el orden
+        anterior solo se vuelve a mejorar si alguna cambió; si no, como cuando solo se movió el jugador, basta
+        con re-anclarlo a la nueva posición.
+
+        Args:
+            posicion (Coordenada): Posición de partida.
+            ignorar_metas (list[Coordenada], opcional): Metas ya visitadas que no se incluyen.
+
+        Returns:
+            list[Coordenada]: Metas pendientes en el orden de visita planificado.
+        """
+        pendientes = [meta for meta in self.campos if meta not in ignorar_metas]
+        clave = frozenset(pendientes)
+
+        guardado = self._recorrido_guardado
+        if guardado is not None and guardado[0] == clave:
+            _, orden, entre_metas = guardado
+            reoptimizar = False
+            if not self._distancias_vigentes:
+                anteriores = entre_metas
+                entre_metas = self._distancias_entre_metas(pendientes)
+                reoptimizar = entre_metas != anteriores
+            distancias = self._con_partida(posicion, pendientes, entre_metas)
+            if reoptimizar:
+                orden = self._mejorar(posicion, orden, distancias)
+            else:
+                orden = self._reanclar(posicion, orden, distancias)
+            self._distancias_vigentes = True
+            self._ultimo_orden = orden
+            self._recorrido_guardado = (clave, orden, entre_metas)
+            return list(orden)
+
+        # Matriz de distancias entre el punto de partida y las metas pendientes
+        entre_metas = self._distancias_entre_metas(pendientes)
+        distancias = self._con_partida(posicion, pendientes, entre_metas)
+
+        orden = self._mejorar(
+            posicion, self._vecino_mas_cercano(posicion, pendientes, distancias), distancias
+        )
+
+        # Se mantiene el orden anterior si sigue siendo igual de bueno, así el jugador no cambia de meta
+        # de un tick a otro por empates (importa para los jugadores que piden su meta en cada tick)
+        anterior = [meta for meta in self._ultimo_orden if meta in pendientes]
+        if len(anterior) == len(pendientes):
+            anterior = self._mejorar(posicion, anterior, distancias)
+            if self._costo(posicion, anterior, distancias) <= self._costo(
+                posicion, orden, distancias
+            ):
+                orden = anterior
+
+        self._distancias_vigentes = True
+        self._ultimo_orden = orden
+        self._recorrido_guardado = (clave, orden, entre_metas)
+        return list(orden)
+
+    def _distancias_entre_metas(
+        self, pendientes: list[Coordenada]
+    ) -> dict[tuple[Coordenada, Coordenada], int]:
+        """Mide la distancia real entre cada par de metas pendientes."""
+        return {(a, b): self.distancia(a, b) for a in pendientes for b in pendientes}
+
+    def _con_partida(
+        self,
+        posicion: Coordenada,
+        pendientes: list[Coordenada],
+        entre_metas: dict[tuple[Coordenada, Coordenada], int],
+    ) -> dict[tuple[Coordenada, Coordenada], int]:
+        """Agrega a las distancias entre metas las distancias desde 'posicion' a cada meta pendiente."""
+        distancias = dict(entre_metas)
+        for meta in pendientes:
+            distancias[(posicion, meta)] = self.distancia(posicion, meta)
+        return distancias
+
+    def _reanclar(
+        self,
+        posicion: Coordenada,
+        orden: list[Coordenada],
+        distancias: dict[tuple[Coordenada, Coordenada], int],
+    ) -> list[Coordenada]:
+        """
+        Ajusta un orden ya optimizado a una nueva posición de partida.
+
+        Entre las metas solo cambia el primer tramo, así que basta probar el orden invertido y cada meta
+        llevada al principio, en O(metas²) en vez de volver a correr 2-opt y or-opt. Ante empates se mantiene
+        el orden dado.
+        """
+        mejor = orden
+        mejor_costo = self._costo(posicion, orden, distancias)
+        candidatos = [orden[::-1]] + [
+            [orden[i]] + orden[:i] + orden[i + 1 :] for i in range(1, len(orden))
+        ]
+        for candidato in candidatos:
+            costo = self._costo(posicion, candidato, distancias)
+            if costo < mejor_costo:
+                mejor, mejor_costo = candidato, costo
+        return mejor
+
+    @staticmethod
+    def _vecino_mas_cercano(
+        posicion: Coordenada,
+        pendientes: list[Coordenada],
+        distancias: dict[tuple[Coordenada, Coordenada], int],
+    ) -> list[Coordenada]:
+        """Arma un orden inicial yendo siempre a la meta pendiente más cercana."""
+        orden = []
+        restantes = list(pendientes)
+        actual = posicion
+        while restantes:
+            siguiente = min(restantes, key=lambda meta: distancias[(actual, meta)])
+            restantes.remove(siguiente)
+            orden.append(siguiente)
+            actual = siguiente
+        return orden
+
+    @staticmethod
+    def _costo(
+        posicion: Coordenada,
+        orden: list[Coordenada],
+        distancias: dict[tuple[Coordenada, Coordenada], int],
+    ) -> int:
+        """Pasos totales para recorrer las metas en el orden dado partiendo desde 'posicion'."""
+        total = 0
+        actual = posicion
+        for meta in orden:
+            total += distancias[(actual, meta)]
+            actual = meta
+        return total
+
+    def _mejorar(
+        self,
+        posicion: Coordenada,
+        orden: list[Coordenada],
+        distancias: dict[tuple[Coordenada, Coordenada], int],
+    ) -> list[Coordenada]:
+        """
+        Mejora el orden mientras alguna de estas jugadas reduzca el costo.
+
+        - 2-opt: invertir el tramo entre dos posiciones.
+        - or-opt: sacar una meta y reinsertarla en otra posición.
+        """
+        mejor_costo = self._costo(posicion, orden, distancias)
+        mejora = True
+        while mejora:
+            mejora = False
+            for i in range(len(orden)):
+                for j in range(len(orden)):
+                    if i == j:
+                        continue
+                    candidatos = [orden[:i] + orden[i + 1 :]]
+                    candidatos[0].insert(j, orden[i])
+                    if i < j:
+                        candidatos.append(orden[:i] + orden[i : j + 1][::-1] + orden[j + 1 :])
+
+                    for candidato in candidatos:
+                        costo = self._costo(posicion, candidato, distancias)
+                        if costo < mejor_costo:
+                            orden, mejor_costo = candidato, costo
+                            mejora = True
+        return orden
@@ -1,8 +1,11 @@
 """Módulo que contiene la lógica de simulación del laberinto y control de flujo de usuario."""
 
 import os
+import sys
 from enum import Enum, auto
+from typing import Optional
 
+from bitacora import EscritorBitacora
 from exceptions import (
     CreacionLaberintoError,
     MetaNoEncontradaError,
@@ -83,7 +86,10 @@ def limpiar_e_imprimir_laberinto(laberinto: Laberinto):
 
 
 def simular_laberinto(
-    laberinto: Laberinto, limite_de_ticks: int = 10000, modo_interactivo: bool = False
+    laberinto: Laberinto,
+    limite_de_ticks: int = 10000,
+    modo_interactivo: bool = False,
+    ruta_bitacora: Optional[str] = None,
 ):
     """
     Ejecuta la simulación del laberinto, moviendo murallas y jugador en cada tick.
@@ -92,6 +98,7 @@ def simular_laberinto(
         laberinto (Laberinto): Instancia del laberinto a simular.
         limite_de_ticks (int, opcional): Máximo de ciclos de simulación. Por defecto 10000.
         modo_interactivo (bool, opcional): Si True, permite interacción paso a paso con el usuario.
+        ruta_bitacora (Optional[str], opcional): Si se indica, guarda la simulación en una bitácora binaria.
 
     El modo interactivo permite continuar, autoavanzar la simulación o salir según la entrada del usuario.
     Si el jugador llega a la meta, muestra un mensaje y termina la simulación.
@@ -99,10 +106,13 @@ def simular_laberinto(
     """
     preguntar = True
     contador = 0
+    bitacora = EscritorBitacora(ruta_bitacora, laberinto) if ruta_bitacora else None
     try:
         while contador < limite_de_ticks:
-            laberinto.mover_murallas()
-            laberinto.mover_jugador()
+            laberinto.tick()
+
+            if bitacora is not None:
+                bitacora.registrar_tick()
 
             if modo_interactivo:
                 limpiar_e_imprimir_laberinto(laberinto)
@@ -121,8 +131,10 @@ def simular_laberinto(
             if laberinto.jugador_gano():
                 print("¡LLEGÓ A LA META!")
             print(f"Se demoró {laberinto.ticks_transcurridos} ticks.")
+            imprimir_resultado_entrenamiento(laberinto, archivo=sys.stdout)
         else:
             impresion_datos(laberinto=laberinto)
+            imprimir_resultado_entrenamiento(laberinto)
 
     except CreacionLaberintoError as e:
         print(f"Error al crear el laberinto: {e}")
@@ -135,9 +147,14 @@ def simular_laberinto(
     except KeyboardInterrupt:
         print("\nInterrumpido por el usuario.")
         exit(0)
+    finally:
+        if bitacora is not None:
+            bitacora.cerrar()
 
 
-def simular_experimento(laberinto: Laberinto, limite_de_ticks: int = 10000):
+def simular_experimento(
+    laberinto: Laberinto, limite_de_ticks: int = 10000, ruta_bitacora: Optional[str] = None
+):
     """
     Ejecuta la simulación del laberinto, moviendo murallas y jugador en cada tick.
 
@@ -145,6 +162,7 @@ def simular_experimento(laberinto: Laberinto, limite_de_ticks: int = 10000):
         laberinto (Laberinto): Instancia del laberinto a simular.
         limite_de_ticks (int, opcional): Máximo de ciclos de simulación. Por defecto 10000.
         modo_interactivo (bool, opcional): Si True, permite interacción paso a paso con el usuario.
+        ruta_bitacora (Optional[str], opcional): Si se indica, guarda la simulación en una bitácora binaria.
 
     El modo interactivo permite continuar, autoavanzar la simulación o salir según la entrada del usuario.
     Si el jugador llega a la meta, muestra un mensaje y termina la simulación.
@@ -154,20 +172,25 @@ def simular_experimento(laberinto: Laberinto, limite_de_ticks: int = 10000):
 
     preguntar = True
     contador = 0
+    bitacora = EscritorBitacora(ruta_bitacora, laberinto) if ruta_bitacora else None
     start = time()
 
     try:
-        while contador < limite_de_ticks:
-            laberinto.mover_murallas()
-            laberinto.mover_jugador()
+        if bitacora is None:
+            laberinto.ejecutar(limite_de_ticks)
+        else:
+            while contador < limite_de_ticks:
+                laberinto.tick()
+                bitacora.registrar_tick()
 
-            if laberinto.jugador_gano():
-                break
+                if laberinto.jugador_gano():
+                    break
 
-            contador += 1
+                contador += 1
 
         end = time()
         impresion_datos(laberinto=laberinto, start=start, end=end)
+        imprimir_resultado_entrenamiento(laberinto)
 
     except CreacionLaberintoError as e:
         print(f"Error al crear el laberinto: {e}")
@@ -180,6 +203,27 @@ def simular_experimento(laberinto: Laberinto, limite_de_ticks: int = 10000):
     except KeyboardInterrupt:
         print("\nInterrumpido por el usuario.")
         exit(0)
+    finally:
+        if bitacora is not None:
+            bitacora.cerrar()
+
+
+def imprimir_resultado_entrenamiento(laberinto: Laberinto, archivo=sys.stderr):
+    """
+    Muestra cuántos episodios entrenó el jugador y por qué se detuvo, si es un jugador que entrena.
+
+    Para el jugador genético también muestra cuántas generaciones evolucionó y por qué se detuvo.
+    Por defecto se escribe en stderr para no mezclarse con la fila CSV de 'impresion_datos', que ya trae
+    estos datos en sus últimas columnas.
+
+    Args:
+        laberinto (Laberinto): Laberinto cuyo jugador se revisa.
+        archivo: Flujo donde se escribe el resumen.
+    """
+    for atributo in ("resultado_evolucion", "resultado_entrenamiento"):
+        resultado = getattr(laberinto.jugador, atributo, None)
+        if resultado is not None:
+            print(resultado, file=archivo)
 
 
 def impresion_datos(laberinto: Laberinto, start=float, end=float):
@@ -216,20 +260,25 @@ def impresion_datos(laberinto: Laberinto, start=float, end=float):
     # Imprimir si llego
     print(f"{laberinto.jugador_gano()}", end=",")
 
-    # Datos del jugador
-    if isinstance(laberinto.jugador, (JugadorQlearning, JugadorQlearningEstrella, JugadorGenetico)):
-        # Imprimir tipo jugador
-        print(f"{laberinto.jugador.__class__.__name__}", end=",")
-
-        # Imprimir alpha y gamma
-        print(f"{laberinto.jugador.alpha}", end=",")
-
-        if isinstance(laberinto.jugador, (JugadorQlearningEstrella, JugadorGenetico)):
-            # Imprimir betha y omega
-            print(f"{laberinto.jugador.gamma}", end=",")
-            print(f"{laberinto.jugador.betha}", end=",")
-            print(f"{laberinto.jugador.omega}")
+    # Datos del jugador; las columnas que no aplican quedan vacías para que todas las filas calcen con
+    # el encabezado de experiments.sh
+    jugador = laberinto.jugador
+    parametros = ["", "", "", ""]
+    if isinstance(jugador, (JugadorQlearning, JugadorQlearningEstrella, JugadorGenetico)):
+        parametros[:2] = jugador.alpha, jugador.gamma
+        if isinstance(jugador, (JugadorQlearningEstrella, JugadorGenetico)):
+            parametros[2:] = jugador.betha, jugador.omega
+
+    # Resultado del entrenamiento (episodios y motivo) y de la evolución (generaciones y motivo)
+    resultados = []
+    for atributo, cantidad in (
+        ("resultado_entrenamiento", "episodios"),
+        ("resultado_evolucion", "generaciones"),
+    ):
+        resultado = getattr(jugador, atributo, None)
+        if resultado is None:
+            resultados += ["", ""]
         else:
-            print(f"{laberinto.jugador.gamma}")
-    else:
-        print(f"{laberinto.jugador.__class__.__name__}")
+            resultados += [getattr(resultado, cantidad), resultado.motivo.name]
+
+    print(",".join(str(valor) for valor in [jugador.__class__.__name__, *parametros, *resultados]))